@@ -0,0 +1,178 @@
+"""
+Analytics Module
+----------------
+This module defines the aggregates behind Hospital.analytics():
+- staff count and payroll per (department, role),
+- patient count per (department, age bucket).
+
+Hospital keeps one AnalyticsCube up to date from its events, so each
+added record changes a single cell and a removed department subtracts
+its own records. Reading the analytics then costs one pass over the
+cells, however many records there are.
+"""
+
+from collections import Counter
+
+from Models.columns import PatientColumns, StaffColumns
+
+
+AGE_BUCKET_WIDTH = 10
+AGE_BUCKETS = 10    # the last bucket is open-ended ("90+")
+
+
+def age_bucket(age: int):
+    return max(0, min(age // AGE_BUCKET_WIDTH, AGE_BUCKETS - 1))
+
+
+def age_bucket_labels():
+    labels = [
+        f"{i * AGE_BUCKET_WIDTH}-{(i + 1) * AGE_BUCKET_WIDTH - 1}"
+        for i in range(AGE_BUCKETS - 1)
+    ]
+    labels.append(f"{(AGE_BUCKETS - 1) * AGE_BUCKET_WIDTH}+")
+    return labels
+
+
+def role_totals(staff_members):
+    """
+    {role: [staff count, payroll]} of one department's staff, read from
+    the columns of a compact department.
+    """
+    if isinstance(staff_members, StaffColumns):
+        pairs = zip(staff_members.roles, staff_members.salaries)
+    else:
+        pairs = ((staff.role, staff.salary) for staff in staff_members.values())
+
+    totals = {}
+    for role, salary in pairs:
+        cell = totals.get(role)
+        if cell is None:
+            cell = totals[role] = [0, 0.0]
+        cell[0] += 1
+        cell[1] += salary
+    return totals
+
+
+class AnalyticsCube:
+    """
+    Running aggregates keyed by (department name, role) and
+    (department name, age bucket).
+    """
+
+    def __init__(self):
+        self._staff = {}       # (department, role) -> [staff count, payroll]
+        self._patients = {}    # (department, age bucket) -> patient count
+
+    @classmethod
+    def from_departments(cls, departments):
+        """
+        Build a cube by scanning every record. Slow; used to check
+        the running one.
+        """
+        cube = cls()
+        for department in departments:
+            cube.add_department(department, 1)
+        return cube
+
+    # ===============================
+    # Updates
+    # ===============================
+
+    def add_patient(self, dept_name, patient, sign=1):
+        self._add_patients(dept_name, age_bucket(patient.age), sign)
+
+    def _add_patients(self, dept_name, bucket, change):
+        key = (dept_name, bucket)
+        count = self._patients.get(key, 0) + change
+        if count:
+            self._patients[key] = count
+        else:
+            del self._patients[key]
+
+    def add_staff(self, dept_name, staff, sign=1):
+        self._add_staff(dept_name, staff.role, sign, sign * staff.salary)
+
+    def _add_staff(self, dept_name, role, count, payroll):
+        key = (dept_name, role)
+        cell = self._staff.get(key)
+        if cell is None:
+            cell = self._staff[key] = [0, 0.0]
+
+        cell[0] += count
+        cell[1] += payroll
+        if not cell[0]:
+            del self._staff[key]
+
+    def add_department(self, department, sign):
+        """
+        Add (sign=1) or subtract (sign=-1) every record of a department.
+        """
+        patients = department.patients
+        if isinstance(patients, PatientColumns):
+            ages = patients.ages
+        else:
+            ages = (patient.age for patient in patients.values())
+
+        # One cell update per distinct age rather than per patient
+        for age, count in Counter(ages).items():
+            self._add_patients(department.name, age_bucket(age), sign * count)
+        for role, (count, payroll) in role_totals(department.staff_members).items():
+            self._add_staff(department.name, role, sign * count, sign * payroll)
+
+    # ===============================
+    # Results
+    # ===============================
+
+    def results(self, dept_names):
+        """
+        Aggregates for the given departments, in that order:
+
+            {
+                "age_buckets": ["0-9", ..., "90+"],
+                "departments": [{
+                    "name", "patients", "staff", "payroll",
+                    "patients_per_staff",          # None without staff
+                    "roles": {role: {"staff", "payroll"}},
+                    "age_histogram": [count per age bucket]
+                }, ...],
+                "roles": {role: {"staff", "payroll"}}    # all departments
+            }
+        """
+        departments = {
+            name: {
+                "name": name,
+                "patients": 0,
+                "staff": 0,
+                "payroll": 0.0,
+                "patients_per_staff": None,
+                "roles": {},
+                "age_histogram": [0] * AGE_BUCKETS
+            }
+            for name in dept_names
+        }
+        roles = {}
+
+        for (name, bucket), count in self._patients.items():
+            department = departments[name]
+            department["patients"] += count
+            department["age_histogram"][bucket] += count
+
+        for (name, role), (count, payroll) in self._staff.items():
+            department = departments[name]
+            department["staff"] += count
+            department["payroll"] += payroll
+            department["roles"][role] = {"staff": count, "payroll": payroll}
+
+            totals = roles.setdefault(role, {"staff": 0, "payroll": 0.0})
+            totals["staff"] += count
+            totals["payroll"] += payroll
+
+        for department in departments.values():
+            if department["staff"]:
+                department["patients_per_staff"] = department["patients"] / department["staff"]
+
+        return {
+            "age_buckets": age_bucket_labels(),
+            "departments": list(departments.values()),
+            "roles": roles
+        }
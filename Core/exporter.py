@@ -0,0 +1,328 @@
+"""
+Exporter Module
+---------------
+This module dumps patients or staff to CSV, JSONL or a compact columnar
+binary file (.hcol).
+
+Rows are produced by a generator that copies each department a page
+of PAGE_SIZE people at a time, and written as they come. The columnar
+writer buffers one row group at a time, so memory stays constant however
+many rows are exported, and however large one department is.
+
+Columnar file layout (little-endian):
+    b"HCOL", version (u8), flags (u8, 1 = zlib), column count (u16)
+    per column: name length (u8), name (utf-8), type (u8: i, f or s)
+    row groups: row count (u32), then per column
+                payload length (u32), payload
+    end marker: row count 0
+
+Payloads: int64 / float64 arrays; strings as a u32 length array followed
+by the concatenated utf-8 bytes. Each payload is zlib-compressed when
+the compressed flag is set. A .hcol file is never gzipped: its columns
+are compressed instead (--compress).
+
+Command line:
+    python -m Core.exporter patients.csv.gz --kind patients
+    python -m Core.exporter staff.hcol --kind staff --role Nurse --compress
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import struct
+import sys
+import time
+import zlib
+from array import array
+from itertools import islice
+
+
+COLUMNS = {
+    "patients": (("id", "i"), ("department", "s"), ("name", "s"), ("age", "i"), ("medical_record", "s")),
+    "staff": (("id", "i"), ("department", "s"), ("name", "s"), ("age", "i"), ("role", "s"), ("salary", "f")),
+}
+
+COLUMNAR_MAGIC = b"HCOL"
+COLUMNAR_VERSION = 1
+ROW_GROUP_SIZE = 65536
+PAGE_SIZE = 1024    # people copied per read lock
+
+
+# ===============================
+# Rows
+# ===============================
+
+def iter_rows(hospital, kind: str, departments=None, roles=None):
+    """
+    Yield one tuple per patient or staff member, in COLUMNS[kind] order.
+
+    :param departments: Only these department names (default: all)
+    :param roles: Only staff with these roles (staff only)
+    """
+    if kind not in COLUMNS:
+        raise ValueError(f"Unknown kind: {kind!r}")
+
+    with hospital.lock.read():
+        if departments is None:
+            selected = list(hospital.departments.values())
+        else:
+            selected = [hospital.departments[name] for name in departments if name in hospital.departments]
+
+    for dept in selected:
+        people_after = dept.patients_after if kind == "patients" else dept.staff_after
+        after_id = 0
+
+        while True:
+            # Copy one page at a time under the read lock, so writers only
+            # wait for that copy, and resume after its last ID
+            with hospital.lock.read():
+                people = list(islice(people_after(after_id), PAGE_SIZE))
+            if not people:
+                break
+            after_id = people[-1].id
+
+            if kind == "patients":
+                for p in people:
+                    yield (p.id, dept.name, p.name, p.age, p.medical_record)
+            else:
+                for s in people:
+                    if roles is None or s.role in roles:
+                        yield (s.id, dept.name, s.name, s.age, s.role, s.salary)
+
+            if len(people) < PAGE_SIZE:
+                break
+
+
+# ===============================
+# Writers
+# ===============================
+
+def write_csv(rows, columns, f):
+    writer = csv.writer(f)
+    writer.writerow([name for name, kind in columns])
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows, columns, f):
+    names = [name for name, kind in columns]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    for row in rows:
+        f.write(encode(dict(zip(names, row))))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_columnar(rows, columns, f, compress=False):
+    """
+    Write rows to a binary file object in the .hcol layout.
+    """
+    f.write(COLUMNAR_MAGIC)
+    f.write(struct.pack("<BBH", COLUMNAR_VERSION, 1 if compress else 0, len(columns)))
+    for name, kind in columns:
+        encoded = name.encode("utf-8")
+        f.write(struct.pack("<B", len(encoded)) + encoded + kind.encode("ascii"))
+
+    count = 0
+    group = [[] for _ in columns]
+    for row in rows:
+        for values, value in zip(group, row):
+            values.append(value)
+        count += 1
+        if len(group[0]) >= ROW_GROUP_SIZE:
+            _write_group(f, group, columns, compress)
+            group = [[] for _ in columns]
+
+    if group[0]:
+        _write_group(f, group, columns, compress)
+    f.write(struct.pack("<I", 0))
+    return count
+
+
+def _write_group(f, group, columns, compress):
+
+    f.write(struct.pack("<I", len(group[0])))
+    for values, (name, kind) in zip(group, columns):
+        payload = _encode_column(values, kind)
+        if compress:
+            payload = zlib.compress(payload, 6)
+        f.write(struct.pack("<I", len(payload)))
+        f.write(payload)
+
+
+def _encode_column(values, kind):
+
+    if kind == "s":
+        encoded = [str(value).encode("utf-8") for value in values]
+        lengths = array("I", map(len, encoded))
+        return _little_endian(lengths) + b"".join(encoded)
+
+    return _little_endian(array("q" if kind == "i" else "d", values))
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+# ===============================
+# Reader
+# ===============================
+
+def read_columnar(f):
+    """
+    Yield rows (tuples) back from a binary .hcol file object.
+    """
+    if f.read(4) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar export file")
+
+    version, flags, count = struct.unpack("<BBH", f.read(4))
+    if version != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar version: {version}")
+
+    columns = []
+    for _ in range(count):
+        length = f.read(1)[0]
+        name = f.read(length).decode("utf-8")
+        columns.append((name, f.read(1).decode("ascii")))
+
+    while True:
+        (rows,) = struct.unpack("<I", f.read(4))
+        if rows == 0:
+            return
+
+        values = []
+        for name, kind in columns:
+            (size,) = struct.unpack("<I", f.read(4))
+            payload = f.read(size)
+            if flags & 1:
+                payload = zlib.decompress(payload)
+            values.append(_decode_column(payload, kind, rows))
+
+        yield from zip(*values)
+
+
+def _decode_column(payload, kind, rows):
+
+    if kind == "s":
+        lengths = array("I")
+        lengths.frombytes(payload[:rows * lengths.itemsize])
+        if sys.byteorder != "little":
+            lengths.byteswap()
+        strings = []
+        offset = rows * lengths.itemsize
+        for length in lengths:
+            strings.append(payload[offset:offset + length].decode("utf-8"))
+            offset += length
+        return strings
+
+    values = array("q" if kind == "i" else "d")
+    values.frombytes(payload)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+# ===============================
+# Export
+# ===============================
+
+def check_target(path: str, kind: str, fmt: str = None, roles=None, compress: bool = False):
+    """
+    Validate an export's file name and options before any work is done.
+
+    :return: (format, compress)
+    :raises ValueError: With the reason the export cannot be written
+    """
+    gzipped = path.endswith(".gz")
+    name = path[:-3] if gzipped else path
+    fmt = fmt or name.rsplit(".", 1)[-1]
+    if fmt not in ("csv", "jsonl", "hcol"):
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    if fmt == "hcol" and gzipped:
+        raise ValueError("hcol files are not gzipped; use compress for zlib-compressed columns")
+    if fmt != "hcol" and compress and not gzipped:
+        raise ValueError(f"Compressed {fmt} output is gzipped; name the file {path}.gz")
+    if kind == "patients" and roles is not None:
+        raise ValueError("Roles only apply to staff")
+    return fmt, compress or gzipped
+
+
+def export(hospital, path: str, kind: str, fmt: str = None, departments=None,
+           roles=None, compress: bool = False):
+    """
+    Export patients or staff to a file.
+
+    :param fmt: "csv", "jsonl" or "hcol"; guessed from the file name if None
+    :param compress: zlib the hcol columns; csv/jsonl output is gzipped
+                     when the file name ends in .gz, and compress then
+                     requires that name
+    :return: (rows written, seconds taken)
+    """
+    fmt, compress = check_target(path, kind, fmt, roles, compress)
+
+    start = time.perf_counter()
+    rows = iter_rows(hospital, kind, departments, roles)
+    columns = COLUMNS[kind]
+
+    if fmt == "hcol":
+        with open(path, "wb") as f:
+            count = write_columnar(rows, columns, f, compress)
+    else:
+        opener = gzip.open if compress else open
+        with opener(path, "wt", newline="", encoding="utf-8") as f:
+            if fmt == "csv":
+                count = write_csv(rows, columns, f)
+            else:
+                count = write_jsonl(rows, columns, f)
+
+    return count, time.perf_counter() - start
+
+
+# ===============================
+# Command Line
+# ===============================
+
+def main(argv=None):
+
+    from Core.hospital import Hospital
+    from Core.storage import HospitalStore
+
+    parser = argparse.ArgumentParser(description="Export patients or staff.")
+    parser.add_argument("path", help="output file (.csv, .jsonl, .hcol, optionally .gz)")
+    parser.add_argument("--kind", choices=list(COLUMNS), required=True)
+    parser.add_argument("--data", default="hospital_data", help="hospital data folder")
+    parser.add_argument("--department", action="append", help="only this department (repeatable)")
+    parser.add_argument("--role", action="append", help="only staff with this role (repeatable)")
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.role and args.kind != "staff":
+        parser.error("--role only applies to --kind staff")
+    try:
+        check_target(args.path, args.kind, compress=args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    hospital = Hospital("Smart Hospital")
+    HospitalStore(args.data).load(hospital)
+
+    count, elapsed = export(
+        hospital, args.path, args.kind,
+        departments=args.department,
+        roles=set(args.role) if args.role else None,
+        compress=args.compress
+    )
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Exported {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Full-Text Module
+----------------
+This module defines the inverted index over patients' medical records
+used by Hospital.search_records().
+
+Each term maps to a posting list of {patient id: term frequency}, and
+each patient ID to its distinct terms, so a record is removed without
+its text.
+
+Queries are terms combined with AND / OR:
+- terms next to each other must all match ("diabetes insulin"),
+- OR separates alternatives ("asthma OR copd"),
+- AND binds tighter than OR, and may also be written explicitly.
+
+Matching records are ranked with BM25.
+"""
+
+import heapq
+import math
+import sys
+
+from .search import tokenize
+
+
+class RecordIndex:
+    """
+    Inverted index over record text, keyed by patient ID.
+    """
+
+    # BM25 parameters
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._postings = {}     # term -> {patient id: term frequency}
+        self._lengths = {}      # patient id -> number of terms
+        self._terms = {}        # patient id -> distinct terms (interned)
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    # ===============================
+    # Updates
+    # ===============================
+
+    def add(self, patient_id: int, text: str):
+        """
+        Index a record. Re-adding an ID replaces its old record, e.g. when
+        the same patient is added to a second department.
+        """
+        if patient_id in self._lengths:
+            self.remove(patient_id)
+
+        terms = tokenize(text)
+        self._lengths[patient_id] = len(terms)
+        self._total_length += len(terms)
+
+        counts = {}
+        for term in map(sys.intern, terms):
+            counts[term] = counts.get(term, 0) + 1
+        self._terms[patient_id] = tuple(counts)
+
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[patient_id] = count
+
+    def remove(self, patient_id: int):
+        """
+        Remove a record, if indexed.
+        """
+        length = self._lengths.pop(patient_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+
+        for term in self._terms.pop(patient_id):
+            posting = self._postings[term]
+            del posting[patient_id]
+            if not posting:
+                del self._postings[term]
+
+    # ===============================
+    # Queries
+    # ===============================
+
+    def search(self, query: str, limit: int = 20):
+        """
+        Return up to `limit` (score, patient id) pairs, best first.
+        """
+        groups = self._parse(query)
+        if not groups or limit <= 0:
+            return []
+
+        matched = set()
+        for terms in groups:
+            matched |= self._match_all(terms)
+
+        if not matched:
+            return []
+
+        terms = {term for group in groups for term in group}
+        scores = self._bm25(matched, terms)
+        return heapq.nlargest(limit, ((score, pid) for pid, score in scores.items()),
+                              key=lambda item: (item[0], -item[1]))
+
+    def _parse(self, query):
+        """
+        Split a query into OR-groups of terms that must all match.
+        """
+        groups = []
+        current = []
+
+        for word in query.split():
+            if word == "OR":
+                if current:
+                    groups.append(current)
+                current = []
+            elif word != "AND":
+                current.extend(tokenize(word))
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def _match_all(self, terms):
+        postings = []
+        for term in set(terms):
+            posting = self._postings.get(term)
+            if posting is None:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        matched = set(postings[0])
+        for posting in postings[1:]:
+            matched.intersection_update(posting)
+            if not matched:
+                break
+        return matched
+
+    def _bm25(self, patient_ids, terms):
+        count = len(self._lengths)
+        lengths = self._lengths
+
+        # Length normalisation: k1 * (1 - b + b * length / average length)
+        base = self.k1 * (1 - self.b)
+        per_term = self.k1 * self.b * count / self._total_length if self._total_length else 0.0
+        boost = self.k1 + 1
+
+        scores = dict.fromkeys(patient_ids, 0.0)
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+
+            df = len(posting)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5)) * boost
+
+            # Walk whichever side is smaller
+            if len(posting) < len(scores):
+                pids = [pid for pid in posting if pid in scores]
+            else:
+                pids = [pid for pid in scores if pid in posting]
+
+            for pid in pids:
+                tf = posting[pid]
+                scores[pid] += idf * tf / (tf + base + per_term * lengths[pid])
+
+        return scores
@@ -1,40 +1,160 @@
+import math
+import threading
+
+from Models.cursors import (
+    DEPARTMENT_ORDERS, PATIENT_ORDERS, STAFF_ORDERS, decode_cursor, make_page,
+    order_key, smallest_after
+)
 from Models.department import Department
+from Models.locks import NULL_LOCK, RWLock
+from Models.metrics import instrumented
+from .search import NameIndex
+from .analytics import AnalyticsCube, role_totals
+from .fulltext import RecordIndex
+from .indexes import BucketIndex, SortedIndex, ValueIndex, intersect
+from .repository import MemoryRepository
+from Models.events import (
+    EventBus, DepartmentAdded, DepartmentRemoved, PatientAdded, StaffAdded
+)
 
 
 class Hospital:
     """
     Represents the main hospital system.
     Manages departments, patients, and staff.
+
+    Every change is published on `events`, so views and indexes can
+    subscribe and apply just that change.
+
+    Totals for the summary and analytics are kept up to date as records
+    are added and departments removed. Set `verify_summary` to True to
+    have get_summary() and analytics() recompute them from scratch and
+    check they agree.
+
+    Departments added with restore_departments() join the search and
+    query indexes lazily, the first time one of those is used.
+
+    With thread_safe=True, the hospital can be shared between threads:
+    changes take `lock` for writing and queries take it for reading.
+    Code that walks `departments` directly should hold `lock.read()`.
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, thread_safe: bool = False):
 
         self.name = name
         self.departments = {}
+        self.events = EventBus()
+        self.lock = RWLock() if thread_safe else NULL_LOCK
+
+        # Running totals behind get_summary()
+        self.verify_summary = False
+        self._total_patients = 0
+        self._total_staff = 0
+        self._total_payroll = 0.0
+        self._staff_by_role = {}
+        self._analytics = AnalyticsCube()
+
+        # ID index: person id -> owning department
+        self._patient_departments = {}
+        self._staff_departments = {}
+
+        # Name search indexes
+        self._patient_names = NameIndex()
+        self._staff_names = NameIndex()
+
+        # Full-text index over medical records
+        self._records = RecordIndex()
+
+        # Attribute indexes for query_patients() / query_staff()
+        self._patient_ages = BucketIndex()
+        self._staff_roles = ValueIndex()
+        self._staff_ages = BucketIndex()
+        self._staff_salaries = SortedIndex("d")
+
+        # Restored departments whose people are not in the indexes yet
+        self._unindexed = {}    # name -> department
+        self._index_lock = threading.Lock()
+
+        # Backend for paged listings
+        self.repository = MemoryRepository()
+        self.repository.attach(self)
+
+        self.events.subscribe(self._count_department_added, DepartmentAdded)
+        self.events.subscribe(self._count_department_removed, DepartmentRemoved)
+        self.events.subscribe(self._count_patient, PatientAdded)
+        self.events.subscribe(self._count_staff, StaffAdded)
+
+        self.events.subscribe(self._index_department_added, DepartmentAdded)
+        self.events.subscribe(self._index_department_removed, DepartmentRemoved)
+        self.events.subscribe(self._index_patient, PatientAdded)
+        self.events.subscribe(self._index_staff, StaffAdded)
 
 
     # ===============================
     # Department Management
     # ===============================
 
+    @instrumented("hospital.add_department")
     def add_department(self, department: Department):
 
-        if department.name in self.departments:
-            return "Department already exists."
+        with self.lock.write():
+            if department.name in self.departments:
+                return "Department already exists."
+
+            self.departments[department.name] = department
+            department.events = self.events
+            department.lock = self.lock
+
+            self.events.publish(DepartmentAdded(department))
 
-        self.departments[department.name] = department
         return "Department added successfully."
 
 
+    @instrumented("hospital.restore_departments")
+    def restore_departments(self, departments):
+        """
+        Add departments that already hold their patients and staff, e.g.
+        loaded from a snapshot. Their people are put in the name, record
+        and attribute indexes on the first search or query instead of
+        now, so a large hospital is usable right after loading.
+
+        :return: Number of departments added; names already present are skipped
+        """
+
+        added = 0
+        with self.lock.write():
+            for department in departments:
+                if department.name in self.departments:
+                    continue
+
+                self._unindexed[department.name] = department
+                self.departments[department.name] = department
+                department.events = self.events
+                department.lock = self.lock
+
+                self.events.publish(DepartmentAdded(department))
+                added += 1
+
+        return added
+
+
+    @instrumented("hospital.remove_department")
     def remove_department(self, name: str):
 
-        if name not in self.departments:
-            return "Department not found."
+        with self.lock.write():
+            if name not in self.departments:
+                return "Department not found."
+
+            department = self.departments.pop(name)
+            department.events = None
+            department.lock = NULL_LOCK
+
+            self.events.publish(DepartmentRemoved(department))
 
-        del self.departments[name]
         return "Department removed."
 
 
+    @instrumented("hospital.get_department")
     def get_department(self, name: str):
 
         return self.departments.get(name)
@@ -42,24 +162,497 @@ class Hospital:
 
     def list_departments(self):
 
-        return list(self.departments.values())
+        with self.lock.read():
+            return list(self.departments.values())
+
+
+    # ===============================
+    # Listings
+    # ===============================
+
+    def use_repository(self, repository):
+        """
+        Switch the backend that answers listing queries,
+        e.g. to a SQLiteRepository.
+        """
+
+        self.repository.detach()
+        repository.attach(self)
+        self.repository = repository
+
+
+    def page_patients(self, department: str = None, after_id: int = 0, limit: int = 50, **filters):
+        """
+        Return up to `limit` (patient, department name) rows with
+        IDs above `after_id`, in ID order.
+
+        Filters: min_age, max_age, name_prefix.
+        """
+
+        with self.lock.read():
+            return self.repository.page_patients(department, after_id, limit, **filters)
+
+
+    def page_staff(self, department: str = None, after_id: int = 0, limit: int = 50, **filters):
+        """
+        Return up to `limit` (staff member, department name) rows with
+        IDs above `after_id`, in ID order.
+
+        Filters: role, min_age, max_age, name_prefix.
+        """
+
+        with self.lock.read():
+            return self.repository.page_staff(department, after_id, limit, **filters)
+
+
+    def iter_patients(self, cursor: str = None, limit: int = 50, order_by: str = "id", department: str = None):
+        """
+        Return a Page of (patient, department name) rows, ordered by
+        "id", "name" or "age". Pass page.cursor back in for the next page;
+        it is None after the last one. See Models/cursors.py.
+        """
+
+        return self._iter_people(PATIENT_ORDERS, self.repository.page_patients,
+                                 "patients", cursor, limit, order_by, department)
+
+
+    def iter_staff(self, cursor: str = None, limit: int = 50, order_by: str = "id", department: str = None):
+        """
+        Return a Page of (staff member, department name) rows, ordered by
+        "id", "name", "age" or "salary".
+        """
+
+        return self._iter_people(STAFF_ORDERS, self.repository.page_staff,
+                                 "staff_members", cursor, limit, order_by, department)
+
+
+    def iter_departments(self, cursor: str = None, limit: int = 50):
+        """
+        Return a Page of departments ordered by name.
+        """
+
+        key = order_key(DEPARTMENT_ORDERS, "name")
+        after = decode_cursor(cursor, "name")
+
+        with self.lock.read():
+            items = smallest_after(self.departments.values(), after, limit, key)
+
+        return make_page(items, limit, "name", key)
+
+
+    def _iter_people(self, orders, page, attribute, cursor, limit, order_by, department):
+
+        person_key = order_key(orders, order_by)
+        key = lambda row: person_key(row[0])
+        after = decode_cursor(cursor, order_by)
+
+        with self.lock.read():
+            if order_by == "id":
+                # Seek straight to the cursor through the repository
+                items = page(department, after[0] if after else 0, limit)
+            else:
+                if department is None:
+                    departments = self.departments.values()
+                else:
+                    found = self.departments.get(department)
+                    departments = [found] if found else []
+
+                rows = (
+                    (person, d.name)
+                    for d in departments
+                    for person in getattr(d, attribute).values()
+                )
+                items = smallest_after(rows, after, limit, key)
+
+        return make_page(items, limit, order_by, key)
+
+
+    # ===============================
+    # Lookup by ID
+    # ===============================
+
+    def find_patient(self, patient_id: int):
+        """
+        Return (patient, department) for a patient ID, or None.
+        """
+
+        with self.lock.read():
+            department = (self._unindexed_owner(patient_id, "patients")
+                          or self._patient_departments.get(patient_id))
+            if department is None:
+                return None
+
+            return department.patients[patient_id], department
+
+
+    def find_staff(self, staff_id: int):
+        """
+        Return (staff member, department) for a staff ID, or None.
+        """
+
+        with self.lock.read():
+            department = (self._unindexed_owner(staff_id, "staff_members")
+                          or self._staff_departments.get(staff_id))
+            if department is None:
+                return None
+
+            return department.staff_members[staff_id], department
+
+
+    # ===============================
+    # Search
+    # ===============================
+
+    def search_people(self, query: str, kind: str = None, limit: int = 10):
+        """
+        Search patients and/or staff by name.
+
+        :param query: Full or partial name; small typos are tolerated
+        :param kind: "patient", "staff", or None for both
+        :param limit: Maximum number of results
+        :return: List of (person, department), best match first
+        """
+
+        if kind not in (None, "patient", "staff"):
+            raise ValueError(f"Unknown kind: {kind!r}")
+
+        results = []
+        with self.lock.read():
+            self._index_restored()
+            if kind in (None, "patient"):
+                for score, patient_id in self._patient_names.search(query, limit):
+                    results.append((score, self.find_patient(patient_id)))
+            if kind in (None, "staff"):
+                for score, staff_id in self._staff_names.search(query, limit):
+                    results.append((score, self.find_staff(staff_id)))
+
+        results.sort(key=lambda item: -item[0])
+        return [found for score, found in results[:limit]]
+
+
+    def search_records(self, query: str, limit: int = 20):
+        """
+        Search patients' medical records.
+
+        :param query: Terms, optionally combined with AND / OR,
+                      e.g. "diabetes insulin OR asthma"
+        :param limit: Maximum number of results
+        :return: List of (patient, department), best match first (BM25)
+        """
+
+        with self.lock.read():
+            self._index_restored()
+            return [
+                self.find_patient(patient_id)
+                for score, patient_id in self._records.search(query, limit)
+            ]
+
+
+    # ===============================
+    # Queries
+    # ===============================
+
+    def query_patients(self, min_age: int = None, max_age: int = None, limit: int = None):
+        """
+        Patients aged between min_age and max_age (inclusive), answered
+        from the age index rather than by scanning departments.
+
+        :return: List of (patient, department) in ID order
+        """
+
+        with self.lock.read():
+            self._index_restored()
+            predicates = [self._patient_ages.between(min_age, max_age, lambda p: p.age)]
+            return intersect(predicates, self._fetcher(self._patient_departments, "patients"), limit)
+
+
+    def query_staff(self, role: str = None, min_salary: float = None, max_salary: float = None,
+                    min_age: int = None, max_age: int = None, limit: int = None):
+        """
+        Staff members matching every given condition, e.g.
+        query_staff(role="Nurse", min_salary=80000). Bounds are inclusive.
+
+        Each condition is looked up in its index and the matches are
+        intersected, starting from the most selective one.
+
+        :return: List of (staff member, department) in ID order
+        """
+
+        with self.lock.read():
+            self._index_restored()
+            predicates = []
+            if role is not None:
+                predicates.append(self._staff_roles.equal(role, lambda s: s.role))
+            if min_salary is not None or max_salary is not None:
+                predicates.append(self._staff_salaries.between(min_salary, max_salary, lambda s: s.salary))
+            if min_age is not None or max_age is not None or not predicates:
+                predicates.append(self._staff_ages.between(min_age, max_age, lambda s: s.age))
+
+            return intersect(predicates, self._fetcher(self._staff_departments, "staff_members"), limit)
+
+
+    def _fetcher(self, departments, attribute):
+        """
+        fetch(id) -> (person, department) for intersect(); the caller
+        already holds the read lock.
+        """
+
+        def fetch(person_id):
+            department = departments[person_id]
+            return getattr(department, attribute)[person_id], department
+
+        return fetch
 
 
     # ===============================
     # System Info
     # ===============================
 
+    @instrumented("hospital.get_summary")
     def get_summary(self):
 
-        summary = {
-            "hospital_name": self.name,
-            "total_departments": len(self.departments),
-            "total_patients": sum(
-                len(d.patients) for d in self.departments.values()
-            ),
-            "total_staff": sum(
-                len(d.staff_members) for d in self.departments.values()
-            )
-        }
+        with self.lock.read():
+            summary = {
+                "hospital_name": self.name,
+                "total_departments": len(self.departments),
+                "total_patients": self._total_patients,
+                "total_staff": self._total_staff,
+                "staff_by_role": dict(self._staff_by_role),
+                "total_payroll": self._total_payroll
+            }
+
+            if self.verify_summary:
+                self._check_summary(summary)
 
         return summary
+
+
+    def recompute_summary(self):
+        """
+        Build the summary by scanning every department.
+        Slow; used to check the running totals.
+        """
+
+        staff_by_role = {}
+        total_payroll = 0.0
+
+        with self.lock.read():
+            for d in self.departments.values():
+                for s in d.staff_members.values():
+                    staff_by_role[s.role] = staff_by_role.get(s.role, 0) + 1
+                    total_payroll += s.salary
+
+            return {
+                "hospital_name": self.name,
+                "total_departments": len(self.departments),
+                "total_patients": sum(
+                    len(d.patients) for d in self.departments.values()
+                ),
+                "total_staff": sum(
+                    len(d.staff_members) for d in self.departments.values()
+                ),
+                "staff_by_role": staff_by_role,
+                "total_payroll": total_payroll
+            }
+
+
+    def analytics(self):
+        """
+        Staffing, payroll and patient age aggregates per department,
+        read from running totals in O(number of cells).
+        See AnalyticsCube.results() for the layout.
+        """
+
+        with self.lock.read():
+            names = list(self.departments)
+            results = self._analytics.results(names)
+
+            if self.verify_summary:
+                expected = AnalyticsCube.from_departments(self.departments.values()).results(names)
+                self._check_analytics(results, expected)
+
+        return results
+
+
+    def _check_summary(self, summary):
+
+        expected = self.recompute_summary()
+
+        for key, value in expected.items():
+            if key == "total_payroll":
+                matches = math.isclose(summary[key], value, abs_tol=0.01)
+            else:
+                matches = summary[key] == value
+
+            if not matches:
+                raise AssertionError(
+                    f"Summary '{key}' is {summary[key]!r}, expected {value!r}"
+                )
+
+
+    def _check_analytics(self, results, expected):
+
+        for got, want in zip(results["departments"], expected["departments"]):
+            for key in ("patients", "staff", "age_histogram"):
+                if got[key] != want[key]:
+                    raise AssertionError(
+                        f"Analytics '{key}' of {got['name']} is {got[key]!r}, expected {want[key]!r}"
+                    )
+            if not math.isclose(got["payroll"], want["payroll"], abs_tol=0.01):
+                raise AssertionError(
+                    f"Analytics payroll of {got['name']} is {got['payroll']!r}, expected {want['payroll']!r}"
+                )
+
+
+    # ===============================
+    # Running Totals
+    # ===============================
+
+    def _count_department_added(self, event):
+
+        self._count_department(event.department, 1)
+
+
+    def _count_department_removed(self, event):
+
+        self._count_department(event.department, -1)
+
+
+    def _count_department(self, department, sign):
+
+        self._total_patients += sign * len(department.patients)
+        for role, (count, payroll) in role_totals(department.staff_members).items():
+            self._add_role_totals(role, sign * count, sign * payroll)
+        self._analytics.add_department(department, sign)
+
+
+    def _count_patient(self, event):
+
+        self._total_patients += 1
+        self._analytics.add_patient(event.department.name, event.patient)
+
+
+    def _count_staff(self, event):
+
+        self._add_staff_totals(event.staff, 1)
+        self._analytics.add_staff(event.department.name, event.staff)
+
+
+    def _add_staff_totals(self, staff, sign):
+
+        self._add_role_totals(staff.role, sign, sign * staff.salary)
+
+
+    def _add_role_totals(self, role, staff, payroll):
+
+        self._total_staff += staff
+        self._total_payroll += payroll
+
+        count = self._staff_by_role.get(role, 0) + staff
+        if count:
+            self._staff_by_role[role] = count
+        else:
+            del self._staff_by_role[role]
+
+
+    # ===============================
+    # ID, Name, Record and Attribute Indexes
+    # ===============================
+
+    def _index_department_added(self, event):
+
+        department = event.department
+        if self._unindexed.get(department.name) is department:
+            return
+        self._index_people(department)
+
+
+    def _index_people(self, department):
+
+        for patient in department.patients.values():
+            self._patient_departments[patient.id] = department
+            self._patient_names.add(patient.id, patient.name)
+            self._records.add(patient.id, patient.medical_record)
+            self._patient_ages.add(patient.id, patient.age)
+        for staff in department.staff_members.values():
+            self._staff_departments[staff.id] = department
+            self._staff_names.add(staff.id, staff.name)
+            self._add_staff_attributes(staff)
+
+
+    def _index_department_removed(self, event):
+
+        department = event.department
+        if self._unindexed.get(department.name) is department:
+            del self._unindexed[department.name]
+            return
+
+        for patient_id in department.patients:
+            self._patient_departments.pop(patient_id, None)
+            self._patient_names.remove(patient_id)
+            self._records.remove(patient_id)
+        for staff_id in department.staff_members:
+            self._staff_departments.pop(staff_id, None)
+            self._staff_names.remove(staff_id)
+
+        self._patient_ages.discard((p.id, p.age) for p in department.patients.values())
+        staff_members = list(department.staff_members.values())
+        self._staff_roles.discard((s.id, s.role) for s in staff_members)
+        self._staff_ages.discard((s.id, s.age) for s in staff_members)
+        self._staff_salaries.discard((s.id, s.salary) for s in staff_members)
+
+
+    def _index_patient(self, event):
+
+        if self._unindexed.get(event.department.name) is event.department:
+            return    # indexed with the rest of its department
+
+        patient = event.patient
+        self._patient_departments[patient.id] = event.department
+        self._patient_names.add(patient.id, patient.name)
+        self._records.add(patient.id, patient.medical_record)
+        self._patient_ages.add(patient.id, patient.age)
+
+
+    def _index_staff(self, event):
+
+        if self._unindexed.get(event.department.name) is event.department:
+            return
+
+        staff = event.staff
+        self._staff_departments[staff.id] = event.department
+        self._staff_names.add(staff.id, staff.name)
+        self._add_staff_attributes(staff)
+
+
+    def _add_staff_attributes(self, staff):
+
+        self._staff_roles.add(staff.id, staff.role)
+        self._staff_ages.add(staff.id, staff.age)
+        self._staff_salaries.add(staff.id, staff.salary)
+
+
+    def _index_restored(self):
+        """
+        Index the people of restored departments before the indexes are
+        read. Queries only hold the read lock, so one of them builds
+        while the others wait.
+        """
+
+        if not self._unindexed:
+            return
+
+        with self._index_lock:
+            for name, department in list(self._unindexed.items()):
+                self._index_people(department)
+                del self._unindexed[name]
+
+
+    def _unindexed_owner(self, person_id, attribute):
+
+        # Restored departments not indexed yet are asked directly; they
+        # are checked before the ID index, which they join once built
+        for department in list(self._unindexed.values()):
+            if person_id in getattr(department, attribute):
+                return department
+        return None
@@ -0,0 +1,267 @@
+"""
+Importer Module
+---------------
+This module loads patients or staff in bulk from CSV or JSONL files.
+
+Files are read as a stream and handled in batches of `batch_size` rows:
+each batch is validated, grouped by department (so every department
+name is looked up once per batch), and inserted through
+Department.add_patients / add_staff_members. Each batch reserves a block
+of IDs up front instead of allocating one per row. Only one batch and a
+bounded sample of rejected rows are held in memory at a time.
+
+Columns (CSV header or JSONL keys):
+- patients: department, name, age, medical_record
+- staff:    department, name, age, role, salary
+
+Command line:
+    python -m Core.importer patients.csv --kind patients
+"""
+
+import argparse
+import csv
+import json
+import math
+import time
+
+from Models.department import Department
+from Models.patient import Patient
+from Models.staff import Staff
+
+
+class ImportReport:
+    """
+    Outcome of an import: counts, timing and a sample of rejected rows.
+    """
+
+    max_errors = 100
+
+    def __init__(self):
+        self.added = 0
+        self.rejected = 0
+        self.errors = []   # (line number, reason), first `max_errors` only
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    @property
+    def rows_per_second(self):
+        total = self.added + self.rejected
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, line, reason):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, reason))
+
+    def __str__(self):
+        lines = [
+            f"Added    : {self.added}" + (" (cancelled)" if self.cancelled else ""),
+            f"Rejected : {self.rejected}",
+            f"Time     : {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        ]
+        for line, reason in self.errors:
+            lines.append(f"  line {line}: {reason}")
+        if self.rejected > len(self.errors):
+            lines.append(f"  ... and {self.rejected - len(self.errors)} more")
+        return "\n".join(lines)
+
+
+# ===============================
+# Reading
+# ===============================
+
+def read_rows(path: str):
+    """
+    Yield (line number, row dict) from a .csv or .jsonl file.
+    Rows that cannot be decoded are yielded as (line number, None).
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                yield line_no, row if isinstance(row, dict) else None
+
+
+def _text(row, key):
+    value = row.get(key)
+    if value is None or not str(value).strip():
+        raise ValueError(f"missing {key}")
+    return str(value).strip()
+
+
+def _age(row):
+    try:
+        age = int(row.get("age"))
+    except (TypeError, ValueError):
+        raise ValueError("age must be a whole number")
+    if not 0 <= age <= 150:
+        raise ValueError("age out of range")
+    return age
+
+
+def parse_patient(row, person_id=None):
+    """
+    Validate a row and return (department name, Patient).
+    Raises ValueError with the reason when the row is invalid.
+    """
+    dept_name = _text(row, "department")
+    name = _text(row, "name")
+    age = _age(row)
+    record = str(row.get("medical_record") or "")
+    return dept_name, Patient(name, age, record, person_id)
+
+
+def parse_staff(row, person_id=None):
+    """
+    Validate a row and return (department name, Staff).
+    Raises ValueError with the reason when the row is invalid.
+    """
+    dept_name = _text(row, "department")
+    name = _text(row, "name")
+    age = _age(row)
+    role = _text(row, "role")
+    try:
+        salary = float(row.get("salary"))
+    except (TypeError, ValueError):
+        raise ValueError("salary must be a number")
+    if not math.isfinite(salary):
+        raise ValueError("salary must be a finite number")
+    if salary < 0:
+        raise ValueError("salary must not be negative")
+    return dept_name, Staff(name, age, role, dept_name, salary, person_id)
+
+
+# ===============================
+# Importing
+# ===============================
+
+def import_file(hospital, path: str, kind: str, batch_size: int = 1000,
+                create_departments: bool = False, progress=None):
+    """
+    Import patients or staff from a CSV / JSONL file into the hospital.
+
+    :param kind: "patients" or "staff"
+    :param batch_size: Rows validated and inserted together
+    :param create_departments: Create unknown departments instead of
+                               rejecting their rows
+    :param progress: Optional callback(report) called after each batch;
+                     returning False stops the import there
+    :return: ImportReport
+    """
+    if kind not in ("patients", "staff"):
+        raise ValueError(f"Unknown kind: {kind!r}")
+
+    report = ImportReport()
+    start = time.perf_counter()
+
+    batch = []
+    for line, row in read_rows(path):
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            _import_batch(hospital, batch, kind, create_departments, report)
+            batch = []
+            if progress is not None:
+                report.elapsed = time.perf_counter() - start
+                if progress(report) is False:
+                    report.cancelled = True
+                    break
+
+    if batch and not report.cancelled:
+        _import_batch(hospital, batch, kind, create_departments, report)
+
+    report.elapsed = time.perf_counter() - start
+    if progress is not None:
+        progress(report)
+    return report
+
+
+def _import_batch(hospital, batch, kind, create_departments, report):
+
+    if kind == "patients":
+        parse, ids = parse_patient, Patient.ids
+    else:
+        parse, ids = parse_staff, Staff.ids
+
+    # One block of IDs for the whole batch; rejected rows leave gaps
+    block = iter(ids.reserve(len(batch)))
+
+    # Validate and group by department
+    by_department = {}
+    for line, row in batch:
+        person_id = next(block)
+        if row is None:
+            report.reject(line, "unreadable row")
+            continue
+        try:
+            dept_name, person = parse(row, person_id)
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        by_department.setdefault(dept_name, []).append((line, person))
+
+    # Resolve each department once and insert its rows together
+    for dept_name, rows in by_department.items():
+        dept = hospital.get_department(dept_name)
+
+        if dept is None and create_departments:
+            dept = Department(dept_name)
+            hospital.add_department(dept)
+
+        if dept is None:
+            for line, person in rows:
+                report.reject(line, f"department '{dept_name}' not found")
+            continue
+
+        people = [person for line, person in rows]
+        if kind == "patients":
+            report.added += dept.add_patients(people)
+        else:
+            report.added += dept.add_staff_members(people)
+
+
+# ===============================
+# Command Line
+# ===============================
+
+def main(argv=None):
+
+    from Core.hospital import Hospital
+    from Core.storage import HospitalStore
+
+    parser = argparse.ArgumentParser(description="Bulk import patients or staff.")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--kind", choices=["patients", "staff"], required=True)
+    parser.add_argument("--data", default="hospital_data", help="hospital data folder")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--create-departments", action="store_true")
+    args = parser.parse_args(argv)
+
+    hospital = Hospital("Smart Hospital")
+    store = HospitalStore(args.data, sync_every=args.batch_size)
+    store.open(hospital)
+
+    try:
+        report = import_file(
+            hospital, args.path, args.kind,
+            batch_size=args.batch_size,
+            create_departments=args.create_departments,
+            progress=lambda r: print(f"\r{r.added + r.rejected:,} rows...", end="", flush=True)
+        )
+    finally:
+        store.close()
+
+    print()
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
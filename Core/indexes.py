@@ -0,0 +1,350 @@
+"""
+Indexes Module
+--------------
+This module defines the secondary indexes behind Hospital.query_patients()
+and Hospital.query_staff():
+- ValueIndex maps each value (e.g. a staff role) to the IDs that have it,
+  for equality predicates,
+- BucketIndex also keeps its distinct values sorted, for range
+  predicates over values that repeat a lot (e.g. ages),
+- SortedIndex keeps (value, ID) pairs sorted in chunks of parallel
+  arrays, for range predicates over values that rarely repeat (e.g.
+  salaries).
+
+Ranges are found with a binary search. IDs for one value are kept in an
+ascending array, so adding a record to a ValueIndex or BucketIndex is
+almost always an append. Removing records finds each (value, ID) with a
+binary search too, so removing a department costs in proportion to its
+own records, not to the hospital's.
+
+intersect() combines several predicates: it starts from the one with
+the fewest matches and intersects the others into it, or checks them on
+the records themselves when their match sets are much larger.
+"""
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from itertools import chain, islice
+
+from Models.cursors import add_sorted_id
+
+
+# A predicate matches `count` records. ids() yields their IDs in any
+# order, ordered() in ascending order, and test(person) checks a single
+# record against it.
+Predicate = namedtuple("Predicate", "count ids ordered test")
+
+# Intersect a predicate's IDs only while it matches at most this many
+# times more records than the first one; otherwise test records. Set
+# intersection runs in C, testing a record fetches it in Python, so
+# intersecting wins unless the other predicate is far less selective.
+_INTERSECT_RATIO = 50
+
+# Entries per SortedIndex chunk; a chunk is split in two when it reaches
+# twice this, so an insert or delete moves at most that many entries.
+_CHUNK = 1024
+
+
+class ValueIndex:
+    """
+    Hash index: value -> ascending array of IDs.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    # ===============================
+    # Updates
+    # ===============================
+
+    def add(self, person_id: int, value):
+        ids = self._ids.get(value)
+        if ids is None:
+            ids = self._ids[value] = array("q")
+            self._value_added(value)
+
+        add_sorted_id(ids, person_id)
+        self._size += 1
+
+    def discard(self, entries):
+        """
+        Remove (ID, value) pairs, e.g. every record of a removed department.
+        Only the buckets of those values are touched.
+        """
+        removed = {}
+        for person_id, value in entries:
+            removed.setdefault(value, []).append(person_id)
+
+        for value, person_ids in removed.items():
+            ids = self._ids.get(value)
+            if ids is None:
+                continue
+
+            kept = _remove_ids(ids, sorted(person_ids))
+            self._size -= len(ids) - len(kept)
+            if kept:
+                self._ids[value] = kept
+            else:
+                del self._ids[value]
+                self._value_removed(value)
+
+    def _value_added(self, value):
+        pass
+
+    def _value_removed(self, value):
+        pass
+
+    # ===============================
+    # Lookups
+    # ===============================
+
+    def count(self, value):
+        return len(self._ids.get(value, ()))
+
+    def get(self, value):
+        return self._ids.get(value, ())
+
+    def equal(self, value, test_value):
+        """
+        Predicate for value == `value`; test_value(person) reads it.
+        """
+        return Predicate(
+            self.count(value),
+            lambda: self.get(value),
+            lambda: iter(self.get(value)),
+            lambda person: test_value(person) == value
+        )
+
+
+class BucketIndex(ValueIndex):
+    """
+    ValueIndex that also answers range queries over its values.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._values = []    # distinct values, ascending
+
+    def _value_added(self, value):
+        insort(self._values, value)
+
+    def _value_removed(self, value):
+        del self._values[bisect_left(self._values, value)]
+
+    def _between(self, low, high):
+        start = 0 if low is None else bisect_left(self._values, low)
+        end = len(self._values) if high is None else bisect_right(self._values, high)
+        return [self._ids[value] for value in self._values[start:end]]
+
+    def between(self, low, high, test_value):
+        """
+        Predicate for low <= value <= high (None leaves that end open);
+        test_value(person) reads the value.
+        """
+        buckets = self._between(low, high)
+        return Predicate(
+            sum(map(len, buckets)),
+            lambda: chain.from_iterable(buckets),
+            lambda: heapq.merge(*buckets),
+            _range_test(low, high, test_value)
+        )
+
+
+class SortedIndex:
+    """
+    Sorted index: (value, ID) pairs in ascending order, held in chunks of
+    two parallel arrays, so a range is a run of chunk slices between two
+    binary searches and an update only shifts entries within one chunk.
+    """
+
+    def __init__(self, typecode="d"):
+        self._typecode = typecode
+        self._values = []    # chunks of values
+        self._ids = []       # chunks of IDs, parallel to _values
+        self._maxes = []     # (value, ID) of the last entry of each chunk
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _locate(self, value, person_id):
+        """
+        (chunk, position) where (value, person_id) is or would be inserted.
+        """
+        chunk = min(bisect_left(self._maxes, (value, person_id)), len(self._maxes) - 1)
+        values = self._values[chunk]
+        start = bisect_left(values, value)
+        end = bisect_right(values, value, start)
+        return chunk, bisect_left(self._ids[chunk], person_id, start, end)
+
+    # ===============================
+    # Updates
+    # ===============================
+
+    def add(self, person_id: int, value):
+        if not self._maxes:
+            self._values.append(array(self._typecode, [value]))
+            self._ids.append(array("q", [person_id]))
+            self._maxes.append((value, person_id))
+            self._size = 1
+            return
+
+        chunk, i = self._locate(value, person_id)
+        values, ids = self._values[chunk], self._ids[chunk]
+        values.insert(i, value)
+        ids.insert(i, person_id)
+        self._size += 1
+
+        if i == len(ids) - 1:
+            self._maxes[chunk] = (value, person_id)
+        if len(ids) >= 2 * _CHUNK:
+            self._values[chunk:chunk + 1] = [values[:_CHUNK], values[_CHUNK:]]
+            self._ids[chunk:chunk + 1] = [ids[:_CHUNK], ids[_CHUNK:]]
+            self._maxes.insert(chunk, (values[_CHUNK - 1], ids[_CHUNK - 1]))
+
+    def discard(self, entries):
+        """
+        Remove (ID, value) pairs, e.g. every record of a removed department.
+        """
+        for person_id, value in entries:
+            if not self._maxes:
+                return
+
+            chunk, i = self._locate(value, person_id)
+            values, ids = self._values[chunk], self._ids[chunk]
+            if i == len(ids) or ids[i] != person_id:
+                continue
+
+            del values[i]
+            del ids[i]
+            self._size -= 1
+
+            if not ids:
+                del self._values[chunk], self._ids[chunk], self._maxes[chunk]
+            elif i == len(ids):
+                self._maxes[chunk] = (values[-1], ids[-1])
+
+    # ===============================
+    # Lookups
+    # ===============================
+
+    def _between(self, low, high):
+        maxes, chunks = self._maxes, self._ids
+        if not maxes:
+            return array("q")
+
+        # (low,) sorts before every (low, ID) and (high, inf) after them
+        if low is None:
+            first, start = 0, 0
+        else:
+            first = bisect_left(maxes, (low,))
+            start = bisect_left(self._values[first], low) if first < len(maxes) else 0
+        if high is None:
+            last, end = len(maxes) - 1, len(chunks[-1])
+        else:
+            last = bisect_right(maxes, (high, math.inf))
+            if last < len(maxes):
+                end = bisect_right(self._values[last], high)
+            else:
+                last, end = len(maxes) - 1, len(chunks[-1])
+
+        if first > last:
+            return array("q")
+        if first == last:
+            return chunks[first][start:end]
+
+        ids = chunks[first][start:]
+        for chunk in range(first + 1, last):
+            ids.extend(chunks[chunk])
+        ids.extend(chunks[last][:end])
+        return ids
+
+    def between(self, low, high, test_value):
+        """
+        Predicate for low <= value <= high (None leaves that end open);
+        test_value(person) reads the value.
+        """
+        ids = self._between(low, high)
+        return Predicate(
+            len(ids),
+            lambda: ids,
+            lambda: iter(sorted(ids)),
+            _range_test(low, high, test_value)
+        )
+
+
+def _remove_ids(ids, removed):
+    """
+    `ids` (ascending) without the IDs in `removed` (ascending), each found
+    with a binary search; the kept runs are copied as slices.
+    """
+    kept = array("q")
+    copied = 0
+    for person_id in removed:
+        i = bisect_left(ids, person_id, copied)
+        if i < len(ids) and ids[i] == person_id:
+            kept.extend(ids[copied:i])
+            copied = i + 1
+
+    if not copied:
+        return ids
+    kept.extend(ids[copied:])
+    return kept
+
+
+def _range_test(low, high, test_value):
+
+    def test(person):
+        value = test_value(person)
+        return (low is None or value >= low) and (high is None or value <= high)
+
+    return test
+
+
+def intersect(predicates, fetch, limit=None):
+    """
+    Records matching every predicate, in ID order.
+
+    :param predicates: At least one Predicate
+    :param fetch: fetch(id) returns (person, department) for an ID
+    :param limit: Maximum number of results, or None for all
+    :return: List of (person, department)
+    """
+    predicates = sorted(predicates, key=lambda p: p.count)
+    first = predicates[0]
+    if first.count == 0:
+        return []
+
+    joined = [p for p in predicates[1:] if p.count <= first.count * _INTERSECT_RATIO]
+    tests = [p.test for p in predicates[1:] if p.count > first.count * _INTERSECT_RATIO]
+
+    if joined:
+        ids = set(first.ids())
+        for predicate in joined:
+            ids.intersection_update(predicate.ids())
+            if not ids:
+                return []
+        ids = sorted(ids)
+    else:
+        # Nothing to intersect: walk the first predicate in ID order,
+        # so a limit stops the walk early
+        ids = first.ordered()
+
+    if not tests:
+        return [fetch(person_id) for person_id in islice(ids, limit)]
+
+    results = []
+    for person_id in ids:
+        found = fetch(person_id)
+        if all(test(found[0]) for test in tests):
+            results.append(found)
+            if limit is not None and len(results) >= limit:
+                break
+    return results
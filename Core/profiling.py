@@ -0,0 +1,105 @@
+"""
+Profiling Module
+----------------
+This module defines on-demand profile captures, started and stopped
+from the console menu or the GUI while the system is running:
+- "cpu" records function calls with cProfile,
+- "memory" records allocations with tracemalloc.
+
+cProfile only sees the thread that started the capture (the menu loop,
+or the GUI's UI thread). tracemalloc sees every thread.
+
+    capture = ProfileCapture("cpu")
+    capture.start()
+    ...
+    print(capture.stop())            # top entries as text
+    capture.save("hospital.prof")    # for pstats / snakeviz
+"""
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+
+KINDS = ("cpu", "memory")
+
+
+class ProfileCapture:
+    """
+    One cProfile or tracemalloc capture.
+    """
+
+    def __init__(self, kind: str = "cpu", frames: int = 10):
+        """
+        :param kind: "cpu" or "memory"
+        :param frames: Stack frames kept per allocation ("memory" only)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown capture kind: {kind!r}")
+
+        self.kind = kind
+        self.frames = frames
+        self.running = False
+        self._profile = None
+        self._snapshot = None
+        self._diff = []
+        self._started_tracing = False
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("Capture already running")
+
+        if self.kind == "cpu":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(self.frames)
+            self._snapshot = tracemalloc.take_snapshot()
+        self.running = True
+
+    def stop(self, top: int = 25):
+        """
+        End the capture and return a text report of its top entries.
+        """
+        if not self.running:
+            raise RuntimeError("Capture is not running")
+        self.running = False
+
+        if self.kind == "cpu":
+            self._profile.disable()
+        else:
+            baseline = self._snapshot
+            self._snapshot = tracemalloc.take_snapshot()
+            self._diff = self._snapshot.compare_to(baseline, "lineno")
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        return self.report(top)
+
+    def report(self, top: int = 25):
+        if self.kind == "cpu":
+            out = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=out)
+            stats.sort_stats("cumulative").print_stats(top)
+            return out.getvalue()
+
+        lines = [f"Top {top} allocation changes by line:"]
+        lines.extend(str(stat) for stat in self._diff[:top])
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """
+        Write the capture: pstats data for "cpu", a tracemalloc
+        snapshot (tracemalloc.Snapshot.load) for "memory".
+        """
+        if self.running:
+            raise RuntimeError("Stop the capture before saving it")
+
+        if self.kind == "cpu":
+            self._profile.dump_stats(path)
+        else:
+            self._snapshot.dump(path)
+        return path
@@ -0,0 +1,341 @@
+"""
+Repository Module
+-----------------
+This module defines the repositories that answer listing queries for
+a Hospital:
+- MemoryRepository walks the in-memory departments (the default),
+- SQLiteRepository mirrors the hospital into a local SQLite database
+  and answers the same queries from indexed tables.
+
+Both return pages of (person, department name) rows ordered by ID.
+Pages are keyset-paginated: pass the last ID of one page as `after_id`
+to get the next one, so callers never load a whole listing at once.
+
+Rows from SQLiteRepository are lightweight PatientRow / StaffRow tuples
+with the same attribute names as Patient and Staff.
+"""
+
+import heapq
+import threading
+from collections import namedtuple
+from itertools import islice, repeat
+
+from Models.events import DepartmentAdded, DepartmentRemoved, PatientAdded, StaffAdded
+from Models.patient import PREVIEW_LENGTH
+
+
+class PatientRow(namedtuple("PatientRow", "id name age medical_record")):
+
+    __slots__ = ()
+
+    @property
+    def preview(self):
+        return self.medical_record[:PREVIEW_LENGTH]
+
+
+StaffRow = namedtuple("StaffRow", "id name age role department salary")
+
+
+class MemoryRepository:
+    """
+    Answers listing queries from the hospital's departments.
+    """
+
+    def __init__(self):
+        self.hospital = None
+
+    def attach(self, hospital):
+        self.hospital = hospital
+
+    def detach(self):
+        self.hospital = None
+
+    def _departments(self, department):
+        if department is None:
+            return list(self.hospital.departments.values())
+        found = self.hospital.get_department(department)
+        return [found] if found else []
+
+    # ===============================
+    # Queries
+    # ===============================
+
+    def page_patients(self, department=None, after_id=0, limit=50,
+                      min_age=None, max_age=None, name_prefix=None):
+
+        prefix = name_prefix.casefold() if name_prefix else None
+
+        rows = (
+            row for row in self._merged(department, "patients_after", after_id)
+            if (min_age is None or row[0].age >= min_age)
+            and (max_age is None or row[0].age <= max_age)
+            and (prefix is None or row[0].name.casefold().startswith(prefix))
+        )
+        return list(islice(rows, limit))
+
+    def page_staff(self, department=None, after_id=0, limit=50,
+                   role=None, min_age=None, max_age=None, name_prefix=None):
+
+        prefix = name_prefix.casefold() if name_prefix else None
+
+        rows = (
+            row for row in self._merged(department, "staff_after", after_id)
+            if (role is None or row[0].role == role)
+            and (min_age is None or row[0].age >= min_age)
+            and (max_age is None or row[0].age <= max_age)
+            and (prefix is None or row[0].name.casefold().startswith(prefix))
+        )
+        return list(islice(rows, limit))
+
+    def _merged(self, department, after, after_id):
+        """
+        (person, department name) rows above after_id in ID order, merged
+        lazily from each department's sorted IDs, so a page costs about
+        `limit` steps rather than a scan of every record.
+        """
+        return heapq.merge(
+            *(
+                zip(getattr(d, after)(after_id), repeat(d.name))
+                for d in self._departments(department)
+            ),
+            key=lambda row: row[0].id
+        )
+
+    def count_patients(self, department=None):
+        return sum(len(d.patients) for d in self._departments(department))
+
+    def count_staff(self, department=None):
+        return sum(len(d.staff_members) for d in self._departments(department))
+
+
+class SQLiteRepository:
+    """
+    Mirrors a hospital into SQLite and answers listing queries from it.
+
+    Uses one connection in WAL mode for its whole life. Queries are
+    fixed SQL strings, so sqlite3's statement cache reuses the prepared
+    statements. Writes are committed every `commit_every` changes and on
+    commit() / close().
+
+    The connection is shared by the hospital's writers (through events)
+    and by readers on other threads, so every use of it holds `_lock`: a
+    page is read between whole changes, never half-way through one.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS departments (
+            name TEXT PRIMARY KEY
+        )""",
+        """CREATE TABLE IF NOT EXISTS patients (
+            id INTEGER PRIMARY KEY,
+            department TEXT NOT NULL,
+            name TEXT NOT NULL,
+            folded_name TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            medical_record TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS staff (
+            id INTEGER PRIMARY KEY,
+            department TEXT NOT NULL,
+            name TEXT NOT NULL,
+            folded_name TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            salary REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS patients_department ON patients (department, id)",
+        "CREATE INDEX IF NOT EXISTS patients_name ON patients (folded_name)",
+        "CREATE INDEX IF NOT EXISTS patients_age ON patients (age)",
+        "CREATE INDEX IF NOT EXISTS staff_department ON staff (department, id)",
+        "CREATE INDEX IF NOT EXISTS staff_name ON staff (folded_name)",
+        "CREATE INDEX IF NOT EXISTS staff_role ON staff (role, id)",
+        "CREATE INDEX IF NOT EXISTS staff_age ON staff (age)",
+    ]
+
+    INSERT_DEPARTMENT = "INSERT OR REPLACE INTO departments (name) VALUES (?)"
+    INSERT_PATIENT = ("INSERT OR REPLACE INTO patients (id, department, name, folded_name, age, medical_record) "
+                      "VALUES (?, ?, ?, ?, ?, ?)")
+    INSERT_STAFF = ("INSERT OR REPLACE INTO staff (id, department, name, folded_name, age, role, salary) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+    # Bumped when the tables change; the mirror is rebuilt on attach(),
+    # so an older database's tables are simply dropped
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: str, commit_every: int = 1000):
+        self.path = path
+        self.commit_every = commit_every
+        self.hospital = None
+        self._uncommitted = 0
+        self._lock = threading.RLock()
+
+        # Only this backend needs sqlite3; imported here to keep it out of startup
+        import sqlite3
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            for table in ("departments", "patients", "staff"):
+                self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+    # ===============================
+    # Attach / Detach
+    # ===============================
+
+    def attach(self, hospital):
+        """
+        Copy the hospital's current state, then follow its changes.
+        """
+        self.hospital = hospital
+
+        with self._lock, self.connection:
+            for table in ("departments", "patients", "staff"):
+                self.connection.execute(f"DELETE FROM {table}")
+            for department in hospital.departments.values():
+                self._insert_department(department)
+
+        hospital.events.subscribe(self._on_event)
+
+    def detach(self):
+        if self.hospital is not None:
+            self.hospital.events.unsubscribe(self._on_event)
+            self.hospital = None
+        self.commit()
+
+    def commit(self):
+        with self._lock:
+            self.connection.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.detach()
+        with self._lock:
+            self.connection.close()
+
+    # ===============================
+    # Writes
+    # ===============================
+
+    def _on_event(self, event):
+
+        with self._lock:
+            if isinstance(event, PatientAdded):
+                self.connection.execute(self.INSERT_PATIENT, _patient_values(event.department.name, event.patient))
+
+            elif isinstance(event, StaffAdded):
+                self.connection.execute(self.INSERT_STAFF, _staff_values(event.department.name, event.staff))
+
+            elif isinstance(event, DepartmentAdded):
+                self._insert_department(event.department)
+
+            elif isinstance(event, DepartmentRemoved):
+                name = event.department.name
+                self.connection.execute("DELETE FROM patients WHERE department = ?", (name,))
+                self.connection.execute("DELETE FROM staff WHERE department = ?", (name,))
+                self.connection.execute("DELETE FROM departments WHERE name = ?", (name,))
+
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self.commit()
+
+    def _insert_department(self, department):
+
+        name = department.name
+        self.connection.execute(self.INSERT_DEPARTMENT, (name,))
+        self.connection.executemany(
+            self.INSERT_PATIENT, (_patient_values(name, p) for p in department.patients.values())
+        )
+        self.connection.executemany(
+            self.INSERT_STAFF, (_staff_values(name, s) for s in department.staff_members.values())
+        )
+
+    # ===============================
+    # Queries
+    # ===============================
+
+    def page_patients(self, department=None, after_id=0, limit=50,
+                      min_age=None, max_age=None, name_prefix=None):
+
+        where, params = _filters(department, None, min_age, max_age, name_prefix)
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT id, name, age, medical_record, department FROM patients "
+                f"WHERE id > ?{where} ORDER BY id LIMIT ?",
+                (after_id, *params, limit)
+            ).fetchall()
+        return [(PatientRow(*row[:4]), row[4]) for row in rows]
+
+    def page_staff(self, department=None, after_id=0, limit=50,
+                   role=None, min_age=None, max_age=None, name_prefix=None):
+
+        where, params = _filters(department, role, min_age, max_age, name_prefix)
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT id, name, age, role, department, salary FROM staff "
+                f"WHERE id > ?{where} ORDER BY id LIMIT ?",
+                (after_id, *params, limit)
+            ).fetchall()
+        return [(StaffRow(*row), row[4]) for row in rows]
+
+    def count_patients(self, department=None):
+        return self._count("patients", department)
+
+    def count_staff(self, department=None):
+        return self._count("staff", department)
+
+    def _count(self, table, department):
+        with self._lock:
+            if department is None:
+                row = self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+            else:
+                row = self.connection.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE department = ?", (department,)
+                ).fetchone()
+        return row[0]
+
+
+# ===============================
+# Helpers
+# ===============================
+
+def _patient_values(dept_name, patient):
+    name = patient.name
+    return (patient.id, dept_name, name, name.casefold(), patient.age, patient.medical_record)
+
+
+def _staff_values(dept_name, staff):
+    name = staff.name
+    return (staff.id, dept_name, name, name.casefold(), staff.age, staff.role, staff.salary)
+
+
+def _filters(department, role, min_age, max_age, name_prefix):
+    """
+    Build the extra WHERE clauses and parameters for a page query.
+    """
+    where = ""
+    params = []
+
+    if department is not None:
+        where += " AND department = ?"
+        params.append(department)
+    if role is not None:
+        where += " AND role = ?"
+        params.append(role)
+    if min_age is not None:
+        where += " AND age >= ?"
+        params.append(min_age)
+    if max_age is not None:
+        where += " AND age <= ?"
+        params.append(max_age)
+    if name_prefix:
+        # A range scan the name index can answer: prefix <= name < next
+        # prefix, over names casefolded as MemoryRepository compares them
+        prefix = name_prefix.casefold()
+        where += " AND folded_name >= ? AND folded_name < ?"
+        params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+
+    return where, params
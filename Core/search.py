@@ -0,0 +1,252 @@
+"""
+Search Module
+-------------
+This module defines the name search index used by Hospital.search_people().
+
+Names are split into lowercase tokens. Each token maps to the IDs of the
+people whose name contains it, which gives:
+- exact token matches through a dict lookup,
+- prefix matches through a sorted list of the distinct tokens,
+- typo-tolerant matches through a bigram index over the tokens,
+  confirmed with a bounded edit distance.
+
+Only distinct tokens are sorted and bigram-indexed, and names repeat a
+lot, so those structures stay much smaller than the number of people.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+
+
+_TOKEN = re.compile(r"\w+")
+
+# Score of one query term against one name token
+_EXACT_SCORE = 1.0
+_PREFIX_SCORE = 0.5    # plus up to 0.4 for how much of the token is typed
+_TYPO_SCORE = 0.4      # divided by the number of typos
+
+
+def tokenize(text: str):
+    """
+    Split text into lowercase word tokens.
+    """
+    return _TOKEN.findall(text.casefold())
+
+
+def _bigrams(token: str):
+    padded = f"${token}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _edit_distance(a: str, b: str, limit: int):
+    """
+    Edit distance between a and b, counting a swap of two adjacent
+    letters as one edit, or limit + 1 once it is known to be larger
+    than limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    # A shared prefix or suffix never needs editing
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            )
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    Token index over person names, keyed by person ID.
+    """
+
+    def __init__(self):
+        self._tokens_by_id = {}    # person id -> name tokens
+        self._ids_by_token = {}    # token -> set of person ids
+        self._sorted_tokens = []   # distinct tokens, sorted
+        self._bigram_tokens = {}  # bigram -> set of tokens
+
+    def __len__(self):
+        return len(self._tokens_by_id)
+
+    # ===============================
+    # Updates
+    # ===============================
+
+    def add(self, person_id: int, name: str):
+        """
+        Index a person's name. Re-adding an ID replaces its old name.
+        """
+        if person_id in self._tokens_by_id:
+            self.remove(person_id)
+
+        tokens = tuple(set(tokenize(name)))
+        self._tokens_by_id[person_id] = tokens
+
+        for token in tokens:
+            ids = self._ids_by_token.get(token)
+            if ids is None:
+                ids = self._ids_by_token[token] = set()
+                insort(self._sorted_tokens, token)
+                for gram in _bigrams(token):
+                    self._bigram_tokens.setdefault(gram, set()).add(token)
+            ids.add(person_id)
+
+    def remove(self, person_id: int):
+        """
+        Remove a person from the index, if present.
+        """
+        tokens = self._tokens_by_id.pop(person_id, ())
+
+        for token in tokens:
+            ids = self._ids_by_token[token]
+            ids.discard(person_id)
+            if ids:
+                continue
+
+            del self._ids_by_token[token]
+            del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+            for gram in _bigrams(token):
+                grams = self._bigram_tokens[gram]
+                grams.discard(token)
+                if not grams:
+                    del self._bigram_tokens[gram]
+
+    # ===============================
+    # Queries
+    # ===============================
+
+    def search(self, query: str, limit: int = 10):
+        """
+        Return up to `limit` (score, person id) pairs, best first.
+
+        Every query term must match some token of the name, exactly,
+        as a prefix, or with a small number of typos.
+        """
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+
+        matches = [self._match_term(term) for term in terms]
+        if not all(matches):
+            return []
+
+        if len(matches) == 1:
+            return self._top_single(matches[0], limit)
+
+        # Walk the people matched by the rarest term and check the
+        # other terms against their own tokens
+        driver = min(matches, key=self._match_size)
+        others = [m for m in matches if m is not driver]
+
+        scores = {}
+        for token, score in driver.items():
+            for person_id in self._ids_by_token[token]:
+                total = score
+                name_tokens = self._tokens_by_id[person_id]
+                for other in others:
+                    best = max(other.get(t, 0.0) for t in name_tokens)
+                    if not best:
+                        break
+                    total += best
+                else:
+                    if total > scores.get(person_id, 0.0):
+                        scores[person_id] = total
+
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, person_id) for person_id, score in ranked]
+
+    def _top_single(self, token_scores, limit):
+        """
+        Best matches for one term: take people from the best tokens
+        first and stop once `limit` are found.
+        """
+        results = []
+        seen = set()
+
+        for token in sorted(token_scores, key=lambda t: (-token_scores[t], t)):
+            ids = self._ids_by_token[token]
+            wanted = limit - len(results)
+            for person_id in heapq.nsmallest(wanted + len(seen), ids):
+                if person_id in seen:
+                    continue
+                seen.add(person_id)
+                results.append((token_scores[token], person_id))
+                if len(results) == limit:
+                    return results
+
+        return results
+
+    def _match_size(self, token_scores):
+        return sum(len(self._ids_by_token[token]) for token in token_scores)
+
+    def _match_term(self, term):
+        """
+        Map each token matching the term to its score.
+        """
+        token_scores = {}
+
+        # Exact and prefix matches
+        tokens = self._sorted_tokens
+        for i in range(bisect_left(tokens, term), len(tokens)):
+            token = tokens[i]
+            if not token.startswith(term):
+                break
+            if token == term:
+                token_scores[token] = _EXACT_SCORE
+            else:
+                token_scores[token] = _PREFIX_SCORE + 0.4 * len(term) / len(token)
+
+        # Typo-tolerant matches
+        if len(term) >= 3:
+            max_typos = 1 if len(term) <= 5 else 2
+            for token, typos in self._typo_matches(term, max_typos):
+                score = _TYPO_SCORE / typos
+                if score > token_scores.get(token, 0.0):
+                    token_scores[token] = score
+
+        return token_scores
+
+    def _typo_matches(self, term, max_typos):
+        """
+        Yield (token, typos) for tokens within max_typos edits of term.
+        """
+        grams = _bigrams(term)
+
+        # Each edit (or swap of two letters) breaks at most three bigrams
+        needed = max(1, len(grams) - 3 * max_typos)
+
+        shared = {}
+        for gram in grams:
+            for token in self._bigram_tokens.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        for token, count in shared.items():
+            if count < needed or token == term:
+                continue
+            typos = _edit_distance(term, token, max_typos)
+            if 0 < typos <= max_typos:
+                yield token, typos
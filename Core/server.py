@@ -0,0 +1,532 @@
+"""
+Server Module
+-------------
+This module serves a Hospital as a small HTTP/JSON API on asyncio, so
+several front-desk terminals can share one hospital.
+
+Connections are kept alive (HTTP/1.1) and requests may be pipelined:
+each connection answers its requests in order as they arrive.
+
+The event loop only reads and writes sockets. Each request runs on a
+thread pool, so the Hospital must be thread-safe (Hospital(...,
+thread_safe=True)); a slow call, or an fsync of the write-ahead log,
+then holds up only its own connection.
+
+Given the HospitalStore, the server flushes it after every request that
+is not a GET and before answering, so a 2xx means the change is on
+disk. Requests that finish together share one fsync: the first flush
+writes every record logged so far, and the others find nothing left.
+
+Endpoints:
+    GET    /summary
+    GET    /departments
+    POST   /departments                 {"name": ...}
+    DELETE /departments/<name>
+    GET    /patients?department=&after_id=&limit=&min_age=&max_age=&name_prefix=
+    POST   /patients                    {"department", "name", "age", "medical_record"}
+    GET    /patients/<id>
+    GET    /patients/search?q=&limit=
+    GET    /patients/records?q=&limit=
+    GET    /staff?department=&role=&after_id=&limit=&min_age=&max_age=&name_prefix=
+    POST   /staff                       {"department", "name", "age", "role", "salary"}
+    GET    /staff/<id>
+    GET    /staff/search?q=&limit=
+    POST   /batch                       {"requests": [{"method", "path", "body"}, ...]}
+    GET    /metrics?format=json|prometheus
+
+Listings return {"items": [...], "next_after_id": id or null}; pass
+next_after_id back as after_id for the next page. Errors return
+{"error": message} with a 4xx status. /metrics returns the Models.metrics
+snapshot, as Prometheus text by default.
+
+Command line:
+    python -m Core.server --data hospital_data --port 8080 [--metrics]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from Models.department import Department
+from Models.locks import NULL_LOCK
+from Models.metrics import metrics
+from .importer import parse_patient, parse_staff
+
+
+MAX_HEADER_LINES = 100
+MAX_BODY = 16 * 1024 * 1024
+MAX_PAGE = 1000
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HospitalAPI:
+    """
+    Maps (method, path, query, body) requests onto a Hospital.
+    Independent of the transport, so /batch can call it directly.
+    """
+
+    def __init__(self, hospital):
+        self.hospital = hospital
+        self.routes = [
+            ("GET", r"/summary", self.get_summary),
+            ("GET", r"/departments", self.list_departments),
+            ("POST", r"/departments", self.add_department),
+            ("DELETE", r"/departments/(?P<name>[^/]+)", self.remove_department),
+            ("GET", r"/patients", self.list_patients),
+            ("POST", r"/patients", self.add_patient),
+            ("GET", r"/patients/search", self.search_patients),
+            ("GET", r"/patients/records", self.search_records),
+            ("GET", r"/patients/(?P<id>\d+)", self.get_patient),
+            ("GET", r"/staff", self.list_staff),
+            ("POST", r"/staff", self.add_staff),
+            ("GET", r"/staff/search", self.search_staff),
+            ("GET", r"/staff/(?P<id>\d+)", self.get_staff),
+            ("POST", r"/batch", self.batch),
+            ("GET", r"/metrics", self.get_metrics),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self.routes]
+
+    def handle(self, method, target, body=None):
+        """
+        Answer one request. Returns (status, JSON-able body); a str
+        body is sent as plain text.
+        """
+        parts = urlsplit(target)
+        query = dict(parse_qsl(parts.query))
+
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(parts.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            params = {key: unquote(value) for key, value in match.groupdict().items()}
+            try:
+                return handler(query=query, body=body, **params)
+            except HTTPError as e:
+                return e.status, {"error": e.message}
+
+        if allowed:
+            return 405, {"error": "Method not allowed."}
+        return 404, {"error": "Not found."}
+
+    # ===============================
+    # Departments
+    # ===============================
+
+    def get_summary(self, query, body):
+        return 200, self.hospital.get_summary()
+
+    def list_departments(self, query, body):
+        return 200, {"items": [
+            {"name": d.name, "patients": len(d.patients), "staff": len(d.staff_members)}
+            for d in self.hospital.list_departments()
+        ]}
+
+    def add_department(self, query, body):
+        name = _field(body, "name")
+        result = self.hospital.add_department(Department(name))
+        if "successfully" not in result.lower():
+            raise HTTPError(409, result)
+        return 201, {"name": name}
+
+    def remove_department(self, query, body, name):
+        result = self.hospital.remove_department(name)
+        if result == "Department not found.":
+            raise HTTPError(404, result)
+        return 200, {"name": name}
+
+    # ===============================
+    # Patients
+    # ===============================
+
+    def list_patients(self, query, body):
+        rows = self.hospital.page_patients(
+            query.get("department"), _int(query, "after_id", 0), _limit(query, 50),
+            min_age=_int(query, "min_age"), max_age=_int(query, "max_age"),
+            name_prefix=query.get("name_prefix")
+        )
+        return 200, _page(rows, _limit(query, 50), _patient_json)
+
+    def add_patient(self, query, body):
+        try:
+            dept_name, patient = parse_patient(_object(body))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        department = self._department(dept_name)
+        result = department.add_patient(patient)
+        if "successfully" not in result.lower():
+            raise HTTPError(409, result)
+        return 201, _patient_json(patient, dept_name)
+
+    def get_patient(self, query, body, id):
+        found = self.hospital.find_patient(int(id))
+        if found is None:
+            raise HTTPError(404, "Patient not found.")
+        patient, department = found
+        return 200, _patient_json(patient, department.name)
+
+    def search_patients(self, query, body):
+        results = self.hospital.search_people(_field(query, "q"), kind="patient", limit=_limit(query, 10))
+        return 200, {"items": [_patient_json(p, d.name) for p, d in results]}
+
+    def search_records(self, query, body):
+        results = self.hospital.search_records(_field(query, "q"), limit=_limit(query, 20))
+        return 200, {"items": [_patient_json(p, d.name) for p, d in results]}
+
+    # ===============================
+    # Staff
+    # ===============================
+
+    def list_staff(self, query, body):
+        rows = self.hospital.page_staff(
+            query.get("department"), _int(query, "after_id", 0), _limit(query, 50),
+            role=query.get("role"),
+            min_age=_int(query, "min_age"), max_age=_int(query, "max_age"),
+            name_prefix=query.get("name_prefix")
+        )
+        return 200, _page(rows, _limit(query, 50), _staff_json)
+
+    def add_staff(self, query, body):
+        try:
+            dept_name, staff = parse_staff(_object(body))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        department = self._department(dept_name)
+        result = department.add_staff(staff)
+        if "successfully" not in result.lower():
+            raise HTTPError(409, result)
+        return 201, _staff_json(staff, dept_name)
+
+    def get_staff(self, query, body, id):
+        found = self.hospital.find_staff(int(id))
+        if found is None:
+            raise HTTPError(404, "Staff member not found.")
+        staff, department = found
+        return 200, _staff_json(staff, department.name)
+
+    def search_staff(self, query, body):
+        results = self.hospital.search_people(_field(query, "q"), kind="staff", limit=_limit(query, 10))
+        return 200, {"items": [_staff_json(s, d.name) for s, d in results]}
+
+    # ===============================
+    # Metrics
+    # ===============================
+
+    def get_metrics(self, query, body):
+        fmt = query.get("format", "prometheus")
+        if fmt == "json":
+            return 200, {"enabled": metrics.enabled, "metrics": metrics.snapshot()}
+        if fmt == "prometheus":
+            return 200, metrics.to_prometheus()
+        raise HTTPError(400, "format must be json or prometheus.")
+
+    # ===============================
+    # Batch
+    # ===============================
+
+    def batch(self, query, body):
+        """
+        Run several requests in one round trip; each gets its own
+        status, and a failing request does not stop the others.
+        """
+        requests = _object(body).get("requests")
+        if not isinstance(requests, list):
+            raise HTTPError(400, "requests must be a list")
+
+        responses = []
+        for request in requests:
+            try:
+                status, result = self._batch_request(request)
+            except HTTPError as e:
+                status, result = e.status, {"error": e.message}
+            except Exception as e:
+                status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+            responses.append({"status": status, "body": result})
+
+        return 200, {"responses": responses}
+
+    def _batch_request(self, request):
+
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Each request must be a JSON object.")
+        path = request.get("path")
+        if not isinstance(path, str) or not path.startswith("/"):
+            raise HTTPError(400, "Each request needs a path starting with /.")
+        method = request.get("method", "GET")
+        if not isinstance(method, str):
+            raise HTTPError(400, "method must be a string.")
+        if urlsplit(path).path.startswith("/batch"):
+            raise HTTPError(400, "Batches cannot be nested.")
+
+        return self.handle(method.upper(), path, request.get("body"))
+
+    def _department(self, name):
+        department = self.hospital.get_department(name)
+        if department is None:
+            raise HTTPError(404, "Department not found.")
+        return department
+
+
+# ===============================
+# JSON Helpers
+# ===============================
+
+def _patient_json(patient, dept_name):
+    return {"id": patient.id, "name": patient.name, "age": patient.age,
+            "department": dept_name, "medical_record": patient.medical_record}
+
+
+def _staff_json(staff, dept_name):
+    return {"id": staff.id, "name": staff.name, "age": staff.age, "role": staff.role,
+            "department": dept_name, "salary": staff.salary}
+
+
+def _page(rows, limit, encode):
+    items = [encode(person, dept_name) for person, dept_name in rows]
+    next_after_id = rows[-1][0].id if len(rows) == limit else None
+    return {"items": items, "next_after_id": next_after_id}
+
+
+def _object(body):
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Expected a JSON object.")
+    return body
+
+
+def _field(values, key):
+    value = values.get(key) if isinstance(values, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPError(400, f"missing {key}")
+    return value.strip()
+
+
+def _int(query, key, default=None):
+    if key not in query:
+        return default
+    try:
+        return int(query[key])
+    except ValueError:
+        raise HTTPError(400, f"{key} must be a whole number")
+
+
+def _limit(query, default):
+    limit = _int(query, "limit", default)
+    if not 1 <= limit <= MAX_PAGE:
+        raise HTTPError(400, f"limit must be between 1 and {MAX_PAGE}")
+    return limit
+
+
+# ===============================
+# HTTP
+# ===============================
+
+class HospitalServer:
+    """
+    asyncio HTTP/1.1 server for a HospitalAPI; requests run on a pool of
+    `workers` threads.
+    """
+
+    def __init__(self, hospital, host="127.0.0.1", port=8080, idle_timeout=60.0, workers=None,
+                 store=None):
+        """
+        :param store: HospitalStore logging the hospital, flushed before
+                      each change is acknowledged (None: not persisted)
+        """
+        if hospital.lock is NULL_LOCK:
+            raise ValueError("HospitalServer needs a Hospital created with thread_safe=True")
+
+        self.api = HospitalAPI(hospital)
+        self.store = store
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.server = None
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="hospital-api")
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self._executor.shutdown(wait=False)
+
+    async def _serve(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), self.idle_timeout)
+                except HTTPError as e:
+                    writer.write(self._response(e.status, {"error": e.message}, False))
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                keep_alive = _keep_alive(version, headers)
+
+                status, result = await loop.run_in_executor(
+                    self._executor, self._dispatch, method, target, headers, body
+                )
+                writer.write(self._response(status, result, keep_alive))
+
+                # Pipelined requests already buffered are answered before
+                # waiting on the socket; drain only applies back-pressure
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, method, target, headers, body):
+
+        if body:
+            if "json" not in headers.get("content-type", "application/json"):
+                return 400, {"error": "Expected a JSON body."}
+            try:
+                body = json.loads(body)
+            except ValueError:
+                return 400, {"error": "Invalid JSON."}
+        else:
+            body = None
+
+        try:
+            status, result = self.api.handle(method, target, body)
+            if self.store is not None and method != "GET":
+                self.store.flush()
+            return status, result
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def _response(self, status, result, keep_alive):
+        if isinstance(result, str):
+            payload, content_type = result.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            payload, content_type = self._encode(result).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + payload
+
+
+async def _read_request(reader):
+    """
+    Read one request. Returns None when the client has closed the
+    connection between requests.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(400, "Too many headers.")
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length.")
+    if length > MAX_BODY:
+        raise HTTPError(413, "Request body too large.")
+
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+def _keep_alive(version, headers):
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+# ===============================
+# Command Line
+# ===============================
+
+def main(argv=None):
+
+    from Core.hospital import Hospital
+    from Core.storage import HospitalStore
+    from Models.patient import Patient
+    from Models.records import RecordStore
+
+    parser = argparse.ArgumentParser(description="Serve the hospital as an HTTP/JSON API.")
+    parser.add_argument("--data", default="hospital_data", help="hospital data folder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--sync-every", type=int, default=1000,
+                        help="log records per fsync within one request (each change is synced before its reply)")
+    parser.add_argument("--workers", type=int, help="request threads (default: Python's thread pool size)")
+    parser.add_argument("--metrics", action="store_true", help="record call metrics for GET /metrics")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        metrics.enable()
+
+    # Long medical records are kept in a memory-mapped file, not in memory
+    Patient.record_store = RecordStore()
+
+    hospital = Hospital("Smart Hospital", thread_safe=True)
+    store = HospitalStore(args.data, sync_every=args.sync_every)
+    store.open(hospital)
+
+    server = HospitalServer(hospital, args.host, args.port, workers=args.workers, store=store)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+Snapshot Module
+---------------
+This module saves a whole Hospital (departments, patients and staff) to
+one binary file and loads it back. HospitalStore logs every change as it
+happens; a snapshot is a point-in-time copy that is quick to write and,
+above all, quick to load:
+
+    save_snapshot(hospital, "hospital.hsnap")
+    hospital = load_snapshot("hospital.hsnap", memory_map=True, lazy_records=True)
+
+- memory_map=True maps the file instead of reading it into memory.
+- lazy_records=True leaves the medical records in the file and reads
+  each one when it is accessed (see Models/records.py).
+- Departments are added with Hospital.restore_departments(), so their
+  people are indexed on the first search or query rather than on load.
+
+Compact departments load straight into their columns; that is the fast
+path (a million patients in well under a second).
+
+File layout (little-endian):
+    b"HSNP", version (u8), flags (u8, none defined yet)
+    patient and staff ID high-water marks (u64 each)
+    string table: count (u32), utf-8 lengths (u32 each), the text
+        (hospital and department names, people's names and roles)
+    hospital name (u32 string index), department count (u32)
+    per department:
+        name (u32 string index), compact (u8)
+        patient count (u32), then the columns ids, ages, names
+        staff count (u32), then the columns ids, ages, names, roles, salaries
+    records: offsets (u64, one per patient plus one), then the utf-8
+        text of every medical record, departments in file order
+
+Each column is a byte length (u32) and a payload:
+    ids           varints (LEB128) of the zigzag-coded difference to the
+                  previous id, so ids in increasing order take one byte each
+    ages          compact departments: varints (their columns hold 0..65535);
+                  dict departments: zigzag-coded varints, so any int age
+    names, roles  string index width (u8: 1, 2 or 4), then the indexes
+    salaries      float64
+
+Command line:
+    python -m Core.snapshot save hospital.hsnap --data hospital_data
+    python -m Core.snapshot info hospital.hsnap --mmap --lazy
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import accumulate, chain, islice
+from operator import sub
+
+from Models.columns import PatientColumns, StaffColumns
+from Models.department import Department
+from Models.patient import Patient, load_record
+from Models.records import LazyPatient, LazyRecords, RecordBlob
+from Models.staff import Staff
+
+
+MAGIC = b"HSNP"
+VERSION = 2    # 1: ages of dict departments unsigned too
+
+_HEADER = struct.Struct("<4sBBQQ")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_DEPARTMENT = struct.Struct("<IB")
+
+# Zigzag codes 0..127 <-> differences -64..63 held as signed bytes; a
+# column whose bytes are all below 128 is translated in one call
+_TO_ZIGZAG = bytes(((d << 1) ^ (d >> 7)) & 0xFF for d in (b - 256 if b > 127 else b for b in range(256)))
+_FROM_ZIGZAG = bytes(((z >> 1) ^ -(z & 1)) & 0xFF for z in range(256))
+
+
+# ===============================
+# Save
+# ===============================
+
+def save_snapshot(hospital, path: str):
+    """
+    Write a snapshot of the hospital to `path`.
+
+    The file is written beside `path` and then moved over it, so an
+    existing snapshot stays whole, and so does any memory map of it.
+
+    :return: Size of the snapshot in bytes
+    """
+    strings = {}        # string -> index in the string table
+    body = []
+    records = []        # encoded record text per department
+    offsets = array("Q", [0])
+
+    with hospital.lock.read():
+        body.append(_U32.pack(_string_index(strings, hospital.name)))
+        body.append(_U32.pack(len(hospital.departments)))
+
+        for department in hospital.departments.values():
+            body.append(_DEPARTMENT.pack(_string_index(strings, department.name), department.compact))
+            patients, staff = _department_columns(department)
+
+            ids, ages, names, texts = patients
+            body.append(_U32.pack(len(ids)))
+            body.extend(_column(encoded) for encoded in (
+                _encode_ids(ids), _encode_ages(ages, department.compact), _encode_strings(strings, names)
+            ))
+            encoded = [text.encode("utf-8") for text in texts]
+            offsets.extend(islice(accumulate(map(len, encoded), initial=offsets[-1]), 1, None))
+            records.append(b"".join(encoded))
+
+            ids, ages, names, roles, salaries = staff
+            body.append(_U32.pack(len(ids)))
+            body.extend(_column(encoded) for encoded in (
+                _encode_ids(ids), _encode_ages(ages, department.compact), _encode_strings(strings, names),
+                _encode_strings(strings, roles), _little_endian(array("d", salaries))
+            ))
+
+        header = _HEADER.pack(MAGIC, VERSION, 0, Patient.ids.high_water, Staff.ids.high_water)
+
+    table = [text.encode("utf-8") for text in strings]
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(_U32.pack(len(table)))
+        f.write(_little_endian(array("I", map(len, table))))
+        f.write(b"".join(table))
+        f.writelines(body)
+        f.write(_little_endian(offsets))
+        f.writelines(records)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+
+    os.replace(temp_path, path)
+    return size
+
+
+def _department_columns(department):
+    """
+    ((ids, ages, names, records), (ids, ages, names, roles, salaries))
+    of a department, read straight from its columns when it has them.
+    """
+    patients = department.patients
+    if isinstance(patients, PatientColumns):
+        patient_columns = (patients._ids, patients.ages, patients.names, _records_of(patients))
+    else:
+        people = list(patients.values())
+        patient_columns = (
+            [p.id for p in people], [p.age for p in people],
+            [p.name for p in people], [p.medical_record for p in people]
+        )
+
+    staff = department.staff_members
+    if isinstance(staff, StaffColumns):
+        staff_columns = (staff._ids, staff.ages, staff.names, staff.roles, staff.salaries)
+    else:
+        people = list(staff.values())
+        staff_columns = (
+            [s.id for s in people], [s.age for s in people], [s.name for s in people],
+            [s.role for s in people], [s.salary for s in people]
+        )
+
+    return patient_columns, staff_columns
+
+
+def _records_of(patients):
+    records = patients.records
+    if isinstance(records, list):
+        return list(map(load_record, records))
+    return [patients.record(row) for row in range(len(records))]
+
+
+# ===============================
+# Load
+# ===============================
+
+def load_snapshot(path: str, hospital=None, memory_map: bool = False, lazy_records: bool = False):
+    """
+    Load a snapshot into `hospital`, or into a new Hospital named as the
+    saved one, and return the hospital. Departments whose names the
+    hospital already has are skipped.
+
+    :param memory_map: Map the file rather than reading it into memory
+    :param lazy_records: Read each medical record only when it is
+                         accessed; the file (or its contents) is kept
+                         open for as long as the patients are
+    """
+    with open(path, "rb") as f:
+        if memory_map:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = f.read()
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a hospital snapshot: {path}")
+
+    reader = _Reader(buffer)
+    magic, version, flags, patient_high_water, staff_high_water = reader.unpack(_HEADER)
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    strings = _read_strings(reader)
+    (name,) = reader.unpack(_U32)
+    if hospital is None:
+        from Core.hospital import Hospital
+        hospital = Hospital(strings[name])
+
+    (count,) = reader.unpack(_U32)
+    departments = [_read_department(reader, strings, version) for _ in range(count)]
+
+    total = sum(len(patients[0]) for name, compact, patients, staff in departments)
+    offsets = _from_little_endian("Q", reader.take(8 * (total + 1)))
+    blob = RecordBlob(buffer, offsets, reader.pos)
+
+    restored = []
+    first = 0
+    for name, compact, patients, staff in departments:
+        ids, ages, names = patients
+        rows = range(first, first + len(ids))
+        first += len(ids)
+
+        if lazy_records:
+            records = LazyRecords(blob, rows.start, len(rows))
+        else:
+            records = blob.read(rows.start, len(rows))
+
+        staff_ids, staff_ages, staff_names, roles, salaries = staff
+
+        if compact:
+            patients = PatientColumns.from_arrays(ids, names, ages, records)
+            staff = StaffColumns.from_arrays(name, staff_ids, staff_names, staff_ages, roles, salaries)
+        else:
+            if lazy_records:
+                people = map(LazyPatient, names, ages, [blob] * len(ids), rows, ids)
+            else:
+                people = map(Patient, names, ages, records, ids)
+            patients = dict(zip(ids, people))
+            staff = dict(zip(staff_ids, map(
+                Staff, staff_names, staff_ages, roles, [name] * len(staff_ids), salaries, staff_ids
+            )))
+
+        restored.append(Department.restore(name, patients, staff))
+
+    if memory_map and not lazy_records:
+        buffer.close()
+
+    Patient.ids.advance_to(patient_high_water)
+    Staff.ids.advance_to(staff_high_water)
+    hospital.restore_departments(restored)
+    return hospital
+
+
+class _Reader:
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.pos = 0
+
+    def take(self, size):
+        start = self.pos
+        self.pos += size
+        if self.pos > len(self.buffer):
+            raise ValueError("Snapshot is truncated.")
+        return self.buffer[start:self.pos]
+
+    def unpack(self, fmt):
+        return fmt.unpack(self.take(fmt.size))
+
+    def column(self):
+        (size,) = self.unpack(_U32)
+        return self.take(size)
+
+
+def _read_strings(reader):
+    (count,) = reader.unpack(_U32)
+    lengths = _from_little_endian("I", reader.take(4 * count))
+    text = reader.take(sum(lengths))
+    ends = list(accumulate(lengths))
+    return [sys.intern(str(text[start:end], "utf-8")) for start, end in zip(chain((0,), ends), ends)]
+
+
+def _read_department(reader, strings, version):
+    name, compact = reader.unpack(_DEPARTMENT)
+    name = strings[name]
+
+    (patient_count,) = reader.unpack(_U32)
+    patients = (
+        _decode_ids(reader.column()),
+        _decode_ages(reader.column(), compact, version),
+        _decode_strings(strings, reader.column())
+    )
+
+    (staff_count,) = reader.unpack(_U32)
+    staff = (
+        _decode_ids(reader.column()),
+        _decode_ages(reader.column(), compact, version),
+        _decode_strings(strings, reader.column()),
+        _decode_strings(strings, reader.column()),
+        _from_little_endian("d", reader.column())
+    )
+
+    if any(len(column) != patient_count for column in patients) or \
+            any(len(column) != staff_count for column in staff):
+        raise ValueError(f"Snapshot columns of {name} do not match their counts.")
+
+    return name, bool(compact), patients, staff
+
+
+# ===============================
+# Column Encoding
+# ===============================
+
+def _column(payload):
+    return _U32.pack(len(payload)) + payload
+
+
+def _encode_ages(ages, compact):
+    if compact:
+        return _encode_varints(ages)    # array('H'): never negative
+    # Dict departments take any int; zigzag keeps small ages one byte
+    return _encode_varints((age << 1) if age >= 0 else (~age << 1) | 1 for age in ages)
+
+
+def _decode_ages(data, compact, version):
+    if compact or version == 1:
+        return array("H", _decode_varints(data))
+    if data.isascii():
+        return array("b", data.translate(_FROM_ZIGZAG))
+    return [(z >> 1) ^ -(z & 1) for z in _decode_varints(data)]
+
+
+def _encode_varints(values):
+    # Unsigned only: signed values are zigzag-coded first
+    values = list(values)
+    if not values or (min(values) >= 0 and max(values) < 0x80):
+        return array("B", values).tobytes()
+
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _decode_varints(data):
+    if data.isascii():
+        return array("B", data)
+
+    values = []    # a list, so values past 64 bits survive
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _encode_ids(ids):
+    deltas = array("q", map(sub, ids, chain((0,), ids)))
+    if not deltas or (min(deltas) >= -64 and max(deltas) < 64):
+        return array("b", deltas).tobytes().translate(_TO_ZIGZAG)
+    return _encode_varints((d << 1) ^ (d >> 63) for d in deltas)
+
+
+def _decode_ids(data):
+    # The first id is a large difference from 0; the rest are usually small
+    end = next((i + 1 for i, byte in enumerate(data) if byte < 0x80), 0)
+    head, tail = data[:end], data[end:]
+
+    codes = chain(_decode_varints(head), _decode_varints(tail) if not tail.isascii() else ())
+    deltas = [(z >> 1) ^ -(z & 1) for z in codes]
+    if tail.isascii():
+        deltas.extend(array("b", tail.translate(_FROM_ZIGZAG)))
+    return array("q", accumulate(deltas))
+
+
+def _encode_strings(strings, values):
+    indexes = [_string_index(strings, value) for value in values]
+    width = _index_width(len(strings))
+    return _U8.pack(width) + _little_endian(array(_INDEX_TYPES[width], indexes))
+
+
+def _decode_strings(strings, data):
+    width = data[0]
+    indexes = _from_little_endian(_INDEX_TYPES[width], data[1:])
+    return list(map(strings.__getitem__, indexes))
+
+
+_INDEX_TYPES = {1: "B", 2: "H", 4: "I"}
+
+
+def _index_width(count):
+    # Wide enough for every index the table can reach while saving
+    return 1 if count <= 0x100 else 2 if count <= 0x10000 else 4
+
+
+def _string_index(strings, value):
+    index = strings.get(value)
+    if index is None:
+        index = strings[value] = len(strings)
+    return index
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode, data):
+    values = array(typecode, data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+# ===============================
+# Command Line
+# ===============================
+
+def main(argv=None):
+
+    from Core.hospital import Hospital
+    from Core.storage import HospitalStore
+
+    parser = argparse.ArgumentParser(description="Save or inspect hospital snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save = commands.add_parser("save", help="snapshot a hospital data folder")
+    save.add_argument("path", help="snapshot file to write")
+    save.add_argument("--data", default="hospital_data", help="hospital data folder")
+
+    info = commands.add_parser("info", help="load a snapshot and summarize it")
+    info.add_argument("path", help="snapshot file to read")
+    info.add_argument("--mmap", action="store_true", help="memory-map the file")
+    info.add_argument("--lazy", action="store_true", help="read medical records on access")
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        hospital = Hospital("Smart Hospital")
+        HospitalStore(args.data).load(hospital)
+        start = time.perf_counter()
+        size = save_snapshot(hospital, args.path)
+        print(f"Saved {args.path} ({size:,} bytes) in {time.perf_counter() - start:.2f}s")
+        return
+
+    start = time.perf_counter()
+    hospital = load_snapshot(args.path, memory_map=args.mmap, lazy_records=args.lazy)
+    elapsed = time.perf_counter() - start
+
+    summary = hospital.get_summary()
+    print(f"{summary['hospital_name']}: {summary['total_departments']} departments, "
+          f"{summary['total_patients']:,} patients, {summary['total_staff']:,} staff")
+    print(f"Loaded in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Storage Module
+--------------
+This module defines HospitalStore, a durable backend for a Hospital.
+
+Every change published on the hospital's event bus is appended to a
+write-ahead log, one JSON record per line:
+
+    {"op": "add_department", "name": "Cardiology"}   (+ "compact": true)
+    {"op": "add_patient", "department": "Cardiology", "id": 7, ...}
+    {"op": "add_staff", "department": "Cardiology", "id": 8, ...}
+    {"op": "remove_department", "name": "Cardiology"}
+
+Records are buffered and written with one fsync per `sync_every`
+records, so bulk loads do not pay an fsync per record.
+
+The log is periodically compacted into a snapshot, which is just the
+shortest list of records that rebuilds the current state. Each log file
+carries a generation number that is recorded in the snapshot header, so
+a crash half-way through compaction never replays stale records.
+
+Startup loads the snapshot and replays the tail of the log. The ID
+allocators resume past the high-water marks kept in the snapshot header
+and past every ID replayed, so IDs are never handed out twice.
+
+An unterminated last line in the log (a write torn by a crash) is cut
+off on replay; a corrupt line anywhere else stops the load with a
+ValueError rather than dropping the records after it.
+"""
+
+import json
+import os
+
+from Models.department import Department
+from Models.patient import Patient
+from Models.staff import Staff
+from Models.events import DepartmentAdded, DepartmentRemoved, PatientAdded, StaffAdded
+
+
+SNAPSHOT_VERSION = 1
+
+
+class HospitalStore:
+    """
+    Write-ahead log plus snapshot for one hospital.
+
+    Typical use:
+        store = HospitalStore("hospital_data")
+        store.open(hospital)   # load, replay, then start logging
+        ...
+        store.close()
+    """
+
+    def __init__(self, directory: str, sync_every: int = 1000, compact_every: int = 100000):
+        """
+        :param directory: Folder holding the snapshot and log files
+        :param sync_every: Number of records written per fsync
+        :param compact_every: Log records after which to write a snapshot
+        """
+        self.directory = directory
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+
+        self.hospital = None
+        self.generation = 0
+        self._log = None
+        self._pending = []     # encoded records not yet written
+        self._logged = 0       # records in the current log file
+
+    # ===============================
+    # Paths
+    # ===============================
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, "snapshot.jsonl")
+
+    def log_path(self, generation):
+        return os.path.join(self.directory, f"wal.{generation}.log")
+
+    # ===============================
+    # Open / Close
+    # ===============================
+
+    def open(self, hospital):
+        """
+        Load saved state into the hospital, then log its changes.
+        """
+        self.load(hospital)
+        self.attach(hospital)
+
+    def load(self, hospital):
+        """
+        Rebuild state from the snapshot and the log tail.
+
+        :return: Number of records applied
+        """
+        applied = 0
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != SNAPSHOT_VERSION:
+                    raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+                self.generation = header["generation"]
+                _restore_high_water(header)
+                applied += self._replay(hospital, f)
+
+        log_path = self.log_path(self.generation)
+        if os.path.exists(log_path):
+            with open(log_path, "r+b") as f:
+                self._logged = self._replay(hospital, f)
+                applied += self._logged
+
+        return applied
+
+    def attach(self, hospital):
+        """
+        Start appending the hospital's changes to the log.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.hospital = hospital
+        self._log = open(self.log_path(self.generation), "a", encoding="utf-8")
+        hospital.events.subscribe(self._on_event)
+
+    def close(self):
+        """
+        Write pending records and stop logging.
+        """
+        if self._log is None:
+            return
+
+        self.flush()
+        self.hospital.events.unsubscribe(self._on_event)
+        self._log.close()
+        self._log = None
+
+    # ===============================
+    # Logging
+    # ===============================
+
+    def _on_event(self, event):
+
+        if isinstance(event, PatientAdded):
+            self._append(_patient_record(event.department.name, event.patient))
+
+        elif isinstance(event, StaffAdded):
+            self._append(_staff_record(event.department.name, event.staff))
+
+        elif isinstance(event, DepartmentAdded):
+            for record in _department_records(event.department):
+                self._append(record)
+
+        elif isinstance(event, DepartmentRemoved):
+            self._append({"op": "remove_department", "name": event.department.name})
+
+    def _append(self, record):
+
+        self._pending.append(json.dumps(record, ensure_ascii=False))
+        if len(self._pending) >= self.sync_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered records and fsync the log.
+        Compacts the log once it has grown past `compact_every` records.
+        """
+        if self._log is None or not self._pending:
+            return
+
+        with self.hospital.lock.write():
+            self._write_pending()
+            if self._logged >= self.compact_every:
+                self.compact()
+
+    def _write_pending(self):
+
+        if not self._pending:
+            return
+
+        self._log.write("\n".join(self._pending) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+        self._logged += len(self._pending)
+        self._pending.clear()
+
+    # ===============================
+    # Compaction
+    # ===============================
+
+    def compact(self):
+        """
+        Write a snapshot of the current state and start a new log.
+        """
+        if self.hospital is None:
+            return
+
+        with self.hospital.lock.write():
+            self._compact()
+
+    def _compact(self):
+
+        self._write_pending()
+
+        generation = self.generation + 1
+        temp_path = self.snapshot_path + ".tmp"
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            header = {
+                "op": "snapshot",
+                "version": SNAPSHOT_VERSION,
+                "generation": generation,
+                "next_patient_id": Patient.ids.high_water,
+                "next_staff_id": Staff.ids.high_water
+            }
+            f.write(json.dumps(header) + "\n")
+            for department in self.hospital.departments.values():
+                for record in _department_records(department):
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The snapshot only takes effect once it replaces the old one
+        os.replace(temp_path, self.snapshot_path)
+        _fsync_directory(self.directory)
+
+        old_log = self.log_path(self.generation)
+        self._log.close()
+        self.generation = generation
+        self._log = open(self.log_path(generation), "a", encoding="utf-8")
+        self._logged = 0
+
+        if os.path.exists(old_log):
+            os.remove(old_log)
+
+    # ===============================
+    # Replay
+    # ===============================
+
+    def _replay(self, hospital, f):
+
+        applied = 0
+        good = 0
+
+        for number, line in enumerate(f, 1):
+            if isinstance(line, bytes) and not line.endswith(b"\n"):
+                # A torn write at the end of the log: cut it off so
+                # new records start on a clean line
+                f.seek(good)
+                f.truncate()
+                break
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Records after it are intact; dropping them silently
+                # would lose data, so leave the file for inspection
+                raise ValueError(f"Corrupt record on line {number} of {f.name}")
+
+            _apply(hospital, record)
+            applied += 1
+            good += len(line)
+
+        return applied
+
+
+# ===============================
+# Record Encoding
+# ===============================
+
+def _patient_record(dept_name, patient):
+    return {
+        "op": "add_patient",
+        "department": dept_name,
+        "id": patient.id,
+        "name": patient.name,
+        "age": patient.age,
+        "medical_record": patient.medical_record
+    }
+
+
+def _staff_record(dept_name, staff):
+    return {
+        "op": "add_staff",
+        "department": dept_name,
+        "id": staff.id,
+        "name": staff.name,
+        "age": staff.age,
+        "role": staff.role,
+        "salary": staff.salary
+    }
+
+
+def _department_records(department):
+    if getattr(department, "compact", False):
+        yield {"op": "add_department", "name": department.name, "compact": True}
+    else:
+        yield {"op": "add_department", "name": department.name}
+    for patient in department.patients.values():
+        yield _patient_record(department.name, patient)
+    for staff in department.staff_members.values():
+        yield _staff_record(department.name, staff)
+
+
+def _restore_high_water(header):
+    # Older snapshots have a single "next_id" shared by both kinds
+    shared = header.get("next_id", 1)
+    Patient.ids.advance_to(header.get("next_patient_id", shared))
+    Staff.ids.advance_to(header.get("next_staff_id", shared))
+
+
+def _apply(hospital, record):
+
+    op = record["op"]
+
+    if op == "add_department":
+        hospital.add_department(Department(record["name"], record.get("compact", False)))
+
+    elif op == "remove_department":
+        hospital.remove_department(record["name"])
+
+    elif op == "add_patient":
+        Patient.ids.advance_to(record["id"] + 1)
+        patient = Patient(record["name"], record["age"], record["medical_record"], record["id"])
+        hospital.get_department(record["department"]).add_patient(patient)
+
+    elif op == "add_staff":
+        Staff.ids.advance_to(record["id"] + 1)
+        staff = Staff(record["name"], record["age"], record["role"],
+                      record["department"], record["salary"], record["id"])
+        hospital.get_department(record["department"]).add_staff(staff)
+
+    else:
+        raise ValueError(f"Unknown log record: {op!r}")
+
+
+def _fsync_directory(directory):
+    # Make the rename itself durable (not supported on Windows)
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,231 @@
+"""
+Vectorized Analytics Module
+---------------------------
+This module computes batch reports over a Hospital with NumPy: grouped
+counts, sums, means, percentiles and histograms of staff salaries and
+patient/staff ages by department and role.
+
+NumPy is only needed here; nothing else in Core imports this module.
+
+extract_staff() / extract_patients() copy the hospital into flat arrays
+under its read lock, in one pass per department:
+- compact departments copy their array columns with a single memcpy
+  each (a live view would stop the column from growing),
+- dict departments are read with np.fromiter.
+
+Departments and roles become small integer codes, so every statistic is
+one bincount or one sort over the whole column rather than a Python
+loop per record. benchmarks/bench_analytics.py compares it with the
+same report in plain Python.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from Models.columns import PatientColumns, StaffColumns
+
+
+StaffArrays = namedtuple("StaffArrays", "departments roles dept_codes role_codes ages salaries")
+PatientArrays = namedtuple("PatientArrays", "departments dept_codes ages")
+
+PERCENTILES = (50, 90, 99)
+
+
+# ===============================
+# Extraction
+# ===============================
+
+def extract_staff(hospital):
+    """
+    Copy every staff member into a StaffArrays. `departments` and
+    `roles` list the names behind dept_codes and role_codes.
+    """
+    dept_codes, role_codes, ages, salaries = [], [], [], []
+    roles = {}
+
+    with hospital.lock.read():
+        departments = list(hospital.departments.values())
+
+        for code, department in enumerate(departments):
+            staff = department.staff_members
+            count = len(staff)
+            dept_codes.append(np.full(count, code, dtype=np.int32))
+
+            if isinstance(staff, StaffColumns):
+                role_values = staff.roles
+                ages.append(np.array(staff.ages, dtype=np.int64))
+                salaries.append(np.array(staff.salaries, dtype=np.float64))
+            else:
+                members = list(staff.values())
+                role_values = [s.role for s in members]
+                ages.append(np.fromiter((s.age for s in members), np.int64, count))
+                salaries.append(np.fromiter((s.salary for s in members), np.float64, count))
+
+            role_codes.append(np.fromiter(
+                (roles.setdefault(role, len(roles)) for role in role_values), np.int32, count
+            ))
+
+    return StaffArrays(
+        [d.name for d in departments], list(roles),
+        _concat(dept_codes, np.int32), _concat(role_codes, np.int32),
+        _concat(ages, np.int64), _concat(salaries, np.float64)
+    )
+
+
+def extract_patients(hospital):
+    """
+    Copy every patient's department and age into a PatientArrays.
+    """
+    dept_codes, ages = [], []
+
+    with hospital.lock.read():
+        departments = list(hospital.departments.values())
+
+        for code, department in enumerate(departments):
+            patients = department.patients
+            count = len(patients)
+            dept_codes.append(np.full(count, code, dtype=np.int32))
+
+            if isinstance(patients, PatientColumns):
+                ages.append(np.array(patients.ages, dtype=np.int64))
+            else:
+                ages.append(np.fromiter((p.age for p in patients.values()), np.int64, count))
+
+    return PatientArrays(
+        [d.name for d in departments], _concat(dept_codes, np.int32), _concat(ages, np.int64)
+    )
+
+
+def _concat(parts, dtype):
+    if not parts:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(parts)
+
+
+# ===============================
+# Grouped Statistics
+# ===============================
+
+def grouped_stats(values, codes, labels, percentiles=PERCENTILES):
+    """
+    Count, sum, mean, min, max and percentiles of `values` per group.
+
+    :param values: 1-D array of numbers
+    :param codes: Group of each value, an index into `labels`
+    :param labels: Group names
+    :param percentiles: Percentiles to report, linearly interpolated
+                        like np.percentile
+    :return: {label: {"count", "sum", "mean", "min", "max", "p50", ...}}
+             for every group with at least one value
+    """
+    if not len(values):
+        return {}
+
+    groups = len(labels)
+    counts = np.bincount(codes, minlength=groups)
+    sums = np.bincount(codes, weights=values, minlength=groups)
+
+    # Group the values into runs, then sort each run in place. Much
+    # cheaper than one lexsort over (code, value) pairs.
+    ordered = values[np.argsort(codes)].astype(np.float64)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    present = counts > 0
+    for start, end in zip(starts[present].tolist(), ends[present].tolist()):
+        ordered[start:end].sort()
+
+    columns = {
+        "min": _percentile(ordered, starts, counts, 0),
+        "max": _percentile(ordered, starts, counts, 100),
+    }
+    for p in percentiles:
+        columns[f"p{p}"] = _percentile(ordered, starts, counts, p)
+
+    results = {}
+    for i in np.flatnonzero(present):
+        row = {"count": int(counts[i]), "sum": float(sums[i]), "mean": float(sums[i] / counts[i])}
+        for name, column in columns.items():
+            row[name] = float(column[i])
+        results[labels[i]] = row
+    return results
+
+
+def _percentile(ordered, starts, counts, p):
+    """
+    The p-th percentile of each sorted run ordered[start:start + count];
+    runs with no values give a meaningless number the caller skips.
+    """
+    last = len(ordered) - 1
+    position = (np.maximum(counts, 1) - 1) * (p / 100.0)
+    below = np.floor(position).astype(np.int64)
+    fraction = position - below
+
+    low = ordered[np.minimum(starts + below, last)]
+    high = ordered[np.minimum(starts + np.minimum(below + 1, np.maximum(counts - 1, 0)), last)]
+    return low + (high - low) * fraction
+
+
+def grouped_histogram(values, codes, labels, edges):
+    """
+    Histogram of `values` per group over the bin `edges`; values outside
+    [edges[0], edges[-1]) go to the first / last bin.
+
+    :return: {label: [count per bin]} for every group with values
+    """
+    bins = len(edges) - 1
+    positions = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(codes * bins + positions, minlength=len(labels) * bins)
+    counts = counts.reshape(len(labels), bins)
+
+    return {
+        labels[i]: counts[i].tolist()
+        for i in range(len(labels))
+        if counts[i].any()
+    }
+
+
+def combine(codes_a, labels_a, codes_b, labels_b):
+    """
+    Codes and labels for pairs of groups, e.g. (department, role).
+    """
+    codes = codes_a.astype(np.int64) * len(labels_b) + codes_b
+    labels = [(a, b) for a in labels_a for b in labels_b]
+    return codes, labels
+
+
+# ===============================
+# Report
+# ===============================
+
+def report(hospital, age_width=10, percentiles=PERCENTILES):
+    """
+    The full batch report:
+
+        {
+            "salary_by_department": {department: stats},
+            "salary_by_role": {role: stats},
+            "salary_by_department_role": {(department, role): stats},
+            "patient_age_by_department": {department: stats},
+            "staff_age_by_role": {role: stats},
+            "age_edges": [0, 10, ..., 120],
+            "patient_age_histogram": {department: [count per bin]}
+        }
+
+    where stats is a grouped_stats() row.
+    """
+    staff = extract_staff(hospital)
+    patients = extract_patients(hospital)
+    pair_codes, pair_labels = combine(staff.dept_codes, staff.departments, staff.role_codes, staff.roles)
+    edges = np.arange(0, 120 + age_width, age_width)
+
+    return {
+        "salary_by_department": grouped_stats(staff.salaries, staff.dept_codes, staff.departments, percentiles),
+        "salary_by_role": grouped_stats(staff.salaries, staff.role_codes, staff.roles, percentiles),
+        "salary_by_department_role": grouped_stats(staff.salaries, pair_codes, pair_labels, percentiles),
+        "patient_age_by_department": grouped_stats(patients.ages, patients.dept_codes, patients.departments, percentiles),
+        "staff_age_by_role": grouped_stats(staff.ages, staff.role_codes, staff.roles, percentiles),
+        "age_edges": edges.tolist(),
+        "patient_age_histogram": grouped_histogram(patients.ages, patients.dept_codes, patients.departments, edges),
+    }
+
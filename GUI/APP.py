@@ -12,51 +12,54 @@ sys.path.insert(0, parent_dir)
 
 # Now these imports will work
 from Core.hospital import Hospital
+from Core.storage import HospitalStore
 from Models.department import Department
 from Models.patient import Patient
+from Models.records import RecordStore
 from Models.staff import Staff
+from Models.metrics import instrumented, metrics
+from Models.events import DepartmentAdded, PatientAdded, StaffAdded
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QFrame, QLineEdit,
     QTextEdit, QComboBox, QTableWidget, QTableWidgetItem,
-    QHeaderView, QMessageBox, QStackedWidget,
-    QFormLayout, QSpinBox, QDoubleSpinBox, QScrollArea
+    QTableView, QHeaderView, QMessageBox, QStackedWidget,
+    QFormLayout, QSpinBox, QDoubleSpinBox, QScrollArea,
+    QFileDialog, QProgressDialog, QMenu
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
+from styles import stylesheet, tag
+from table_models import DepartmentTableModel, PatientTableModel, StaffTableModel
+from widgets import ActionDelegate, ActivityFeed
+from workers import EventBridge, WorkerPool
+
 
 class HospitalGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, data_dir=None):
         super().__init__()
         
-        # Initialize hospital system
-        self.hospital = Hospital("Smart Hospital")
+        # Initialize hospital system and load saved data. Background
+        # workers share it with the UI thread, so it runs thread-safe.
+        self.hospital = Hospital("Smart Hospital", thread_safe=True)
+        self.store = HospitalStore(data_dir or os.path.join(parent_dir, "hospital_data"), sync_every=1)
+        self.store.open(self.hospital)
+        self.workers = WorkerPool()
+        self._dept_version = 0     # bumped by department events; detects stale refreshes
+        self._search_seq = {"patient": 0, "staff": 0}  # newest search of each kind
+        self._analytics_stale = False  # changed while the dashboard was hidden
+        self.capture = None        # running ProfileCapture, if any
         
         self.setWindowTitle("Hospital Management System")
         # INCREASED WINDOW SIZE
         self.setMinimumSize(1600, 1000)
         self.resize(1600, 1000)
         
-        # Modern color palette
-        self.colors = {
-            'primary': '#667eea',
-            'secondary': '#764ba2',
-            'accent1': '#f093fb',
-            'accent2': '#4facfe',
-            'accent3': '#43e97b',
-            'accent4': '#fa709a',
-            'sidebar': '#2c3e50',
-            'card': '#ffffff',
-            'bg': '#f0f4f8',
-            'text': '#2d3748',
-            'text_light': '#718096',
-            'success': '#48bb78',
-            'warning': '#ecc94b',
-            'danger': '#f56565'
-        }
+        # One shared stylesheet for every widget (see styles.py)
+        self.setStyleSheet(stylesheet())
         
         main_widget = QWidget()
         main_layout = QHBoxLayout()
@@ -67,20 +70,18 @@ class HospitalGUI(QMainWindow):
         sidebar = self.create_sidebar()
         main_layout.addWidget(sidebar)
         
-        # Main Content Area with Stack
+        # Main Content Area with Stack. Only the dashboard is built now;
+        # the other pages are built on their first visit (see build_page).
         self.content_stack = QStackedWidget()
-        self.content_stack.setStyleSheet(f"background-color: {self.colors['bg']};")
-        
-        # Create different pages with scroll areas
-        self.dashboard_page = self.create_dashboard_page()
-        self.departments_page = self.create_departments_page()
-        self.patients_page = self.create_patients_page()
-        self.staff_page = self.create_staff_page()
-        
-        self.content_stack.addWidget(self.dashboard_page)
-        self.content_stack.addWidget(self.departments_page)
-        self.content_stack.addWidget(self.patients_page)
-        self.content_stack.addWidget(self.staff_page)
+        self.content_stack.setObjectName("content")
+        self.content_stack.addWidget(self.create_dashboard_page())
+        self.page_builders = {
+            1: self.create_departments_page,
+            2: self.create_patients_page,
+            3: self.create_staff_page
+        }
+        for index in self.page_builders:
+            self.content_stack.addWidget(QWidget())
         
         main_layout.addWidget(self.content_stack, 1)
         
@@ -90,17 +91,19 @@ class HospitalGUI(QMainWindow):
         # Set global font
         font = QFont("Segoe UI", 10)
         self.setFont(font)
+        
+        # Initial load, then keep views current from hospital events.
+        # Events from worker threads reach the UI thread through the bridge.
+        self.update_stats()
+        self.update_analytics()
+        
+        self.event_bridge = EventBridge(self.on_events, capture=self.capture_event, parent=self)
+        self.hospital.events.subscribe(self.event_bridge.publish)
     
     def create_sidebar(self):
         sidebar = QWidget()
+        sidebar.setObjectName("sidebar")
         sidebar.setFixedWidth(280)
-        sidebar.setStyleSheet(f"""
-            QWidget {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 {self.colors['sidebar']},
-                    stop:1 #1a252f);
-            }}
-        """)
         
         layout = QVBoxLayout()
         layout.setSpacing(15)
@@ -112,56 +115,30 @@ class HospitalGUI(QMainWindow):
         logo_layout.setSpacing(15)
         
         logo_icon = QLabel("🏥")
-        logo_icon.setStyleSheet("font-size: 36px; background: transparent;")
+        logo_icon.setObjectName("logoIcon")
         
         logo_text = QLabel("MediCare\nPro")
-        logo_text.setStyleSheet("""
-            color: white;
-            font-size: 22px;
-            font-weight: bold;
-            background: transparent;
-        """)
+        logo_text.setObjectName("logoText")
         
         logo_layout.addWidget(logo_icon)
         logo_layout.addWidget(logo_text)
         logo_layout.addStretch()
         logo_container.setLayout(logo_layout)
-        logo_container.setStyleSheet("background: transparent;")
         
         layout.addWidget(logo_container)
         layout.addSpacing(40)
         
         # Navigation buttons
         nav_items = [
-            ("📊", "Dashboard", 0, self.colors['accent2']),
-            ("🏢", "Departments", 1, self.colors['accent3']),
-            ("🤒", "Patients", 2, self.colors['accent4']),
-            ("👨‍⚕️", "Staff", 3, self.colors['accent1'])
+            ("📊", "Dashboard", 0, "accent2"),
+            ("🏢", "Departments", 1, "accent3"),
+            ("🤒", "Patients", 2, "accent4"),
+            ("👨‍⚕️", "Staff", 3, "accent1")
         ]
         
         self.nav_buttons = []
-        for icon, text, index, color in nav_items:
-            btn = QPushButton(f"{icon}  {text}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    color: white;
-                    font-size: 16px;
-                    text-align: left;
-                    padding: 16px 24px;
-                    border-radius: 12px;
-                    background-color: transparent;
-                    border-left: 4px solid transparent;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: rgba(255,255,255,0.1);
-                    border-left: 4px solid {color};
-                }}
-                QPushButton:checked {{
-                    background-color: rgba(255,255,255,0.15);
-                    border-left: 4px solid {color};
-                }}
-            """)
+        for icon, text, index, accent in nav_items:
+            btn = tag(QPushButton(f"{icon}  {text}"), "nav", accent)
             btn.setCursor(Qt.PointingHandCursor)
             btn.setCheckable(True)
             btn.clicked.connect(lambda checked, idx=index: self.switch_page(idx))
@@ -175,24 +152,15 @@ class HospitalGUI(QMainWindow):
         
         # Hospital Info Card
         info_card = QWidget()
-        info_card.setStyleSheet(f"""
-            background-color: rgba(255,255,255,0.1);
-            border-radius: 16px;
-            padding: 20px;
-        """)
+        info_card.setObjectName("statusCard")
         info_layout = QVBoxLayout()
         
         info_title = QLabel("🏥 System Status")
-        info_title.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
-        
-        self.sidebar_depts = QLabel("Departments: 0")
-        self.sidebar_depts.setStyleSheet("color: #a0aec0; font-size: 12px;")
-        
-        self.sidebar_patients = QLabel("Patients: 0")
-        self.sidebar_patients.setStyleSheet("color: #a0aec0; font-size: 12px;")
+        info_title.setObjectName("statusTitle")
         
-        self.sidebar_staff = QLabel("Staff: 0")
-        self.sidebar_staff.setStyleSheet("color: #a0aec0; font-size: 12px;")
+        self.sidebar_depts = tag(QLabel("Departments: 0"), "status")
+        self.sidebar_patients = tag(QLabel("Patients: 0"), "status")
+        self.sidebar_staff = tag(QLabel("Staff: 0"), "status")
         
         info_layout.addWidget(info_title)
         info_layout.addWidget(self.sidebar_depts)
@@ -201,43 +169,109 @@ class HospitalGUI(QMainWindow):
         info_card.setLayout(info_layout)
         
         layout.addWidget(info_card)
+        layout.addWidget(self.create_diagnostics_button())
         sidebar.setLayout(layout)
         return sidebar
     
+    def create_diagnostics_button(self):
+        button = QPushButton("🩺  Diagnostics")
+        button.setObjectName("diagnostics")
+        button.setCursor(Qt.PointingHandCursor)
+        
+        menu = QMenu(button)
+        self.metrics_action = menu.addAction("Collect Metrics")
+        self.metrics_action.setCheckable(True)
+        self.metrics_action.setChecked(metrics.enabled)
+        self.metrics_action.toggled.connect(self.toggle_metrics)
+        menu.addAction("Show Metrics", self.show_metrics)
+        menu.addAction("Export Metrics...", self.export_metrics)
+        menu.addSeparator()
+        self.cpu_action = menu.addAction("Start CPU Profile", lambda: self.start_capture("cpu"))
+        self.memory_action = menu.addAction("Start Memory Capture", lambda: self.start_capture("memory"))
+        self.stop_action = menu.addAction("Stop Capture...", self.stop_capture)
+        self.stop_action.setEnabled(False)
+        button.setMenu(menu)
+        return button
+    
     def switch_page(self, index):
+        self.build_page(index)
         self.content_stack.setCurrentIndex(index)
         for i, btn in enumerate(self.nav_buttons):
             btn.setChecked(i == index)
+        if index == 0 and self._analytics_stale:
+            self.update_analytics()
+    
+    def build_page(self, index):
+        # Build a page on its first visit, in place of its placeholder,
+        # and load what it shows. Until then no view of it is kept current.
+        builder = self.page_builders.pop(index, None)
+        if builder is None:
+            return
+        
+        placeholder = self.content_stack.widget(index)
+        self.content_stack.insertWidget(index, builder())
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        
         self.update_stats()
+        if index == 2:
+            self.update_patient_table()
+        elif index == 3:
+            self.update_staff_table()
     
-    def create_dashboard_page(self):
-        # Create scroll area for dashboard
-        scroll = QScrollArea()
+    def page_built(self, index):
+        return index not in self.page_builders
+    
+    def dept_combos(self):
+        # The department selectors of the pages built so far
+        combos = []
+        if self.page_built(2):
+            combos.append(self.patient_dept_combo)
+        if self.page_built(3):
+            combos.append(self.staff_dept_combo)
+        return combos
+    
+    def create_page(self):
+        # Scroll area around a page's content
+        scroll = tag(QScrollArea(), "page")
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background-color: transparent; border: none;")
         
-        page = QWidget()
+        page = tag(QWidget(), "pageBody")
         layout = QVBoxLayout()
         layout.setSpacing(25)
         layout.setContentsMargins(30, 30, 30, 30)
+        page.setLayout(layout)
+        scroll.setWidget(page)
+        return scroll, layout
+    
+    def create_card(self, title, layout, css_class="card"):
+        # A "card" on the forms pages, or a larger dashboard "panel"
+        card = tag(QWidget(), css_class)
+        margin = 25 if css_class == "card" else 30
+        layout.setContentsMargins(margin, margin, margin, margin)
+        title_label = tag(QLabel(title), "cardTitle" if css_class == "card" else "panelTitle")
+        if isinstance(layout, QFormLayout):
+            layout.addRow(title_label)
+        else:
+            layout.addWidget(title_label)
+        card.setLayout(layout)
+        return card
+    
+    def create_dashboard_page(self):
+        scroll, layout = self.create_page()
         
         # Header
         header = QWidget()
-        header.setStyleSheet(f"""
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                stop:0 {self.colors['primary']},
-                stop:1 {self.colors['secondary']});
-            border-radius: 20px;
-        """)
+        header.setObjectName("banner")
         header.setFixedHeight(160)
         header_layout = QHBoxLayout()
         
         header_text = QVBoxLayout()
         welcome = QLabel("Welcome back, Administrator! 👋")
-        welcome.setStyleSheet("color: white; font-size: 32px; font-weight: bold;")
+        welcome.setObjectName("bannerTitle")
         
         subtitle = QLabel("Hospital Management Dashboard")
-        subtitle.setStyleSheet("color: rgba(255,255,255,0.9); font-size: 16px; margin-top: 8px;")
+        subtitle.setObjectName("bannerSubtitle")
         
         header_text.addWidget(welcome)
         header_text.addWidget(subtitle)
@@ -248,25 +282,12 @@ class HospitalGUI(QMainWindow):
         actions_layout = QHBoxLayout()
         actions_layout.setSpacing(15)
         
-        for icon, text, color, callback in [
-            ("➕", "Add Dept", self.colors['accent3'], self.quick_add_dept),
-            ("👤", "Add Patient", self.colors['accent4'], self.quick_add_patient),
-            ("👨‍⚕️", "Add Staff", self.colors['accent1'], self.quick_add_staff)
+        for icon, text, accent, callback in [
+            ("➕", "Add Dept", "accent3", self.quick_add_dept),
+            ("👤", "Add Patient", "accent4", self.quick_add_patient),
+            ("👨‍⚕️", "Add Staff", "accent1", self.quick_add_staff)
         ]:
-            btn = QPushButton(f"{icon} {text}")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color};
-                    color: white;
-                    border-radius: 10px;
-                    padding: 12px 20px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }}
-                QPushButton:hover {{
-                    background-color: {color}dd;
-                }}
-            """)
+            btn = tag(QPushButton(f"{icon} {text}"), "quick", accent)
             btn.clicked.connect(callback)
             actions_layout.addWidget(btn)
         
@@ -280,411 +301,185 @@ class HospitalGUI(QMainWindow):
         
         self.stat_cards = []
         card_data = [
-            ("🏢", "Total Departments", "0", "Active units", self.colors['accent3']),
-            ("🤒", "Total Patients", "0", "Admitted", self.colors['accent4']),
-            ("👨‍⚕️", "Total Staff", "0", "Employees", self.colors['accent1']),
-            ("💰", "Hospital Status", "Active", "Operational", self.colors['accent2'])
+            ("🏢", "Total Departments", "0", "Active units", "accent3"),
+            ("🤒", "Total Patients", "0", "Admitted", "accent4"),
+            ("👨‍⚕️", "Total Staff", "0", "Employees", "accent1"),
+            ("💰", "Hospital Status", "Active", "Operational", "accent2")
         ]
         
-        for i, (icon, title, value, subtitle, color) in enumerate(card_data):
-            card = self.create_stat_card(icon, title, value, subtitle, color)
+        for i, (icon, title, value, subtitle, accent) in enumerate(card_data):
+            card = self.create_stat_card(icon, title, value, subtitle, accent)
             cards_grid.addWidget(card, i // 2, i % 2)
             self.stat_cards.append((card, title))
         
         layout.addLayout(cards_grid)
         
+        # Analytics, refreshed at most twice a second while records change
+        layout.addWidget(self.create_analytics_panel())
+        self.analytics_timer = QTimer(self)
+        self.analytics_timer.setSingleShot(True)
+        self.analytics_timer.setInterval(500)
+        self.analytics_timer.timeout.connect(self.update_analytics)
+        
         # Recent Activity
-        activity_widget = QWidget()
-        activity_widget.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 20px;
-        """)
         activity_layout = QVBoxLayout()
         activity_layout.setSpacing(15)
-        activity_layout.setContentsMargins(30, 30, 30, 30)
-        
-        activity_header = QLabel("📋 Recent Activity")
-        activity_header.setStyleSheet(f"""
-            color: {self.colors['text']};
-            font-size: 20px;
-            font-weight: bold;
-        """)
-        activity_layout.addWidget(activity_header)
-        
-        self.activity_list = QVBoxLayout()
-        self.activity_list.setSpacing(10)
-        
-        # Default message
-        self.no_activity = QLabel("No recent activity. Start by adding departments, patients, or staff.")
-        self.no_activity.setStyleSheet(f"color: {self.colors['text_light']}; font-size: 14px; padding: 20px;")
-        self.no_activity.setAlignment(Qt.AlignCenter)
-        self.activity_list.addWidget(self.no_activity)
-        
-        activity_layout.addLayout(self.activity_list)
+        activity_widget = self.create_card("📋 Recent Activity", activity_layout, "panel")
+        
+        # The newest entries only; older ones give their widgets to newer ones
+        self.activity_feed = ActivityFeed(
+            "No recent activity. Start by adding departments, patients, or staff.", limit=50
+        )
+        activity_layout.addWidget(self.activity_feed)
         activity_layout.addStretch()
-        activity_widget.setLayout(activity_layout)
         layout.addWidget(activity_widget, 1)
         
-        page.setLayout(layout)
-        scroll.setWidget(page)
         return scroll
     
     def create_departments_page(self):
-        # Create scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background-color: transparent; border: none;")
-        
-        page = QWidget()
-        layout = QVBoxLayout()
-        layout.setSpacing(25)
-        layout.setContentsMargins(30, 30, 30, 30)
+        scroll, layout = self.create_page()
         
         # Page Header
         header = self.create_page_header("🏢 Department Management", "Manage hospital departments")
         layout.addWidget(header)
         
         # Add Department Form
-        form_card = QWidget()
-        form_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         form_layout = QVBoxLayout()
-        form_layout.setContentsMargins(25, 25, 25, 25)
-        
-        form_title = QLabel("Add New Department")
-        form_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        form_layout.addWidget(form_title)
+        form_card = self.create_card("Add New Department", form_layout)
         
         input_layout = QHBoxLayout()
         
         self.dept_name_input = QLineEdit()
+        self.dept_name_input.setObjectName("deptNameInput")
         self.dept_name_input.setPlaceholderText("Enter department name...")
-        self.dept_name_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 14px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                font-size: 14px;
-                background-color: {self.colors['bg']};
-            }}
-            QLineEdit:focus {{
-                border: 2px solid {self.colors['primary']};
-            }}
-        """)
-        
-        add_btn = QPushButton("➕ Add Department")
-        add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.colors['accent3']};
-                color: white;
-                padding: 14px 28px;
-                border-radius: 10px;
-                font-weight: bold;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.colors['accent3']}dd;
-            }}
-        """)
+        
+        add_btn = tag(QPushButton("➕ Add Department"), "primary", "accent3")
         add_btn.clicked.connect(self.add_department)
         
         input_layout.addWidget(self.dept_name_input, 1)
         input_layout.addWidget(add_btn)
         
         form_layout.addLayout(input_layout)
-        form_card.setLayout(form_layout)
         layout.addWidget(form_card)
         
         # Departments Table - INCREASED HEIGHT
-        table_card = QWidget()
-        table_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         table_layout = QVBoxLayout()
-        table_layout.setContentsMargins(25, 25, 25, 25)
-        
-        table_title = QLabel("Departments List")
-        table_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        table_layout.addWidget(table_title)
-        
-        self.dept_table = QTableWidget()
-        self.dept_table.setColumnCount(4)
-        self.dept_table.setHorizontalHeaderLabels(["Name", "Patients", "Staff", "Actions"])
-        self.dept_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # INCREASED TABLE HEIGHT
-        self.dept_table.setMinimumHeight(400)
-        self.dept_table.setStyleSheet(f"""
-            QTableWidget {{
-                border: none;
-                background-color: transparent;
-                gridline-color: #e2e8f0;
-            }}
-            QHeaderView::section {{
-                background-color: {self.colors['bg']};
-                padding: 12px;
-                border: none;
-                font-weight: bold;
-                color: {self.colors['text']};
-            }}
-            QTableWidget::item {{
-                padding: 12px;
-                border-bottom: 1px solid #e2e8f0;
-            }}
-        """)
-        self.dept_table.verticalHeader().setVisible(False)
+        table_card = self.create_card("Departments List", table_layout)
+        
+        # The action buttons are painted by a delegate, not widgets per row
+        self.dept_model = DepartmentTableModel(self)
+        self.dept_table = self.create_record_table(self.dept_model)
+        self.dept_actions = ActionDelegate(
+            [("view", "👁 View", "accent2"), ("delete", "🗑 Delete", "danger")], self.dept_table
+        )
+        self.dept_actions.triggered.connect(self.on_dept_action)
+        self.dept_table.setItemDelegateForColumn(3, self.dept_actions)
+        self.dept_table.verticalHeader().setDefaultSectionSize(self.dept_actions.BUTTON_HEIGHT + 16)
         
         table_layout.addWidget(self.dept_table)
-        table_card.setLayout(table_layout)
         layout.addWidget(table_card, 1)
         
-        page.setLayout(layout)
-        scroll.setWidget(page)
         return scroll
     
     def create_patients_page(self):
-        # Create scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background-color: transparent; border: none;")
-        
-        page = QWidget()
-        layout = QVBoxLayout()
-        layout.setSpacing(25)
-        layout.setContentsMargins(30, 30, 30, 30)
+        scroll, layout = self.create_page()
         
         # Page Header
         header = self.create_page_header("🤒 Patient Management", "Manage patients and medical records")
         layout.addWidget(header)
         
         # Form Card
-        form_card = QWidget()
-        form_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         form_layout = QFormLayout()
-        form_layout.setContentsMargins(25, 25, 25, 25)
         form_layout.setSpacing(15)
-        
-        form_title = QLabel("Add New Patient")
-        form_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        form_layout.addRow(form_title)
+        form_card = self.create_card("Add New Patient", form_layout)
         
         # Department selector
         self.patient_dept_combo = QComboBox()
-        self.patient_dept_combo.setStyleSheet(f"""
-            QComboBox {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-                min-width: 200px;
-            }}
-            QComboBox:focus {{
-                border: 2px solid {self.colors['primary']};
-            }}
-        """)
+        self.patient_dept_combo.setMinimumWidth(200)
         form_layout.addRow("Department:", self.patient_dept_combo)
         
         # Name input
         self.patient_name_input = QLineEdit()
         self.patient_name_input.setPlaceholderText("Patient full name")
-        self.patient_name_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-            QLineEdit:focus {{
-                border: 2px solid {self.colors['primary']};
-            }}
-        """)
         form_layout.addRow("Name:", self.patient_name_input)
         
         # Age input
         self.patient_age_input = QSpinBox()
         self.patient_age_input.setRange(0, 120)
         self.patient_age_input.setValue(25)
-        self.patient_age_input.setStyleSheet(f"""
-            QSpinBox {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-        """)
         form_layout.addRow("Age:", self.patient_age_input)
         
         # Medical record
         self.patient_record_input = QTextEdit()
         self.patient_record_input.setPlaceholderText("Enter medical history and current condition...")
         self.patient_record_input.setMaximumHeight(100)
-        self.patient_record_input.setStyleSheet(f"""
-            QTextEdit {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-                font-family: 'Segoe UI';
-            }}
-            QTextEdit:focus {{
-                border: 2px solid {self.colors['primary']};
-            }}
-        """)
         form_layout.addRow("Medical Record:", self.patient_record_input)
         
         # Add button
-        add_btn = QPushButton("➕ Add Patient")
-        add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.colors['accent4']};
-                color: white;
-                padding: 14px;
-                border-radius: 10px;
-                font-weight: bold;
-                font-size: 14px;
-                margin-top: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.colors['accent4']}dd;
-            }}
-        """)
+        add_btn = tag(QPushButton("➕ Add Patient"), "submit", "accent4")
         add_btn.clicked.connect(self.add_patient)
         form_layout.addRow(add_btn)
         
-        form_card.setLayout(form_layout)
         layout.addWidget(form_card)
         
         # Patients Table - INCREASED HEIGHT
-        table_card = QWidget()
-        table_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         table_layout = QVBoxLayout()
-        table_layout.setContentsMargins(25, 25, 25, 25)
+        table_card = self.create_card("Patients List", table_layout)
         
-        table_title = QLabel("Patients List")
-        table_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        table_layout.addWidget(table_title)
+        # Live search
+        self.patient_search_input = QLineEdit()
+        self.patient_search_input.setPlaceholderText("🔍 Search patients by name or ID...")
+        self.patient_search_input.textChanged.connect(self.search_patient)
         
-        self.patient_table = QTableWidget()
-        self.patient_table.setColumnCount(5)
-        self.patient_table.setHorizontalHeaderLabels(["ID", "Name", "Age", "Department", "Medical Record"])
-        self.patient_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # INCREASED TABLE HEIGHT
-        self.patient_table.setMinimumHeight(400)
-        self.patient_table.setStyleSheet(f"""
-            QTableWidget {{
-                border: none;
-                background-color: transparent;
-            }}
-            QHeaderView::section {{
-                background-color: {self.colors['bg']};
-                padding: 12px;
-                border: none;
-                font-weight: bold;
-                color: {self.colors['text']};
-            }}
-            QTableWidget::item {{
-                padding: 12px;
-                border-bottom: 1px solid #e2e8f0;
-            }}
-        """)
-        self.patient_table.verticalHeader().setVisible(False)
+        self.patient_search_mode = QComboBox()
+        self.patient_search_mode.addItems(["Name / ID", "Medical Record"])
+        self.patient_search_mode.currentIndexChanged.connect(self.search_patient)
+        
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.patient_search_input, 1)
+        search_layout.addWidget(self.patient_search_mode)
+        search_layout.addWidget(self.create_import_button("patients"))
+        table_layout.addLayout(search_layout)
+        
+        self.patient_model = PatientTableModel(self, self.workers)
+        self.patient_table = self.create_record_table(self.patient_model)
         
         table_layout.addWidget(self.patient_table)
-        table_card.setLayout(table_layout)
         layout.addWidget(table_card, 1)
         
-        page.setLayout(layout)
-        scroll.setWidget(page)
         return scroll
     
     def create_staff_page(self):
-        # Create scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background-color: transparent; border: none;")
-        
-        page = QWidget()
-        layout = QVBoxLayout()
-        layout.setSpacing(25)
-        layout.setContentsMargins(30, 30, 30, 30)
+        scroll, layout = self.create_page()
         
         # Page Header
         header = self.create_page_header("👨‍⚕️ Staff Management", "Manage hospital staff and employees")
         layout.addWidget(header)
         
         # Form Card
-        form_card = QWidget()
-        form_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         form_layout = QFormLayout()
-        form_layout.setContentsMargins(25, 25, 25, 25)
         form_layout.setSpacing(15)
-        
-        form_title = QLabel("Add New Staff Member")
-        form_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        form_layout.addRow(form_title)
+        form_card = self.create_card("Add New Staff Member", form_layout)
         
         # Department selector
         self.staff_dept_combo = QComboBox()
-        self.staff_dept_combo.setStyleSheet(f"""
-            QComboBox {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-                min-width: 200px;
-            }}
-        """)
+        self.staff_dept_combo.setMinimumWidth(200)
         form_layout.addRow("Department:", self.staff_dept_combo)
         
         # Name input
         self.staff_name_input = QLineEdit()
         self.staff_name_input.setPlaceholderText("Staff full name")
-        self.staff_name_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-        """)
         form_layout.addRow("Name:", self.staff_name_input)
         
         # Age input
         self.staff_age_input = QSpinBox()
         self.staff_age_input.setRange(18, 80)
         self.staff_age_input.setValue(30)
-        self.staff_age_input.setStyleSheet(f"""
-            QSpinBox {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-        """)
         form_layout.addRow("Age:", self.staff_age_input)
         
         # Role input
         self.staff_role_input = QLineEdit()
         self.staff_role_input.setPlaceholderText("e.g., Doctor, Nurse, Admin")
-        self.staff_role_input.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-        """)
         form_layout.addRow("Role:", self.staff_role_input)
         
         # Salary input
@@ -692,154 +487,123 @@ class HospitalGUI(QMainWindow):
         self.staff_salary_input.setRange(0, 1000000)
         self.staff_salary_input.setValue(50000)
         self.staff_salary_input.setPrefix("$ ")
-        self.staff_salary_input.setStyleSheet(f"""
-            QDoubleSpinBox {{
-                padding: 12px;
-                border: 2px solid #e2e8f0;
-                border-radius: 10px;
-                background-color: {self.colors['bg']};
-            }}
-        """)
         form_layout.addRow("Salary:", self.staff_salary_input)
         
         # Add button
-        add_btn = QPushButton("➕ Add Staff Member")
-        add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.colors['accent1']};
-                color: white;
-                padding: 14px;
-                border-radius: 10px;
-                font-weight: bold;
-                font-size: 14px;
-                margin-top: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.colors['accent1']}dd;
-            }}
-        """)
+        add_btn = tag(QPushButton("➕ Add Staff Member"), "submit", "accent1")
         add_btn.clicked.connect(self.add_staff)
         form_layout.addRow(add_btn)
         
-        form_card.setLayout(form_layout)
         layout.addWidget(form_card)
         
         # Staff Table - INCREASED HEIGHT
-        table_card = QWidget()
-        table_card.setStyleSheet(f"""
-            background-color: {self.colors['card']};
-            border-radius: 16px;
-        """)
         table_layout = QVBoxLayout()
-        table_layout.setContentsMargins(25, 25, 25, 25)
+        table_card = self.create_card("Staff List", table_layout)
         
-        table_title = QLabel("Staff List")
-        table_title.setStyleSheet(f"color: {self.colors['text']}; font-size: 18px; font-weight: bold;")
-        table_layout.addWidget(table_title)
+        # Live search
+        self.staff_search_input = QLineEdit()
+        self.staff_search_input.setPlaceholderText("🔍 Search staff by name or ID...")
+        self.staff_search_input.textChanged.connect(self.search_staff)
         
-        self.staff_table = QTableWidget()
-        self.staff_table.setColumnCount(6)
-        self.staff_table.setHorizontalHeaderLabels(["ID", "Name", "Age", "Role", "Department", "Salary"])
-        self.staff_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # INCREASED TABLE HEIGHT
-        self.staff_table.setMinimumHeight(400)
-        self.staff_table.setStyleSheet(f"""
-            QTableWidget {{
-                border: none;
-                background-color: transparent;
-            }}
-            QHeaderView::section {{
-                background-color: {self.colors['bg']};
-                padding: 12px;
-                border: none;
-                font-weight: bold;
-                color: {self.colors['text']};
-            }}
-            QTableWidget::item {{
-                padding: 12px;
-                border-bottom: 1px solid #e2e8f0;
-            }}
-        """)
-        self.staff_table.verticalHeader().setVisible(False)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.staff_search_input, 1)
+        search_layout.addWidget(self.create_import_button("staff"))
+        table_layout.addLayout(search_layout)
+        
+        self.staff_model = StaffTableModel(self, self.workers)
+        self.staff_table = self.create_record_table(self.staff_model)
         
         table_layout.addWidget(self.staff_table)
-        table_card.setLayout(table_layout)
         layout.addWidget(table_card, 1)
         
-        page.setLayout(layout)
-        scroll.setWidget(page)
         return scroll
     
+    def create_record_table(self, model):
+        table = QTableView()
+        table.setModel(model)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # INCREASED TABLE HEIGHT
+        table.setMinimumHeight(400)
+        table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view lay out only the visible rows
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        return table
+    
     def create_page_header(self, title, subtitle):
-        header = QWidget()
-        header.setStyleSheet(f"""
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                stop:0 {self.colors['primary']},
-                stop:1 {self.colors['secondary']});
-            border-radius: 16px;
-        """)
+        header = tag(QWidget(), "pageHeader")
         header.setFixedHeight(120)
         layout = QVBoxLayout()
         layout.setContentsMargins(30, 20, 30, 20)
         
-        title_label = QLabel(title)
-        title_label.setStyleSheet("color: white; font-size: 28px; font-weight: bold;")
-        
-        subtitle_label = QLabel(subtitle)
-        subtitle_label.setStyleSheet("color: rgba(255,255,255,0.9); font-size: 14px; margin-top: 5px;")
-        
-        layout.addWidget(title_label)
-        layout.addWidget(subtitle_label)
+        layout.addWidget(tag(QLabel(title), "headerTitle"))
+        layout.addWidget(tag(QLabel(subtitle), "headerSubtitle"))
         layout.addStretch()
         header.setLayout(layout)
         return header
     
-    def create_stat_card(self, icon, title, value, subtitle, color):
-        card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {self.colors['card']};
-                border-radius: 16px;
-                border-left: 5px solid {color};
-            }}
-        """)
+    def create_import_button(self, kind):
+        button = tag(QPushButton("📥 Import..."), "import", "accent2")
+        button.setToolTip(f"Import {kind} from a CSV or JSONL file")
+        button.clicked.connect(lambda: self.import_records(kind))
+        return button
+    
+    def create_analytics_panel(self):
+        panel_layout = QVBoxLayout()
+        panel_layout.setSpacing(15)
+        panel = self.create_card("📊 Department Analytics", panel_layout, "panel")
+        
+        self.staffing_table = self.create_analytics_table(
+            ["Department", "Patients", "Staff", "Patients per Staff", "Payroll"]
+        )
+        self.payroll_table = self.create_analytics_table(
+            ["Department", "Role", "Staff", "Payroll"]
+        )
+        self.ages_table = self.create_analytics_table(["Department"])
+        
+        for title, table in [
+            ("Staffing", self.staffing_table),
+            ("Payroll by Role", self.payroll_table),
+            ("Patient Ages", self.ages_table)
+        ]:
+            panel_layout.addWidget(tag(QLabel(title), "sectionTitle"))
+            panel_layout.addWidget(table)
+        
+        return panel
+    
+    def create_analytics_table(self, headers):
+        table = tag(QTableWidget(), "analytics")
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setMinimumHeight(220)
+        table.verticalHeader().setVisible(False)
+        return table
+    
+    def create_stat_card(self, icon, title, value, subtitle, accent):
+        card = tag(QFrame(), "statCard", accent)
         card.setFixedHeight(140)
         layout = QHBoxLayout()
         layout.setSpacing(20)
         layout.setContentsMargins(25, 20, 25, 20)
         
         # Icon
-        icon_container = QWidget()
+        icon_container = tag(QWidget(), "statIcon", accent)
         icon_container.setFixedSize(60, 60)
-        icon_container.setStyleSheet(f"""
-            background-color: {color}20;
-            border-radius: 30px;
-        """)
         icon_layout = QVBoxLayout()
-        icon_label = QLabel(icon)
+        icon_label = tag(QLabel(icon), "statEmoji")
         icon_label.setAlignment(Qt.AlignCenter)
-        icon_label.setStyleSheet("font-size: 28px;")
         icon_layout.addWidget(icon_label)
         icon_container.setLayout(icon_layout)
         
         # Text
         text_layout = QVBoxLayout()
-        title_label = QLabel(title)
-        title_label.setStyleSheet(f"color: {self.colors['text_light']}; font-size: 14px;")
-        
-        value_label = QLabel(value)
-        value_label.setStyleSheet(f"""
-            color: {self.colors['text']};
-            font-size: 32px;
-            font-weight: bold;
-        """)
+        value_label = tag(QLabel(value), "statValue")
+        card.value_label = value_label
         
-        subtitle_label = QLabel(subtitle)
-        subtitle_label.setStyleSheet(f"color: {color}; font-size: 12px; font-weight: 500;")
-        
-        text_layout.addWidget(title_label)
+        text_layout.addWidget(tag(QLabel(title), "statTitle"))
         text_layout.addWidget(value_label)
-        text_layout.addWidget(subtitle_label)
+        text_layout.addWidget(tag(QLabel(subtitle), "statSubtitle", accent))
         text_layout.addStretch()
         
         layout.addWidget(icon_container)
@@ -847,38 +611,94 @@ class HospitalGUI(QMainWindow):
         card.setLayout(layout)
         return card
     
-    def add_activity(self, icon, text, color):
-        # Remove "no activity" message if present
-        if self.no_activity and self.no_activity.isVisible():
-            self.no_activity.hide()
-        
-        item = QWidget()
-        item.setStyleSheet(f"""
-            QWidget {{
-                background-color: {color}15;
-                border-radius: 10px;
-                border-left: 3px solid {color};
-            }}
-        """)
-        layout = QHBoxLayout()
-        layout.setSpacing(15)
-        layout.setContentsMargins(15, 12, 15, 12)
-        
-        icon_label = QLabel(icon)
-        icon_label.setStyleSheet("font-size: 16px;")
+    def add_activity(self, icon, text, accent):
+        self.activity_feed.add(icon, text, accent)
+    
+    @instrumented("gui.update_stats")
+    def update_stats(self):
+        # Full refresh, gathered in the background; regular changes
+        # arrive through on_events
+        version = self._dept_version
+        
+        def gather(worker):
+            with self.hospital.lock.read():
+                return self.hospital.get_summary(), [
+                    (d.name, len(d.patients), len(d.staff_members))
+                    for d in self.hospital.departments.values()
+                ]
+        
+        self.workers.start(gather, on_finished=lambda result: self.apply_stats(*result, version))
+    
+    @instrumented("gui.apply_stats")
+    def apply_stats(self, summary, rows, version):
+        if version != self._dept_version:
+            # A department came or went while gathering; start over
+            self.update_stats()
+            return
         
-        text_label = QLabel(text)
-        text_label.setStyleSheet(f"color: {self.colors['text']}; font-size: 14px;")
+        self.update_counters(summary)
         
-        layout.addWidget(icon_label)
-        layout.addWidget(text_label, 1)
-        item.setLayout(layout)
+        # Update combo boxes
+        depts = [name for name, patients, staff in rows]
+        for combo in self.dept_combos():
+            combo.clear()
+            combo.addItems(depts)
         
-        self.activity_list.insertWidget(0, item)
+        # Update tables (patient and staff models are updated per row)
+        if self.page_built(1):
+            self.update_dept_table(rows)
     
-    def update_stats(self):
-        summary = self.hospital.get_summary()
+    def update_analytics(self):
+        # Only the visible dashboard is kept current; a hidden one is
+        # refreshed when it is shown again
+        if self.content_stack.currentIndex() != 0:
+            self._analytics_stale = True
+            return
         
+        self._analytics_stale = False
+        self.workers.start(
+            lambda worker: self.hospital.analytics(),
+            on_finished=self.apply_analytics
+        )
+    
+    def apply_analytics(self, results):
+        departments = results["departments"]
+        
+        self.staffing_table.setRowCount(len(departments))
+        for i, dept in enumerate(departments):
+            ratio = dept["patients_per_staff"]
+            for column, value in enumerate([
+                dept["name"],
+                str(dept["patients"]),
+                str(dept["staff"]),
+                "—" if ratio is None else f"{ratio:.1f}",
+                f"${dept['payroll']:,.2f}"
+            ]):
+                self.staffing_table.setItem(i, column, QTableWidgetItem(value))
+        
+        roles = [
+            (dept["name"], role, cell)
+            for dept in departments
+            for role, cell in sorted(dept["roles"].items())
+        ]
+        self.payroll_table.setRowCount(len(roles))
+        for i, (name, role, cell) in enumerate(roles):
+            for column, value in enumerate([
+                name, role, str(cell["staff"]), f"${cell['payroll']:,.2f}"
+            ]):
+                self.payroll_table.setItem(i, column, QTableWidgetItem(value))
+        
+        buckets = results["age_buckets"]
+        self.ages_table.setColumnCount(len(buckets) + 1)
+        self.ages_table.setHorizontalHeaderLabels(["Department"] + buckets)
+        self.ages_table.setRowCount(len(departments))
+        for i, dept in enumerate(departments):
+            self.ages_table.setItem(i, 0, QTableWidgetItem(dept["name"]))
+            for column, count in enumerate(dept["age_histogram"], 1):
+                self.ages_table.setItem(i, column, QTableWidgetItem(str(count)))
+    
+    @instrumented("gui.update_counters")
+    def update_counters(self, summary):
         # Update sidebar
         self.sidebar_depts.setText(f"Departments: {summary['total_departments']}")
         self.sidebar_patients.setText(f"Patients: {summary['total_patients']}")
@@ -893,91 +713,191 @@ class HospitalGUI(QMainWindow):
         ]
         
         for (card, title), value in zip(self.stat_cards, values):
-            # Find value label and update it
-            for child in card.findChildren(QLabel):
-                if child.styleSheet() and "font-size: 32px" in child.styleSheet():
-                    child.setText(value)
-        
-        # Update combo boxes
-        depts = list(self.hospital.departments.keys())
-        for combo in [self.patient_dept_combo, self.staff_dept_combo]:
-            combo.clear()
-            combo.addItems(depts)
-        
-        # Update tables
-        self.update_dept_table()
-        self.update_patient_table()
-        self.update_staff_table()
+            card.value_label.setText(value)
+    
+    @instrumented("gui.update_dept_table")
+    def update_dept_table(self, rows):
+        self.dept_model.reset(rows)
     
-    def update_dept_table(self):
-        self.dept_table.setRowCount(len(self.hospital.departments))
-        for i, (name, dept) in enumerate(self.hospital.departments.items()):
-            self.dept_table.setItem(i, 0, QTableWidgetItem(name))
-            self.dept_table.setItem(i, 1, QTableWidgetItem(str(len(dept.patients))))
-            self.dept_table.setItem(i, 2, QTableWidgetItem(str(len(dept.staff_members))))
-            
-            # Action buttons
-            action_widget = QWidget()
-            action_layout = QHBoxLayout()
-            action_layout.setSpacing(5)
-            
-            view_btn = QPushButton("👁 View")
-            view_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {self.colors['accent2']};
-                    color: white;
-                    padding: 6px 12px;
-                    border-radius: 6px;
-                    font-size: 12px;
-                }}
-            """)
-            
-            delete_btn = QPushButton("🗑 Delete")
-            delete_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {self.colors['danger']};
-                    color: white;
-                    padding: 6px 12px;
-                    border-radius: 6px;
-                    font-size: 12px;
-                }}
-            """)
-            delete_btn.clicked.connect(lambda checked, n=name: self.delete_department(n))
-            
-            action_layout.addWidget(view_btn)
-            action_layout.addWidget(delete_btn)
-            action_layout.addStretch()
-            action_widget.setLayout(action_layout)
-            self.dept_table.setCellWidget(i, 3, action_widget)
+    def on_dept_action(self, row, action):
+        name = self.dept_model.name_at(row)
+        if action == "view":
+            self.view_department(name)
+        elif action == "delete":
+            self.delete_department(name)
     
+    def view_department(self, name):
+        # The patients page listing only this department, until the next
+        # full refresh or search; new patients default to it
+        self.switch_page(2)
+        self.run_search("patient", None, None)
+        self.patient_search_input.clear()
+        self.patient_dept_combo.setCurrentText(name)
+        self.patient_model.load(
+            lambda after_id, limit: self.hospital.page_patients(name, after_id=after_id, limit=limit)
+        )
+    
+    @instrumented("gui.update_patient_table")
     def update_patient_table(self):
-        all_patients = []
-        for dept in self.hospital.departments.values():
-            for patient in dept.patients.values():
-                all_patients.append((patient, dept.name))
-        
-        self.patient_table.setRowCount(len(all_patients))
-        for i, (patient, dept_name) in enumerate(all_patients):
-            self.patient_table.setItem(i, 0, QTableWidgetItem(str(patient.id)))
-            self.patient_table.setItem(i, 1, QTableWidgetItem(patient.name))
-            self.patient_table.setItem(i, 2, QTableWidgetItem(str(patient.age)))
-            self.patient_table.setItem(i, 3, QTableWidgetItem(dept_name))
-            self.patient_table.setItem(i, 4, QTableWidgetItem(patient.medical_record[:50] + "..."))
+        # Full resync, paged in as the table scrolls; single adds go through patient_model.append
+        if not self.page_built(2):
+            return
+        self.patient_model.load(
+            lambda after_id, limit: self.hospital.page_patients(after_id=after_id, limit=limit)
+        )
     
+    @instrumented("gui.update_staff_table")
     def update_staff_table(self):
-        all_staff = []
-        for dept in self.hospital.departments.values():
-            for staff in dept.staff_members.values():
-                all_staff.append((staff, dept.name))
-        
-        self.staff_table.setRowCount(len(all_staff))
-        for i, (staff, dept_name) in enumerate(all_staff):
-            self.staff_table.setItem(i, 0, QTableWidgetItem(str(staff.id)))
-            self.staff_table.setItem(i, 1, QTableWidgetItem(staff.name))
-            self.staff_table.setItem(i, 2, QTableWidgetItem(str(staff.age)))
-            self.staff_table.setItem(i, 3, QTableWidgetItem(staff.role))
-            self.staff_table.setItem(i, 4, QTableWidgetItem(dept_name))
-            self.staff_table.setItem(i, 5, QTableWidgetItem(f"${staff.salary:,.2f}"))
+        # Full resync, paged in as the table scrolls; single adds go through staff_model.append
+        if not self.page_built(3):
+            return
+        self.staff_model.load(
+            lambda after_id, limit: self.hospital.page_staff(after_id=after_id, limit=limit)
+        )
+    
+    def search_patient(self):
+        query = self.patient_search_input.text().strip()
+        if not query:
+            self.run_search("patient", None, None)
+            self.update_patient_table()
+            return
+        
+        if self.patient_search_mode.currentText() == "Medical Record":
+            search = lambda: self.hospital.search_records(query, limit=200)
+        elif query.isdigit():
+            search = lambda: [self.hospital.find_patient(int(query))]
+        else:
+            search = lambda: self.hospital.search_people(query, kind="patient", limit=200)
+        self.run_search("patient", search, self.patient_model)
+    
+    def search_staff(self):
+        query = self.staff_search_input.text().strip()
+        if not query:
+            self.run_search("staff", None, None)
+            self.update_staff_table()
+            return
+        
+        if query.isdigit():
+            search = lambda: [self.hospital.find_staff(int(query))]
+        else:
+            search = lambda: self.hospital.search_people(query, kind="staff", limit=200)
+        self.run_search("staff", search, self.staff_model)
+    
+    def run_search(self, kind, search, model):
+        # Search in the background; only the newest search of each kind
+        # is shown, and clearing the box drops any search still running
+        self._search_seq[kind] += 1
+        if search is None:
+            return
+        
+        seq = self._search_seq[kind]
+        self.workers.start(
+            lambda worker: search(),
+            on_finished=lambda results: self.show_search(kind, seq, model, results)
+        )
+    
+    def show_search(self, kind, seq, model, results):
+        if seq != self._search_seq[kind]:
+            return
+        model.reset((person, dept.name) for person, dept in filter(None, results))
+    
+    # Hospital event handlers
+    def capture_event(self, event):
+        # Runs on the thread that made the change, inside its write lock,
+        # so the UI thread never has to wait for the lock itself.
+        # Returns (summary, details); a department may arrive with
+        # records already in it.
+        summary = self.hospital.get_summary()
+        if isinstance(event, DepartmentAdded):
+            dept = event.department
+            return summary, (
+                len(dept.patients), len(dept.staff_members),
+                [(p, dept.name) for p in dept.patients.values()],
+                [(s, dept.name) for s in dept.staff_members.values()]
+            )
+        if isinstance(event, (PatientAdded, StaffAdded)):
+            dept = event.department
+            return summary, (len(dept.patients), len(dept.staff_members))
+        return summary, None
+    
+    def on_events(self, batch):
+        # Apply a batch of (event, captured) pairs from the event bridge.
+        # Record rows are gathered and inserted together; department
+        # changes are applied in order between them.
+        patients, staff, counts = [], [], {}
+        
+        for event, (summary, captured) in batch:
+            if isinstance(event, PatientAdded):
+                patients.append((event.patient, event.department.name))
+                counts[event.department.name] = captured
+            elif isinstance(event, StaffAdded):
+                staff.append((event.staff, event.department.name))
+                counts[event.department.name] = captured
+            else:
+                self.apply_rows(patients, staff, counts)
+                patients, staff, counts = [], [], {}
+                if isinstance(event, DepartmentAdded):
+                    self.on_department_added(event, captured)
+                else:
+                    self.on_department_removed(event)
+        
+        self.apply_rows(patients, staff, counts)
+        self.update_counters(summary)
+        if not self.analytics_timer.isActive():
+            self.analytics_timer.start()
+    
+    def apply_rows(self, patients, staff, counts):
+        # Pages not built yet load everything when they are
+        if patients and self.page_built(2):
+            if self.patient_search_input.text().strip():
+                self.search_patient()
+            else:
+                self.patient_model.extend(patients)
+        if staff and self.page_built(3):
+            if self.staff_search_input.text().strip():
+                self.search_staff()
+            else:
+                self.staff_model.extend(staff)
+        if self.page_built(1):
+            for name, (patient_count, staff_count) in counts.items():
+                self.dept_model.set_counts(name, patient_count, staff_count)
+    
+    def on_department_added(self, event, captured):
+        self._dept_version += 1
+        name = event.department.name
+        patient_count, staff_count, patients, staff = captured
+        for combo in self.dept_combos():
+            combo.addItem(name)
+        
+        if self.page_built(1):
+            self.dept_model.add(name, patient_count, staff_count)
+        
+        self.apply_rows(patients, staff, {})
+    
+    def on_department_removed(self, event):
+        self._dept_version += 1
+        name = event.department.name
+        for combo in self.dept_combos():
+            index = combo.findText(name)
+            if index >= 0:
+                combo.removeItem(index)
+        
+        if self.page_built(1):
+            self.dept_model.remove(name)
+        if self.page_built(2):
+            self.patient_model.remove_department(name)
+        if self.page_built(3):
+            self.staff_model.remove_department(name)
+    
+    def closeEvent(self, event):
+        # Let background work stop before the log is closed
+        self.workers.cancel_all()
+        self.workers.wait()
+        self.event_bridge.drain_all()
+        self.store.close()
+        if self.capture is not None:
+            self.capture.stop()
+        super().closeEvent(event)
     
     # Action handlers
     def quick_add_dept(self):
@@ -1000,8 +920,7 @@ class HospitalGUI(QMainWindow):
         
         if "successfully" in result:
             self.dept_name_input.clear()
-            self.add_activity("🏢", f"Department '{name}' added successfully", self.colors['accent3'])
-            self.update_stats()
+            self.add_activity("🏢", f"Department '{name}' added successfully", "accent3")
             QMessageBox.information(self, "Success", result)
         else:
             QMessageBox.warning(self, "Error", result)
@@ -1010,8 +929,7 @@ class HospitalGUI(QMainWindow):
         reply = QMessageBox.question(self, "Confirm", f"Delete department '{name}'?")
         if reply == QMessageBox.Yes:
             result = self.hospital.remove_department(name)
-            self.add_activity("🗑", f"Department '{name}' removed", self.colors['danger'])
-            self.update_stats()
+            self.add_activity("🗑", f"Department '{name}' removed", "danger")
     
     def add_patient(self):
         dept_name = self.patient_dept_combo.currentText()
@@ -1029,17 +947,20 @@ class HospitalGUI(QMainWindow):
             return
         
         patient = Patient(name, age, record)
-        result = dept.add_patient(patient)
         
-        if "successfully" in result:
-            self.patient_name_input.clear()
-            self.patient_record_input.clear()
-            self.patient_age_input.setValue(25)
-            self.add_activity("🤒", f"Patient '{name}' added to {dept_name}", self.colors['accent4'])
-            self.update_stats()
-            QMessageBox.information(self, "Success", result)
-        else:
-            QMessageBox.warning(self, "Error", result)
+        def added(result):
+            if "successfully" in result.lower():
+                self.patient_name_input.clear()
+                self.patient_record_input.clear()
+                self.patient_age_input.setValue(25)
+                self.add_activity("🤒", f"Patient '{name}' added to {dept_name}", "accent4")
+                QMessageBox.information(self, "Success", result)
+            else:
+                QMessageBox.warning(self, "Error", result)
+        
+        # The add waits for the write lock and the log fsync; keep it off the UI thread
+        self.workers.start(lambda worker: dept.add_patient(patient), on_finished=added,
+                           on_failed=lambda error: QMessageBox.warning(self, "Error", error))
     
     def add_staff(self):
         dept_name = self.staff_dept_combo.currentText()
@@ -1058,18 +979,128 @@ class HospitalGUI(QMainWindow):
             return
         
         staff = Staff(name, age, role, dept_name, salary)
-        result = dept.add_staff(staff)
         
-        if "successfully" in result:
-            self.staff_name_input.clear()
-            self.staff_role_input.clear()
-            self.staff_age_input.setValue(30)
-            self.staff_salary_input.setValue(50000)
-            self.add_activity("👨‍⚕️", f"Staff '{name}' ({role}) added to {dept_name}", self.colors['accent1'])
-            self.update_stats()
-            QMessageBox.information(self, "Success", result)
+        def added(result):
+            if "successfully" in result.lower():
+                self.staff_name_input.clear()
+                self.staff_role_input.clear()
+                self.staff_age_input.setValue(30)
+                self.staff_salary_input.setValue(50000)
+                self.add_activity("👨‍⚕️", f"Staff '{name}' ({role}) added to {dept_name}", "accent1")
+                QMessageBox.information(self, "Success", result)
+            else:
+                QMessageBox.warning(self, "Error", result)
+        
+        self.workers.start(lambda worker: dept.add_staff(staff), on_finished=added,
+                           on_failed=lambda error: QMessageBox.warning(self, "Error", error))
+    
+    def import_records(self, kind):
+        # Imported on first use, to keep it out of startup
+        from Core.importer import import_file
+        
+        path, _ = QFileDialog.getOpenFileName(
+            self, f"Import {kind.title()}", parent_dir, "Data files (*.csv *.jsonl)"
+        )
+        if not path:
+            return
+        
+        progress = QProgressDialog(f"Importing {kind}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import")
+        progress.setMinimumDuration(0)
+        
+        # One fsync per batch instead of per record while importing
+        self.store.sync_every = 500
+        
+        def run(worker):
+            def report(r):
+                worker.report(r.added + r.rejected)
+                return not worker.cancelled
+            return import_file(self.hospital, path, kind, batch_size=500,
+                               create_departments=True, progress=report)
+        
+        def done(report):
+            self.store.sync_every = 1
+            self.store.flush()
+            progress.close()
+            self.add_activity("📥", f"Imported {report.added:,} {kind} from {os.path.basename(path)}",
+                              "accent2")
+            QMessageBox.information(self, "Import", str(report))
+        
+        def failed(error):
+            self.store.sync_every = 1
+            self.store.flush()
+            progress.close()
+            QMessageBox.warning(self, "Import Failed", error)
+        
+        worker = self.workers.start(
+            run, on_finished=done, on_failed=failed,
+            on_progress=lambda count, total: progress.setLabelText(f"Importing {kind}... {count:,} rows")
+        )
+        progress.canceled.connect(worker.cancel)
+    
+    # ===============================
+    # Diagnostics
+    # ===============================
+    
+    def toggle_metrics(self, on):
+        if on:
+            metrics.enable()
         else:
-            QMessageBox.warning(self, "Error", result)
+            metrics.disable()
+    
+    def show_metrics(self):
+        snapshot = metrics.snapshot()
+        if not snapshot:
+            QMessageBox.information(self, "Metrics", "No calls recorded. Turn on Collect Metrics first.")
+            return
+        
+        lines = [f"{'call':<32}{'count':>9}{'errors':>8}{'mean ms':>10}{'p99 ms':>10}"]
+        for name, values in snapshot.items():
+            p99 = values["p99_seconds"]
+            p99 = f"{p99 * 1000:>10.3f}" if p99 != float("inf") else f"{'>10000':>10}"
+            lines.append(f"{name:<32}{values['count']:>9,}{values['errors']:>8,}"
+                         f"{values['mean_seconds'] * 1000:>10.3f}{p99}")
+        self.show_report("Metrics", "\n".join(lines))
+    
+    def export_metrics(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "metrics.prom", "Prometheus text (*.prom);;JSON (*.json)"
+        )
+        if path:
+            metrics.write(path)
+            self.add_activity("📈", f"Metrics exported to {os.path.basename(path)}", "accent2")
+    
+    def start_capture(self, kind):
+        # cProfile only sees this (the UI) thread, not the worker pool
+        from Core.profiling import ProfileCapture
+        
+        self.capture = ProfileCapture(kind)
+        self.capture.start()
+        self.cpu_action.setEnabled(False)
+        self.memory_action.setEnabled(False)
+        self.stop_action.setEnabled(True)
+        self.add_activity("⏺", f"{kind.upper()} capture started", "accent4")
+    
+    def stop_capture(self):
+        capture, self.capture = self.capture, None
+        report = capture.stop()
+        self.cpu_action.setEnabled(True)
+        self.memory_action.setEnabled(True)
+        self.stop_action.setEnabled(False)
+        self.show_report(f"{capture.kind.upper()} Capture", report)
+        
+        default = "hospital.prof" if capture.kind == "cpu" else "hospital.tracemalloc"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Capture", default)
+        if path:
+            capture.save(path)
+            self.add_activity("💾", f"Capture saved to {os.path.basename(path)}", "accent2")
+    
+    def show_report(self, title, text):
+        box = QMessageBox(self)
+        box.setWindowTitle(title)
+        box.setText(f"{title} report")
+        box.setDetailedText(text)
+        box.exec()
 
 
 if __name__ == "__main__":
@@ -1079,6 +1110,9 @@ if __name__ == "__main__":
     font = QFont("Segoe UI", 10)
     app.setFont(font)
     
+    # Long medical records are kept in a memory-mapped file, not in memory
+    Patient.record_store = RecordStore()
+
     window = HospitalGUI()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
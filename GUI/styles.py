@@ -0,0 +1,203 @@
+"""
+Styles Module
+-------------
+This module defines the GUI's color palette and its one stylesheet.
+
+The whole look is a single stylesheet set once on the main window, so
+Qt parses it once instead of once per widget. Widgets opt in to rules
+with an object name (#sidebar, #content, ...) or with two dynamic
+properties set through tag():
+
+    cssClass   what the widget is ("card", "nav", "statValue", ...)
+    accent     which palette color it wears ("accent1", "danger", ...)
+
+    button = tag(QPushButton("Add"), "primary", "accent3")
+
+Properties must be set before the widget is first shown.
+"""
+
+from functools import lru_cache
+
+
+COLORS = {
+    'primary': '#667eea',
+    'secondary': '#764ba2',
+    'accent1': '#f093fb',
+    'accent2': '#4facfe',
+    'accent3': '#43e97b',
+    'accent4': '#fa709a',
+    'sidebar': '#2c3e50',
+    'card': '#ffffff',
+    'bg': '#f0f4f8',
+    'text': '#2d3748',
+    'text_light': '#718096',
+    'success': '#48bb78',
+    'warning': '#ecc94b',
+    'danger': '#f56565'
+}
+
+# Palette colors a widget can wear through its "accent" property
+ACCENTS = ("primary", "accent1", "accent2", "accent3", "accent4", "success", "warning", "danger")
+
+
+def tag(widget, css_class, accent=None):
+    widget.setProperty("cssClass", css_class)
+    if accent is not None:
+        widget.setProperty("accent", accent)
+    return widget
+
+
+BASE = """
+/* Sidebar */
+#sidebar {{
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 {sidebar},
+        stop:1 #1a252f);
+}}
+#sidebar QLabel {{ background: transparent; }}
+#logoIcon {{ font-size: 36px; }}
+#logoText {{ color: white; font-size: 22px; font-weight: bold; }}
+#statusCard {{
+    background-color: rgba(255,255,255,0.1);
+    border-radius: 16px;
+    padding: 20px;
+}}
+#statusTitle {{ color: white; font-weight: bold; font-size: 14px; }}
+QLabel[cssClass="status"] {{ color: #a0aec0; font-size: 12px; }}
+#diagnostics {{
+    color: #a0aec0;
+    font-size: 12px;
+    text-align: left;
+    padding: 10px 20px;
+    border-radius: 10px;
+    background-color: transparent;
+}}
+#diagnostics:hover {{ background-color: rgba(255,255,255,0.1); color: white; }}
+#diagnostics::menu-indicator {{ image: none; }}
+
+/* Pages */
+#content {{ background-color: {bg}; }}
+QScrollArea[cssClass="page"] {{ background-color: transparent; border: none; }}
+QWidget[cssClass="pageBody"] {{ background-color: transparent; }}
+#banner {{
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 {primary},
+        stop:1 {secondary});
+    border-radius: 20px;
+}}
+#bannerTitle {{ color: white; font-size: 32px; font-weight: bold; }}
+#bannerSubtitle {{ color: rgba(255,255,255,0.9); font-size: 16px; margin-top: 8px; }}
+QWidget[cssClass="pageHeader"] {{
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 {primary},
+        stop:1 {secondary});
+    border-radius: 16px;
+}}
+QLabel[cssClass="headerTitle"] {{ color: white; font-size: 28px; font-weight: bold; }}
+QLabel[cssClass="headerSubtitle"] {{ color: rgba(255,255,255,0.9); font-size: 14px; margin-top: 5px; }}
+#banner QLabel, QWidget[cssClass="pageHeader"] QLabel {{ background: transparent; }}
+
+/* Cards */
+QWidget[cssClass="card"] {{ background-color: {card}; border-radius: 16px; }}
+QWidget[cssClass="panel"] {{ background-color: {card}; border-radius: 20px; }}
+QLabel[cssClass="cardTitle"] {{ color: {text}; font-size: 18px; font-weight: bold; }}
+QLabel[cssClass="panelTitle"] {{ color: {text}; font-size: 20px; font-weight: bold; }}
+QLabel[cssClass="sectionTitle"] {{ color: {text_light}; font-size: 14px; font-weight: bold; }}
+QFrame[cssClass="statCard"] {{
+    background-color: {card};
+    border-radius: 16px;
+    border-left: 5px solid {text_light};
+}}
+QWidget[cssClass="statIcon"] {{ border-radius: 30px; }}
+QLabel[cssClass="statEmoji"] {{ font-size: 28px; background: transparent; }}
+QLabel[cssClass="statTitle"] {{ color: {text_light}; font-size: 14px; }}
+QLabel[cssClass="statValue"] {{ color: {text}; font-size: 32px; font-weight: bold; }}
+QLabel[cssClass="statSubtitle"] {{ font-size: 12px; font-weight: 500; }}
+
+/* Activity */
+QWidget[cssClass="activity"] {{ border-radius: 10px; border-left: 3px solid {text_light}; }}
+QLabel[cssClass="activityIcon"] {{ font-size: 16px; background: transparent; }}
+QLabel[cssClass="activityText"] {{ color: {text}; font-size: 14px; background: transparent; }}
+#noActivity {{ color: {text_light}; font-size: 14px; padding: 20px; }}
+
+/* Forms */
+#content QLineEdit, #content QTextEdit, #content QComboBox,
+#content QSpinBox, #content QDoubleSpinBox {{
+    padding: 12px;
+    border: 2px solid #e2e8f0;
+    border-radius: 10px;
+    background-color: {bg};
+}}
+#content QLineEdit:focus, #content QTextEdit:focus, #content QComboBox:focus {{
+    border: 2px solid {primary};
+}}
+#content QComboBox {{ min-width: 160px; }}
+#content QTextEdit {{ font-family: 'Segoe UI'; }}
+#deptNameInput {{ padding: 14px; font-size: 14px; }}
+
+/* Tables */
+#content QTableView {{
+    border: none;
+    background-color: transparent;
+    gridline-color: #e2e8f0;
+}}
+#content QHeaderView::section {{
+    background-color: {bg};
+    padding: 12px;
+    border: none;
+    font-weight: bold;
+    color: {text};
+}}
+#content QTableView::item {{
+    padding: 12px;
+    border-bottom: 1px solid #e2e8f0;
+}}
+QTableView[cssClass="analytics"] QHeaderView::section {{ padding: 8px; }}
+QTableView[cssClass="analytics"]::item {{ padding: 4px; border-bottom: none; }}
+"""
+
+ACCENT = """
+QPushButton[accent="{name}"] {{
+    background-color: {color};
+    color: white;
+    border-radius: 10px;
+    font-weight: bold;
+    padding: 12px 20px;
+    font-size: 13px;
+}}
+QPushButton[accent="{name}"]:hover {{ background-color: {color}dd; }}
+QPushButton[cssClass="nav"][accent="{name}"]:hover {{ border-left: 4px solid {color}; background-color: rgba(255,255,255,0.1); }}
+QPushButton[cssClass="nav"][accent="{name}"]:checked {{ border-left: 4px solid {color}; background-color: rgba(255,255,255,0.15); }}
+QFrame[cssClass="statCard"][accent="{name}"] {{ border-left: 5px solid {color}; }}
+QWidget[cssClass="statIcon"][accent="{name}"] {{ background-color: {color}20; }}
+QLabel[cssClass="statSubtitle"][accent="{name}"] {{ color: {color}; }}
+QWidget[cssClass="activity"][accent="{name}"] {{ background-color: {color}15; border-left: 3px solid {color}; }}
+"""
+
+# After the accent rules, which they refine: the class gives the size
+BUTTONS = """
+QPushButton[cssClass="primary"] {{ padding: 14px 28px; font-size: 14px; }}
+QPushButton[cssClass="submit"] {{ padding: 14px; font-size: 14px; margin-top: 10px; }}
+QPushButton[cssClass="import"] {{ padding: 12px 18px; }}
+QPushButton[cssClass="nav"] {{
+    color: white;
+    font-size: 16px;
+    text-align: left;
+    padding: 16px 24px;
+    border-radius: 12px;
+    background-color: transparent;
+    border-left: 4px solid transparent;
+    font-weight: 500;
+}}
+"""
+
+
+@lru_cache(maxsize=None)
+def stylesheet():
+    """
+    The application stylesheet, built once.
+    """
+    parts = [BASE.format(**COLORS)]
+    parts.extend(ACCENT.format(name=name, color=COLORS[name]) for name in ACCENTS)
+    parts.append(BUTTONS.format(**COLORS))
+    return "".join(parts)
@@ -0,0 +1,293 @@
+"""
+Table Models Module
+-------------------
+This module defines the Qt item models behind the patient and staff tables.
+
+The models keep a plain list of (person, department name) rows and the
+views only ask for the cells that are currently visible, so adding a
+record inserts a single row instead of rebuilding the whole table.
+
+A full listing is loaded page by page from Hospital.page_patients /
+page_staff as the view scrolls (Qt's canFetchMore / fetchMore). Given a
+WorkerPool, pages are fetched in the background and appended when ready.
+"""
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class PersonTableModel(QAbstractTableModel):
+    """
+    Base table model over (person, department name) rows.
+
+    Subclasses define the column headers and how each cell is rendered.
+    """
+
+    headers = []
+    page_size = 200
+
+    def __init__(self, parent=None, workers=None):
+        super().__init__(parent)
+        self._rows = []
+        self._fetch = None    # fetch(after_id, limit) while pages remain
+        self._workers = workers
+        self._loading = False  # a background page fetch is running
+        self._pending = []     # rows added while that fetch runs
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        person, dept_name = self._rows[index.row()]
+        return self.cell(person, dept_name, index.column())
+
+    def cell(self, person, dept_name, column):
+        raise NotImplementedError
+
+    # ===============================
+    # Paged Loading
+    # ===============================
+
+    def load(self, fetch):
+        """
+        Show a paged listing. fetch(after_id, limit) returns the next
+        rows in ID order; pages are pulled in as the view scrolls.
+        """
+        self.beginResetModel()
+        self._rows = []
+        self._fetch = fetch
+        self._loading = False
+        self._pending = []
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetch is not None and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch is None or self._loading:
+            return
+
+        fetch = self._fetch
+        after_id = self._rows[-1][0].id if self._rows else 0
+
+        if self._workers is None:
+            self._fetched(fetch, after_id, fetch(after_id, self.page_size))
+            return
+
+        self._loading = True
+        self._workers.start(
+            lambda worker: fetch(after_id, self.page_size),
+            on_finished=lambda rows: self._fetched(fetch, after_id, rows),
+            on_failed=lambda error: self._fetched(fetch, after_id, [])
+        )
+
+    def _fetched(self, fetch, after_id, rows):
+        if fetch is not self._fetch:
+            # The model was reloaded or reset while this page was loading
+            return
+
+        self._loading = False
+        if len(rows) < self.page_size:
+            # Last page: keep rows that were added after it was read
+            self._fetch = None
+            seen = {person.id for person, dept_name in rows}
+            rows = list(rows) + [
+                row for row in self._pending
+                if row[0].id > after_id and row[0].id not in seen
+            ]
+        self._pending = []
+        self._insert(rows)
+
+    # ===============================
+    # Row Updates
+    # ===============================
+
+    def append(self, person, dept_name):
+        """
+        Append a single row, notifying the view of the new row only.
+        """
+        self.extend([(person, dept_name)])
+
+    def extend(self, rows):
+        """
+        Append several new rows with a single insert notification.
+        """
+        if self._fetch is not None:
+            # Not all pages are loaded yet; the rows come with a later page
+            if self._loading:
+                self._pending.extend(rows)
+            return
+
+        self._insert(rows)
+
+    def _insert(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def remove_department(self, dept_name):
+        """
+        Drop every row that belongs to the given department.
+
+        Rows of one department are spread across the table, so the
+        remaining rows are kept in a single pass and the model is reset.
+        """
+        kept = [row for row in self._rows if row[1] != dept_name]
+        if len(kept) == len(self._rows):
+            return
+
+        self.beginResetModel()
+        self._rows = kept
+        self.endResetModel()
+
+    def reset(self, rows):
+        """
+        Replace all rows at once, e.g. with search results.
+        """
+        self.beginResetModel()
+        self._fetch = None
+        self._loading = False
+        self._pending = []
+        self._rows = list(rows)
+        self.endResetModel()
+
+
+class PatientTableModel(PersonTableModel):
+
+    headers = ["ID", "Name", "Age", "Department", "Medical Record"]
+
+    def cell(self, patient, dept_name, column):
+        if column == 0:
+            return str(patient.id)
+        if column == 1:
+            return patient.name
+        if column == 2:
+            return str(patient.age)
+        if column == 3:
+            return dept_name
+        if column == 4:
+            return patient.preview + "..."
+        return None
+
+
+class StaffTableModel(PersonTableModel):
+
+    headers = ["ID", "Name", "Age", "Role", "Department", "Salary"]
+
+    def cell(self, staff, dept_name, column):
+        if column == 0:
+            return str(staff.id)
+        if column == 1:
+            return staff.name
+        if column == 2:
+            return str(staff.age)
+        if column == 3:
+            return staff.role
+        if column == 4:
+            return dept_name
+        if column == 5:
+            return f"${staff.salary:,.2f}"
+        return None
+
+
+class DepartmentTableModel(QAbstractTableModel):
+    """
+    Table model over (name, patient count, staff count) rows.
+
+    The last column has no data of its own; the view paints its buttons
+    with an ActionDelegate (see widgets.py). Rows are found by name
+    through a dict, so a count update touches a single row.
+    """
+
+    headers = ["Name", "Patients", "Staff", "Actions"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []     # [name, patients, staff]
+        self._index = {}    # name -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole or index.column() > 2:
+            return None
+
+        value = self._rows[index.row()][index.column()]
+        return value if index.column() == 0 else str(value)
+
+    def name_at(self, row):
+        return self._rows[row][0]
+
+    def row_of(self, name):
+        return self._index.get(name, -1)
+
+    # ===============================
+    # Row Updates
+    # ===============================
+
+    def reset(self, rows):
+        """
+        Replace all rows, e.g. after a full refresh.
+        """
+        self.beginResetModel()
+        self._rows = [[name, patients, staff] for name, patients, staff in rows]
+        self._index = {row[0]: i for i, row in enumerate(self._rows)}
+        self.endResetModel()
+
+    def add(self, name, patients, staff):
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append([name, patients, staff])
+        self._index[name] = row
+        self.endInsertRows()
+
+    def remove(self, name):
+        row = self._index.pop(name, None)
+        if row is None:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        for i in range(row, len(self._rows)):
+            self._index[self._rows[i][0]] = i
+        self.endRemoveRows()
+
+    def set_counts(self, name, patients, staff):
+        row = self._index.get(name)
+        if row is None:
+            return
+
+        self._rows[row][1:3] = [patients, staff]
+        self.dataChanged.emit(self.index(row, 1), self.index(row, 2), [Qt.DisplayRole])
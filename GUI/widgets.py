@@ -0,0 +1,182 @@
+"""
+Widgets Module
+--------------
+This module defines the GUI pieces that keep widget counts flat as the
+data grows:
+
+- ActionDelegate paints a row of buttons in a table cell. No widget is
+  created per row; a click on a painted button emits triggered(row, key).
+- ActivityFeed shows the newest entries of the activity log. It creates
+  at most `limit` entry widgets and then recycles the oldest one for
+  each new entry.
+
+Both take their look from the shared stylesheet and palette in styles.py.
+"""
+
+from collections import deque
+
+from PySide6.QtCore import QEvent, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QStyledItemDelegate, QVBoxLayout, QWidget
+
+from styles import COLORS, tag
+
+
+class ActionDelegate(QStyledItemDelegate):
+    """
+    Paints buttons for the (key, label, accent) actions in every cell
+    of its column, and reports clicks on them.
+    """
+
+    triggered = Signal(int, str)    # row, action key
+
+    BUTTON_HEIGHT = 28
+    PADDING = 12        # left and right of the label
+    SPACING = 5
+    MARGIN = 8
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self.actions = actions
+        self._widths = {}    # font key -> button widths
+        self._pressed = None
+
+    def _font(self, option):
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        return font
+
+    def _buttons(self, rect, font):
+        # (key, label, accent, button rect) for a cell
+        widths = self._widths.get(font.key())
+        if widths is None:
+            metrics = QFontMetrics(font)
+            widths = self._widths[font.key()] = [
+                metrics.horizontalAdvance(label) + 2 * self.PADDING
+                for key, label, accent in self.actions
+            ]
+
+        x = rect.left() + self.MARGIN
+        y = rect.top() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        buttons = []
+        for (key, label, accent), width in zip(self.actions, widths):
+            buttons.append((key, label, accent, QRect(x, y, width, self.BUTTON_HEIGHT)))
+            x += width + self.SPACING
+        return buttons
+
+    def action_at(self, rect, point, font):
+        for key, label, accent, button in self._buttons(rect, font):
+            if button.contains(point):
+                return key
+        return None
+
+    def paint(self, painter, option, index):
+        # Background and selection as for any other cell
+        super().paint(painter, option, index)
+
+        font = self._font(option)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(font)
+        for key, label, accent, button in self._buttons(option.rect, font):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(COLORS[accent]))
+            painter.drawRoundedRect(button, 6, 6)
+            painter.setPen(QColor("white"))
+            painter.drawText(button, Qt.AlignCenter, label)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        font = self._font(option)
+        buttons = self._buttons(QRect(0, 0, 0, self.BUTTON_HEIGHT), font)
+        width = buttons[-1][3].right() + self.MARGIN if buttons else 0
+        return QSize(width, self.BUTTON_HEIGHT + 2 * self.MARGIN)
+
+    def editorEvent(self, event, model, option, index):
+        # A click is a press and a release on the same button
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+
+        key = self.action_at(option.rect, event.position().toPoint(), self._font(option))
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed = (index.row(), key) if key else None
+            return key is not None
+
+        pressed, self._pressed = self._pressed, None
+        if key is not None and pressed == (index.row(), key):
+            self.triggered.emit(index.row(), key)
+            return True
+        return False
+
+
+class ActivityItem(QWidget):
+    """
+    One entry of the activity feed; reused for a newer entry once it
+    falls off the end.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        tag(self, "activity")
+        layout = QHBoxLayout()
+        layout.setSpacing(15)
+        layout.setContentsMargins(15, 12, 15, 12)
+
+        self.icon_label = tag(QLabel(), "activityIcon")
+        self.text_label = tag(QLabel(), "activityText")
+        layout.addWidget(self.icon_label)
+        layout.addWidget(self.text_label, 1)
+        self.setLayout(layout)
+
+    def set(self, icon, text, accent):
+        self.icon_label.setText(icon)
+        self.text_label.setText(text)
+        if self.property("accent") != accent:
+            self.setProperty("accent", accent)
+            # Match the shared stylesheet again for the new accent
+            self.style().unpolish(self)
+            self.style().polish(self)
+
+
+class ActivityFeed(QWidget):
+    """
+    The newest `limit` activity entries, newest first.
+    """
+
+    def __init__(self, empty_text, limit=50, parent=None):
+        super().__init__(parent)
+        self.limit = limit
+        self._items = deque()    # newest first
+
+        self._layout = QVBoxLayout()
+        self._layout.setSpacing(10)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+        self._empty = QLabel(empty_text)
+        self._empty.setObjectName("noActivity")
+        self._empty.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self._empty)
+        self.setLayout(self._layout)
+
+    def add(self, icon, text, accent):
+        self._empty.hide()
+        if len(self._items) < self.limit:
+            item = ActivityItem(self)
+        else:
+            item = self._items.pop()
+            self._layout.removeWidget(item)
+
+        item.set(icon, text, accent)
+        self._items.appendleft(item)
+        self._layout.insertWidget(0, item)
+
+    def entries(self):
+        """
+        [(icon, text, accent)] of the shown entries, newest first.
+        """
+        return [
+            (item.icon_label.text(), item.text_label.text(), item.property("accent"))
+            for item in self._items
+        ]
@@ -0,0 +1,172 @@
+"""
+Workers Module
+--------------
+This module moves slow work off the Qt main thread.
+
+- Worker runs a function on the global QThreadPool. The function gets
+  the worker itself, so it can report progress and check for
+  cancellation. The progress, finished and failed signals are delivered
+  on the UI thread.
+- EventBridge receives hospital events on whatever thread made the
+  change. It hands them to the UI thread in batches, at most about one
+  frame's worth of work per pass, so a bulk import never freezes the
+  window.
+"""
+
+import threading
+import time
+import traceback
+from collections import deque
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+
+class WorkerSignals(QObject):
+    progress = Signal(int, int)    # done, total (0 if unknown)
+    finished = Signal(object)      # the function's result
+    failed = Signal(str)           # formatted exception
+
+
+class Worker(QRunnable):
+    """
+    Runs fn(worker) on the thread pool.
+
+    Inside fn, call worker.report(done, total) to publish progress and
+    check worker.cancelled to stop early. Results and errors arrive on
+    the UI thread through worker.signals.
+    """
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = WorkerSignals()
+        self.cancelled = False
+        self.setAutoDelete(False)  # the caller keeps the worker alive
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report(self, done, total=0):
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.fn(self)
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+        else:
+            self.signals.finished.emit(result)
+
+
+class WorkerPool:
+    """
+    Starts workers on the global QThreadPool and keeps them alive
+    until they finish.
+    """
+
+    def __init__(self):
+        self.pool = QThreadPool.globalInstance()
+        self._running = set()
+
+    def start(self, fn, on_finished=None, on_failed=None, on_progress=None):
+        """
+        Run fn(worker) in the background and return the Worker.
+        Callbacks are invoked on the UI thread.
+        """
+        worker = Worker(fn)
+        if on_progress is not None:
+            worker.signals.progress.connect(on_progress)
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+        if on_failed is not None:
+            worker.signals.failed.connect(on_failed)
+
+        worker.signals.finished.connect(lambda result: self._running.discard(worker))
+        worker.signals.failed.connect(lambda error: self._running.discard(worker))
+
+        self._running.add(worker)
+        self.pool.start(worker)
+        return worker
+
+    def cancel_all(self):
+        for worker in list(self._running):
+            worker.cancel()
+
+    def wait(self, msecs=-1):
+        """
+        Block until all workers are done. Returns False on timeout.
+        """
+        return self.pool.waitForDone(msecs)
+
+
+class EventBridge(QObject):
+    """
+    Delivers hospital events to handler(batch) on the UI thread.
+
+    Events published on the UI thread are handled at once. Events from
+    other threads are queued and drained in batches, each pass stopping
+    after `budget` seconds so the window keeps repainting.
+
+    capture(event), if given, runs on the publishing thread while the
+    change is still current. Its result is delivered with the event as
+    (event, captured) pairs.
+    """
+
+    _ready = Signal()
+
+    def __init__(self, handler, capture=None, budget=0.008, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.capture = capture
+        self.budget = budget
+        self.batch_size = 200
+
+        self._ui_thread = threading.get_ident()
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._ready.connect(self._drain)
+
+    def publish(self, event):
+        item = (event, self.capture(event) if self.capture else None)
+
+        if threading.get_ident() == self._ui_thread:
+            # Keep order: anything queued from other threads goes first
+            self.drain_all()
+            self.handler([item])
+            return
+
+        with self._lock:
+            self._queue.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._ready.emit()
+
+    def drain_all(self):
+        """
+        Handle every queued event now (e.g. before closing).
+        """
+        while self._take_batch():
+            pass
+
+    @Slot()
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            if not self._take_batch():
+                return
+
+        # Out of time for this frame; carry on after the next repaint
+        QTimer.singleShot(0, self._drain)
+
+    def _take_batch(self):
+
+        with self._lock:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            if not self._queue:
+                self._scheduled = False
+
+        if batch:
+            self.handler(batch)
+        return bool(self._queue)
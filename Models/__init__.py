@@ -2,3 +2,7 @@ from .patient import Patient
 from .staff import Staff
 from .department import Department
 from .person import Person
+from .events import EventBus
+from .ids import IdAllocator
+from .locks import RWLock
+from .metrics import instrumented, metrics
@@ -0,0 +1,231 @@
+"""
+Columns Module
+--------------
+This module defines the compact, column-oriented storage a Department
+can use for its patients and staff instead of dicts of objects.
+
+Each field is kept in its own column:
+- ids in array('q'), ages in array('H') (so 0..MAX_AGE), salaries in
+  array('d'),
+- names and roles as interned strings, so repeated values are stored once,
+- medical records as the patients hold them (the text, or a row in
+  Patient.record_store) next to their precomputed previews.
+
+The columns behave like the usual {id: person} dicts. Reading an entry
+returns a lightweight PatientView / StaffView proxy that reads from the
+columns and keeps the Patient / Staff API (id, name, age, view_record(),
+view_info(), ...). Views are read-only snapshots of the stored fields.
+
+IDs normally arrive in increasing order, so lookups are a binary search
+over the id column with no per-record index. If an out-of-order ID is
+ever added, a dict index is built from then on.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from operator import lt
+from collections.abc import Mapping
+
+from .patient import PREVIEW_LENGTH, Patient, load_record
+from .staff import Staff
+
+
+MAX_AGE = 0xFFFF    # largest age an array('H') column holds
+
+
+class _Columns(Mapping):
+    """
+    Base class: an id column plus lookup from id to row number.
+    """
+
+    def __init__(self):
+        self._ids = array("q")
+        self._index = None   # id -> row, only once ids stop being sorted
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __contains__(self, person_id):
+        return self._row(person_id) is not None
+
+    def __getitem__(self, person_id):
+        row = self._row(person_id)
+        if row is None:
+            raise KeyError(person_id)
+        return self._view(row)
+
+    def values(self):
+        return [self._view(row) for row in range(len(self._ids))]
+
+    def items(self):
+        return [(self._ids[row], self._view(row)) for row in range(len(self._ids))]
+
+    def __setitem__(self, person_id, person):
+        if not 0 <= person.age <= MAX_AGE:
+            # Checked before any column changes, so a row is never half written
+            raise ValueError(f"Age must be between 0 and {MAX_AGE} in a compact department.")
+
+        row = self._row(person_id)
+        if row is not None:
+            self._write(row, person)
+            return
+
+        if self._index is None and self._ids and person_id < self._ids[-1]:
+            self._index = {pid: i for i, pid in enumerate(self._ids)}
+        if self._index is not None:
+            self._index[person_id] = len(self._ids)
+
+        self._ids.append(person_id)
+        self._append(person)
+
+    def _load_ids(self, ids):
+        self._ids = ids
+        if not all(map(lt, ids, islice(ids, 1, None))):
+            self._index = {pid: row for row, pid in enumerate(ids)}
+
+    def _row(self, person_id):
+        if self._index is not None:
+            return self._index.get(person_id)
+
+        row = bisect_left(self._ids, person_id)
+        if row < len(self._ids) and self._ids[row] == person_id:
+            return row
+        return None
+
+
+class PatientColumns(_Columns):
+
+    def __init__(self):
+        super().__init__()
+        self.names = []
+        self.ages = array("H")
+        self.records = []     # text or Patient.record_store row
+        self.previews = []    # None: cut from the records when read
+
+    @classmethod
+    def from_arrays(cls, ids, names, ages, records):
+        """
+        Columns over already built ones, e.g. loaded from a snapshot:
+        ids array('q'), names list, ages array('H') and a records list
+        (or any list-like, see records.py). Previews are cut from the
+        records as they are read.
+        """
+        columns = cls()
+        columns._load_ids(ids)
+        columns.names = names
+        columns.ages = ages
+        columns.records = records
+        columns.previews = None
+        return columns
+
+    def record(self, row):
+        return load_record(self.records[row])
+
+    def preview(self, row):
+        if self.previews is None:
+            return self.record(row)[:PREVIEW_LENGTH]
+        return self.previews[row]
+
+    def _append(self, patient):
+        record, preview = patient.stored_record()
+        self.names.append(sys.intern(patient.name))
+        self.ages.append(patient.age)
+        self.records.append(record)
+        if self.previews is not None:
+            self.previews.append(preview)
+
+    def _write(self, row, patient):
+        record, preview = patient.stored_record()
+        self.names[row] = sys.intern(patient.name)
+        self.ages[row] = patient.age
+        self.records[row] = record
+        if self.previews is not None:
+            self.previews[row] = preview
+
+    def _view(self, row):
+        return PatientView(self, row)
+
+
+class StaffColumns(_Columns):
+
+    def __init__(self, department: str):
+        super().__init__()
+        self.department = department
+        self.names = []
+        self.ages = array("H")
+        self.roles = []
+        self.salaries = array("d")
+
+    @classmethod
+    def from_arrays(cls, department, ids, names, ages, roles, salaries):
+        """
+        Columns over already built ones: ids array('q'), names and roles
+        lists, ages array('H') and salaries array('d').
+        """
+        columns = cls(department)
+        columns._load_ids(ids)
+        columns.names = names
+        columns.ages = ages
+        columns.roles = roles
+        columns.salaries = salaries
+        return columns
+
+    def _append(self, staff):
+        self.names.append(sys.intern(staff.name))
+        self.ages.append(staff.age)
+        self.roles.append(sys.intern(staff.role))
+        self.salaries.append(staff.salary)
+
+    def _write(self, row, staff):
+        self.names[row] = sys.intern(staff.name)
+        self.ages[row] = staff.age
+        self.roles[row] = sys.intern(staff.role)
+        self.salaries[row] = staff.salary
+
+    def _view(self, row):
+        return StaffView(self, row)
+
+
+class PatientView(Patient):
+    """
+    Read-only Patient backed by a row of PatientColumns.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    id = property(lambda self: self._columns._ids[self._row])
+    name = property(lambda self: self._columns.names[self._row])
+    age = property(lambda self: self._columns.ages[self._row])
+    medical_record = property(lambda self: self._columns.record(self._row))
+    preview = property(lambda self: self._columns.preview(self._row))
+
+    def stored_record(self):
+        return self._columns.records[self._row], self._columns.preview(self._row)
+
+
+class StaffView(Staff):
+    """
+    Read-only Staff backed by a row of StaffColumns.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    id = property(lambda self: self._columns._ids[self._row])
+    name = property(lambda self: self._columns.names[self._row])
+    age = property(lambda self: self._columns.ages[self._row])
+    role = property(lambda self: self._columns.roles[self._row])
+    department = property(lambda self: self._columns.department)
+    salary = property(lambda self: self._columns.salaries[self._row])
@@ -0,0 +1,140 @@
+"""
+Cursors Module
+--------------
+This module defines the cursor-based paging used by Department and
+Hospital listings (iter_patients, iter_staff, iter_departments).
+
+A listing returns a Page: up to `limit` items plus a cursor for the next
+page, or None after the last page. A cursor is an opaque string that
+records the sort key of the last item returned. The next page starts
+strictly after that key, so pages never repeat or skip records that
+already existed, however many records are inserted in between. Records
+inserted meanwhile show up if they sort after the cursor.
+
+Orders:
+- "id" (default) seeks straight to the cursor in sorted ID arrays.
+- "name" and "age" (and "salary" for staff) scan the records once per
+  page and keep only the `limit` smallest keys.
+"""
+
+import base64
+import heapq
+import json
+from array import array
+from bisect import bisect_right, insort
+from collections import namedtuple
+
+
+Page = namedtuple("Page", "items cursor")
+
+
+PATIENT_ORDERS = {
+    "id": lambda p: (p.id,),
+    "name": lambda p: (p.name.casefold(), p.id),
+    "age": lambda p: (p.age, p.id),
+}
+
+STAFF_ORDERS = dict(PATIENT_ORDERS, salary=lambda s: (s.salary, s.id))
+
+DEPARTMENT_ORDERS = {
+    "name": lambda d: (d.name,),
+}
+
+
+# ===============================
+# Cursor Encoding
+# ===============================
+
+def encode_cursor(order_by, key):
+    data = json.dumps([order_by, *key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(cursor, order_by):
+    """
+    Return the sort key stored in a cursor, or None for the first page.
+    Raises ValueError if the cursor is malformed or was made for
+    another order.
+    """
+    if cursor is None:
+        return None
+
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(data, list) or not data or data[0] != order_by:
+        raise ValueError(f"Cursor does not belong to order {order_by!r}")
+    return tuple(data[1:])
+
+
+def order_key(orders, order_by):
+    if order_by not in orders:
+        raise ValueError(f"Unknown order: {order_by!r}")
+    return orders[order_by]
+
+
+# ===============================
+# Sorted IDs
+# ===============================
+
+def add_sorted_id(ids, person_id):
+    """
+    Add an ID to a sorted array. IDs almost always arrive in increasing
+    order, which is a plain append.
+    """
+    if not ids or person_id > ids[-1]:
+        ids.append(person_id)
+    else:
+        insort(ids, person_id)
+
+
+def ids_after(ids, after_id):
+    """
+    Yield the IDs above after_id, in order.
+    """
+    for i in range(bisect_right(ids, after_id), len(ids)):
+        yield ids[i]
+
+
+def sorted_ids():
+    return array("q")
+
+
+# ===============================
+# Paging
+# ===============================
+
+def make_page(items, limit, order_by, key):
+    """
+    Wrap up to `limit` items; a full page gets a cursor for the next one.
+    """
+    if len(items) < limit:
+        return Page(items, None)
+    return Page(items, encode_cursor(order_by, key(items[-1])))
+
+
+def smallest_after(records, after, limit, key):
+    """
+    The `limit` records with the smallest keys above `after`.
+    """
+    if after is not None:
+        records = (r for r in records if key(r) > after)
+    return heapq.nsmallest(limit, records, key=key)
+
+
+def stream(fetch, limit=500):
+    """
+    Yield every item of a listing, one page at a time.
+
+    fetch(cursor, limit) returns a Page, e.g.
+        stream(lambda c, n: hospital.iter_patients(c, n))
+    """
+    cursor = None
+    while True:
+        page = fetch(cursor, limit)
+        yield from page.items
+        if page.cursor is None:
+            return
+        cursor = page.cursor
@@ -3,37 +3,196 @@ This Class Represents a department within a hospital.
 
 Attributes:
     name(str): Name of the department.
-    patients(list): List of patients assigned to this department.
-    staff_members(list): List of staff members working in this department.    
+    patients(dict): Patients of this department by ID (PatientColumns
+                    when compact).
+    staff_members(dict): Staff members of this department by ID
+                         (StaffColumns when compact).
+    events(EventBus): Bus of the hospital this department belongs to, if any.
+    lock(RWLock): Lock of the hospital this department belongs to; changes
+                  are made under its write lock.
+    compact(bool): Keep patients and staff in column arrays (see columns.py)
+                   instead of dicts of objects.
 """
 
+from itertools import islice
+
+from .columns import PatientColumns, StaffColumns
+from .cursors import (
+    PATIENT_ORDERS, STAFF_ORDERS, add_sorted_id, decode_cursor, ids_after,
+    make_page, order_key, smallest_after, sorted_ids
+)
+from .events import PatientAdded, StaffAdded
+from .locks import NULL_LOCK
+from .metrics import instrumented
+
+
 class Department():
-    def __init__(self, name):
+    def __init__(self, name, compact=False):
         self.name = name
-        self.patients = {}        # P1, P2, ...
-        self.staff_members = {}  # S1, S2, ...
+        self.compact = compact
+        if compact:
+            self.patients = PatientColumns()
+            self.staff_members = StaffColumns(name)
+        else:
+            self.patients = {}        # patient id -> Patient
+            self.staff_members = {}  # staff id -> Staff
+        self.events = None       # set by Hospital.add_department
+        self.lock = NULL_LOCK    # likewise
+
+        # IDs in ascending order, for cursor paging
+        self._patient_ids = sorted_ids()
+        self._staff_ids = sorted_ids()
+
+    @classmethod
+    def restore(cls, name, patients, staff_members):
+        """
+        A department over already filled {id: person} mappings, dicts or
+        columns (see columns.py), e.g. loaded from a snapshot. No events
+        are published; see Hospital.restore_departments().
+        """
+        department = cls(name, isinstance(patients, PatientColumns))
+        department.patients = patients
+        department.staff_members = staff_members
+        department._patient_ids.extend(sorted(patients))
+        department._staff_ids.extend(sorted(staff_members))
+        return department
 
     def __repr__(self):
         return (f"Department Name : {self.name}, "
                 f"Patients: {len(self.patients)}, "
                 f"Staff Members: {len(self.staff_members)}")
 
+    @instrumented("department.add_patient")
     def add_patient(self, patient):
-        patient_id = f"P{patient.id}"
+        with self.lock.write():
+            if patient.id in self.patients:
+                return "The Patient Already Exists."
+
+            try:
+                self.patients[patient.id] = patient
+            except ValueError as e:    # an age compact columns cannot hold
+                return str(e)
+            add_sorted_id(self._patient_ids, patient.id)
 
-        if patient_id in self.patients:
-            return "The Patient Already Exists."
+            if self.events is not None:
+                self.events.publish(PatientAdded(self, patient))
 
-        self.patients[patient_id] = patient
         return "Patient Added Successfully!"
 
+    @instrumented("department.add_staff")
     def add_staff(self, staff_member):
-        staff_id = f"S{staff_member.id}"
-
         staff_member.department = self.name
 
-        if staff_id in self.staff_members:
-            return "Staff Member Already Exists."
+        with self.lock.write():
+            if staff_member.id in self.staff_members:
+                return "Staff Member Already Exists."
+
+            try:
+                self.staff_members[staff_member.id] = staff_member
+            except ValueError as e:
+                return str(e)
+            add_sorted_id(self._staff_ids, staff_member.id)
+
+            if self.events is not None:
+                self.events.publish(StaffAdded(self, staff_member))
 
-        self.staff_members[staff_id] = staff_member
         return "Staff Member Added Successfully!"
+
+    @instrumented("department.add_patients")
+    def add_patients(self, patients):
+        """
+        Add many patients at once, skipping IDs already present and, in a
+        compact department, ages its columns cannot hold (see columns.py).
+        Used by bulk imports; returns the number added.
+        Holds the write lock for the whole call, so keep batches modest.
+        """
+        added = 0
+
+        with self.lock.write():
+            events = self.events
+            for patient in patients:
+                if patient.id in self.patients:
+                    continue
+                try:
+                    self.patients[patient.id] = patient
+                except ValueError:
+                    continue
+                add_sorted_id(self._patient_ids, patient.id)
+                added += 1
+                if events is not None:
+                    events.publish(PatientAdded(self, patient))
+
+        return added
+
+    @instrumented("department.add_staff_members")
+    def add_staff_members(self, staff_members):
+        """
+        Add many staff members at once, skipping IDs already present and,
+        in a compact department, ages its columns cannot hold.
+        Used by bulk imports; returns the number added.
+        Holds the write lock for the whole call, so keep batches modest.
+        """
+        added = 0
+
+        with self.lock.write():
+            events = self.events
+            for staff_member in staff_members:
+                if staff_member.id in self.staff_members:
+                    continue
+                try:
+                    self.staff_members[staff_member.id] = staff_member
+                except ValueError:
+                    continue
+                staff_member.department = self.name
+                add_sorted_id(self._staff_ids, staff_member.id)
+                added += 1
+                if events is not None:
+                    events.publish(StaffAdded(self, staff_member))
+
+        return added
+
+    # ===============================
+    # Listings
+    # ===============================
+
+    def iter_patients(self, cursor=None, limit=50, order_by="id"):
+        """
+        Return a Page of this department's patients (see cursors.py).
+        Pass page.cursor back in to get the next page.
+        """
+        return self._page(self.patients, self._patient_ids, PATIENT_ORDERS, cursor, limit, order_by)
+
+    def iter_staff(self, cursor=None, limit=50, order_by="id"):
+        """
+        Return a Page of this department's staff members (see cursors.py).
+        """
+        return self._page(self.staff_members, self._staff_ids, STAFF_ORDERS, cursor, limit, order_by)
+
+    def patients_after(self, after_id):
+        """
+        Yield patients with IDs above after_id, in ID order.
+        Callers hold the lock while they iterate.
+        """
+        for patient_id in ids_after(self._patient_ids, after_id):
+            yield self.patients[patient_id]
+
+    def staff_after(self, after_id):
+        """
+        Yield staff members with IDs above after_id, in ID order.
+        """
+        for staff_id in ids_after(self._staff_ids, after_id):
+            yield self.staff_members[staff_id]
+
+    def _page(self, people, ids, orders, cursor, limit, order_by):
+
+        key = order_key(orders, order_by)
+        after = decode_cursor(cursor, order_by)
+
+        with self.lock.read():
+            if order_by == "id":
+                start = after[0] if after else 0
+                items = [people[i] for i in islice(ids_after(ids, start), limit)]
+            else:
+                items = smallest_after(people.values(), after, limit, key)
+
+        return make_page(items, limit, order_by, key)
@@ -0,0 +1,83 @@
+"""
+Events Module
+-------------
+This module defines the change events published by the hospital system
+and a small event bus to deliver them.
+
+Subscribers (the GUI, indexes, storage, ...) receive one event per
+mutation and can apply just that change instead of rescanning
+every department.
+
+Events:
+- DepartmentAdded
+- DepartmentRemoved
+- PatientAdded
+- StaffAdded
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DepartmentAdded:
+    department: object
+
+
+@dataclass(frozen=True)
+class DepartmentRemoved:
+    department: object
+
+
+@dataclass(frozen=True)
+class PatientAdded:
+    department: object
+    patient: object
+
+
+@dataclass(frozen=True)
+class StaffAdded:
+    department: object
+    staff: object
+
+
+class EventBus:
+    """
+    Delivers events to subscribers, in the order they subscribed.
+
+    A subscriber either listens to one event type or, when no type is
+    given, to every event.
+    """
+
+    def __init__(self):
+        self._handlers = {}   # event type -> callbacks
+        self._catch_all = []  # callbacks for every event
+
+    def subscribe(self, callback, event_type=None):
+        """
+        Register a callback for an event type (or all events).
+        """
+        if event_type is None:
+            self._catch_all.append(callback)
+        else:
+            self._handlers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, callback, event_type=None):
+        """
+        Remove a callback registered with subscribe().
+        """
+        if event_type is None:
+            handlers = self._catch_all
+        else:
+            handlers = self._handlers.get(event_type, [])
+
+        if callback in handlers:
+            handlers.remove(callback)
+
+    def publish(self, event):
+        """
+        Call every subscriber of the event's type, then catch-all ones.
+        """
+        for callback in self._handlers.get(type(event), ()):
+            callback(event)
+        for callback in self._catch_all:
+            callback(event)
@@ -0,0 +1,73 @@
+"""
+IDs Module
+----------
+This module defines IdAllocator, which hands out the unique IDs given
+to patients and staff members.
+
+- next() returns one ID and is safe to call from any thread.
+- reserve(count) hands out a whole block of IDs with one lock round,
+  so bulk importers (or worker processes, given the block by their
+  parent) create people without touching the allocator per record.
+- advance_to(n) resumes from a persisted high-water mark.
+- high_water is a plain read with no lock: the next ID to be handed out.
+
+Person.ids is shared by Patient and Staff by default. Giving each class
+its own allocator puts them in separate ID spaces:
+
+    Patient.ids = IdAllocator()
+    Staff.ids = IdAllocator()
+"""
+
+import threading
+
+
+class IdAllocator:
+    """
+    Thread-safe counter of unique integer IDs.
+    """
+
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    @property
+    def high_water(self) -> int:
+        """
+        The next ID that will be handed out (every ID below it is used
+        or reserved).
+        """
+        return self._next
+
+    def next(self) -> int:
+        """
+        Return a new unique ID.
+        """
+        with self._lock:
+            person_id = self._next
+            self._next += 1
+        return person_id
+
+    def reserve(self, count: int) -> range:
+        """
+        Reserve `count` consecutive IDs and return them as a range.
+        IDs of a block that end up unused are simply skipped.
+        """
+        if count < 0:
+            raise ValueError("count must not be negative")
+
+        with self._lock:
+            start = self._next
+            self._next += count
+        return range(start, start + count)
+
+    def advance_to(self, high_water: int):
+        """
+        Make sure no ID below `high_water` is handed out again.
+        Used when loading saved data; never moves the counter back.
+        """
+        with self._lock:
+            if high_water > self._next:
+                self._next = high_water
+
+    def __repr__(self):
+        return f"IdAllocator(high_water={self._next})"
@@ -0,0 +1,153 @@
+"""
+Locks Module
+------------
+This module defines the locks a Hospital uses to share its data between
+threads (the GUI, background importers, report threads, ...).
+
+- RWLock: many readers at once, or one writer. Turns alternate: new
+  readers queue behind a waiting writer, and only the readers already
+  waiting when a write ends go in before the next writer (readers that
+  arrive during their turn queue for the one after). Neither side
+  starves the other. Both sides are re-entrant per thread, and the writing
+  thread may also read, because event subscribers run inside the write
+  and often query the hospital.
+- NullLock: the same interface doing nothing, for single-threaded use.
+
+    with hospital.lock.read():
+        rows = list(department.patients.values())
+"""
+
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class RWLock:
+    """
+    Phase-fair, re-entrant reader-writer lock.
+    A thread holding only a read lock cannot upgrade it to a write lock.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0          # threads holding a read lock
+        self._writer = None        # ident of the thread holding the write lock
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        self._readers_turn = False  # readers waiting at the last write go next
+        self._released = 0         # of those, the ones not yet in
+        self._phase = 0            # writes ended so far
+        self._local = threading.local()
+
+    # ===============================
+    # Read
+    # ===============================
+
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, "reads", 0)
+
+        # Nested read, or a read by the writing thread: nothing to wait for
+        if depth or self._writer == threading.get_ident():
+            local.reads = depth + 1
+            if not depth:
+                local.counted = False
+            return
+
+        with self._condition:
+            # Behind a waiting writer, only the end of a write lets us in
+            phase = self._phase
+            self._waiting_readers += 1
+            try:
+                while self._writer is not None or (self._waiting_writers and self._phase == phase):
+                    self._condition.wait()
+            finally:
+                self._waiting_readers -= 1
+                if self._phase != phase:
+                    self._released -= 1
+                    if not self._released:
+                        self._readers_turn = False
+                        self._condition.notify_all()
+            self._readers += 1
+
+        local.reads = 1
+        local.counted = True
+
+    def release_read(self):
+        local = self._local
+        local.reads -= 1
+        if local.reads or not local.counted:
+            return
+
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    # ===============================
+    # Write
+    # ===============================
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("Cannot take the write lock while holding a read lock")
+
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._readers_turn:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+
+        with self._condition:
+            self._writer = None
+            self._phase += 1
+            self._released = self._waiting_readers
+            self._readers_turn = self._released > 0
+            self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class NullLock:
+    """
+    Lock with the RWLock interface that never blocks.
+    """
+
+    _context = nullcontext()
+
+    def read(self):
+        return self._context
+
+    def write(self):
+        return self._context
+
+
+NULL_LOCK = NullLock()
@@ -1,6 +1,9 @@
 from Core.hospital import Hospital
+from Core.storage import HospitalStore
 from Models.department import Department
+from Models.metrics import metrics
 from Models.patient import Patient
+from Models.records import RecordStore
 from Models.staff import Staff
 
 
@@ -10,8 +13,35 @@ for the Hospital Management System.؛ to make it more easier for the user to nav
 2) Department Menu
 3) Patient Menu
 4) Staff Menu
+5) Diagnostics Menu
 
 '''
+# Paged listing
+def show_pages(fetch, show, page_size=20):
+    """
+    Print a listing one page at a time.
+
+    fetch(cursor, limit) returns a Page (see Models/cursors.py),
+    e.g. hospital.iter_patients. Returns False if there was nothing to show.
+    """
+    cursor = None
+    shown = False
+
+    while True:
+        page = fetch(cursor, page_size)
+
+        for item in page.items:
+            show(item)
+        shown = shown or bool(page.items)
+
+        if page.cursor is None:
+            return shown
+
+        cursor = page.cursor
+        if input("Enter for more, q to stop: ").strip().lower() == "q":
+            return shown
+
+
 # Department Menu
 def department_menu(hospital):
 
@@ -29,11 +59,8 @@ def department_menu(hospital):
             print(hospital.add_department(dept))
 
         elif choice == "2":
-            if not hospital.departments:
+            if not show_pages(hospital.iter_departments, print):
                 print("No departments yet.")
-            else:
-                for dept in hospital.departments.values():
-                    print(dept)
 
         elif choice == "3":
             break
@@ -50,7 +77,10 @@ def patient_menu(hospital):
         print("\n===== Patient Menu =====")
         print("1. Add Patient")
         print("2. View Patients in Department")
-        print("3. Back")
+        print("3. Find Patient by ID")
+        print("4. Search Patients by Name")
+        print("5. Search Medical Records")
+        print("6. Back")
 
         choice = input("Choose: ")
 
@@ -77,13 +107,45 @@ def patient_menu(hospital):
                 print("Department not found.")
                 continue
 
-            if not dept.patients:
+            shown = show_pages(
+                dept.iter_patients,
+                lambda p: print(f"{p.id} | {p.name} | {p.medical_record}")
+            )
+            if not shown:
                 print("No patients in this department.")
-            else:
-                for p in dept.patients.values():
-                    print(f"{p.id} | {p.name} | {p.medical_record}")
 
         elif choice == "3":
+            patient_id = int(input("Patient ID: "))
+            found = hospital.find_patient(patient_id)
+
+            if not found:
+                print("Patient not found.")
+                continue
+
+            p, dept = found
+            print(f"{p.id} | {p.name} | {p.age} | {dept.name} | {p.medical_record}")
+
+        elif choice == "4":
+            query = input("Name: ")
+            results = hospital.search_people(query, kind="patient", limit=20)
+
+            if not results:
+                print("No matching patients.")
+            else:
+                for p, dept in results:
+                    print(f"{p.id} | {p.name} | {dept.name}")
+
+        elif choice == "5":
+            query = input("Search (e.g. diabetes AND insulin OR asthma): ")
+            results = hospital.search_records(query, limit=20)
+
+            if not results:
+                print("No matching records.")
+            else:
+                for p, dept in results:
+                    print(f"{p.id} | {p.name} | {dept.name} | {p.medical_record}")
+
+        elif choice == "6":
             break
 
         else:
@@ -97,7 +159,9 @@ def staff_menu(hospital):
         print("\n===== Staff Menu =====")
         print("1. Add Staff")
         print("2. View Staff in Department")
-        print("3. Back")
+        print("3. Find Staff by ID")
+        print("4. Search Staff by Name")
+        print("5. Back")
 
         choice = input("Choose: ")
 
@@ -125,13 +189,113 @@ def staff_menu(hospital):
                 print("Department not found.")
                 continue
 
-            if not dept.staff_members:
+            shown = show_pages(
+                dept.iter_staff,
+                lambda s: print(f"{s.id} | {s.name} | {s.role} | {s.salary}")
+            )
+            if not shown:
                 print("No staff in this department.")
+
+        elif choice == "3":
+            staff_id = int(input("Staff ID: "))
+            found = hospital.find_staff(staff_id)
+
+            if not found:
+                print("Staff member not found.")
+                continue
+
+            s, dept = found
+            print(f"{s.id} | {s.name} | {s.role} | {dept.name} | {s.salary}")
+
+        elif choice == "4":
+            query = input("Name: ")
+            results = hospital.search_people(query, kind="staff", limit=20)
+
+            if not results:
+                print("No matching staff.")
             else:
-                for s in dept.staff_members.values():
-                    print(f"{s.id} | {s.name} | {s.role} | {s.salary}")
+                for s, dept in results:
+                    print(f"{s.id} | {s.name} | {s.role} | {dept.name}")
+
+        elif choice == "5":
+            break
+
+        else:
+            print("Invalid choice")
+
+
+# Diagnostics Menu
+_capture = None    # profile capture kept running between menu visits
+
+
+def show_metrics():
+    snapshot = metrics.snapshot()
+    if not snapshot:
+        print("No calls recorded yet.")
+        return
+
+    print(f"{'call':<34}{'count':>9}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'errors':>8}")
+    for name, values in snapshot.items():
+        print(f"{name:<34}{values['count']:>9}{values['mean_seconds'] * 1e6:>10.1f}"
+              f"{values['p50_seconds'] * 1e6:>10.1f}{values['p99_seconds'] * 1e6:>10.1f}{values['errors']:>8}")
+
+
+def diagnostics_menu(hospital):
+
+    global _capture
+
+    while True:
+        print("\n===== Diagnostics Menu =====")
+        print(f"1. {'Disable' if metrics.enabled else 'Enable'} Metrics")
+        print("2. Show Metrics")
+        print("3. Export Metrics")
+        print("4. Start CPU Profile")
+        print("5. Start Memory Capture")
+        print("6. Stop Capture")
+        print("7. Back")
+
+        choice = input("Choose: ")
+
+        if choice == "1":
+            if metrics.enabled:
+                metrics.disable()
+                print("Metrics disabled.")
+            else:
+                metrics.enable()
+                print("Metrics enabled.")
+
+        elif choice == "2":
+            show_metrics()
 
         elif choice == "3":
+            path = input("File (.json or .prom) [metrics.prom]: ").strip() or "metrics.prom"
+            print(f"Metrics written to {metrics.write(path)}")
+
+        elif choice in ("4", "5"):
+            if _capture is not None:
+                print(f"A {_capture.kind} capture is already running.")
+                continue
+
+            # cProfile and tracemalloc are only imported when needed
+            from Core.profiling import ProfileCapture
+            _capture = ProfileCapture("cpu" if choice == "4" else "memory")
+            _capture.start()
+            print(f"{_capture.kind.upper()} capture started. Use the system, then stop it here.")
+
+        elif choice == "6":
+            if _capture is None:
+                print("No capture is running.")
+                continue
+
+            capture, _capture = _capture, None
+            print(capture.stop())
+
+            default = "hospital.prof" if capture.kind == "cpu" else "hospital.tracemalloc"
+            path = input(f"Save to [{default}, - to skip]: ").strip() or default
+            if path != "-":
+                print(f"Capture saved to {capture.save(path)}")
+
+        elif choice == "7":
             break
 
         else:
@@ -142,14 +306,30 @@ def staff_menu(hospital):
 
 def main():
 
+    # Long medical records are kept in a memory-mapped file, not in memory
+    Patient.record_store = RecordStore()
+
     hospital = Hospital("Smart Hospital")
 
+    # Load saved data; every change is then written to disk right away
+    store = HospitalStore("hospital_data", sync_every=1)
+    store.open(hospital)
+
+    try:
+        main_menu(hospital)
+    finally:
+        store.close()
+
+
+def main_menu(hospital):
+
     while True:
         print("\n========== Hospital System ==========")
         print("1. Departments")
         print("2. Patients")
         print("3. Staff")
-        print("4. Exit")
+        print("4. Diagnostics")
+        print("5. Exit")
 
         choice = input("Choose: ")
 
@@ -163,6 +343,9 @@ def main():
             staff_menu(hospital)
 
         elif choice == "4":
+            diagnostics_menu(hospital)
+
+        elif choice == "5":
             print("System closed.")
             break
 
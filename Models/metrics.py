@@ -0,0 +1,231 @@
+"""
+Metrics Module
+--------------
+This module defines the runtime instrumentation for the hospital's hot
+paths: a call counter and a latency histogram per instrumented method.
+
+Methods are marked with @instrumented("hospital.get_summary"). While
+metrics are off (the default) the mark costs nothing: the class keeps
+the plain function. metrics.enable() swaps timing wrappers onto the
+marked methods and metrics.disable() puts the plain functions back, so
+instrumentation can be switched on in a running process.
+
+A snapshot can be exported as JSON or as Prometheus text:
+
+    from Models.metrics import metrics
+    metrics.enable()
+    ...
+    metrics.write("metrics.prom")      # or metrics.json
+"""
+
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+
+
+# Upper bounds of the latency buckets, in seconds (1 us to 10 s)
+BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """
+    Call count, error count and latency distribution of one method.
+    """
+
+    __slots__ = ("counts", "total", "count", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)    # last one is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds, failed=False):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if failed:
+            self.errors += 1
+
+    def quantile(self, q):
+        """
+        Estimated q-quantile: the upper bound of the bucket it falls in.
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """
+    Registry of instrumented methods and their histograms.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._sites = []         # (owner class, attribute, function, metric name)
+        self._histograms = {}    # metric name -> Histogram
+        self._lock = threading.Lock()
+
+    # ===============================
+    # Switching
+    # ===============================
+
+    def register(self, owner, attribute, function, name):
+        self._sites.append((owner, attribute, function, name))
+        if self.enabled:
+            setattr(owner, attribute, self._wrap(function, name))
+
+    def enable(self):
+        if self.enabled:
+            return
+        for owner, attribute, function, name in self._sites:
+            setattr(owner, attribute, self._wrap(function, name))
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for owner, attribute, function, name in self._sites:
+            setattr(owner, attribute, function)
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def _wrap(self, function, name):
+        observe = self.observe
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                observe(name, clock() - start, failed)
+
+        return timed
+
+    # ===============================
+    # Recording
+    # ===============================
+
+    def observe(self, name, seconds, failed=False):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds, failed)
+
+    # ===============================
+    # Export
+    # ===============================
+
+    def snapshot(self):
+        """
+        {metric name: {"count", "errors", "sum_seconds", "mean_seconds",
+                       "p50_seconds", "p99_seconds", "buckets"}}
+        where buckets lists [upper bound, cumulative count] pairs.
+        """
+        with self._lock:
+            histograms = {
+                name: (list(h.counts), h.total, h.count, h.errors, h.quantile(0.5), h.quantile(0.99))
+                for name, h in self._histograms.items()
+            }
+
+        result = {}
+        for name, (counts, total, count, errors, p50, p99) in sorted(histograms.items()):
+            cumulative, buckets = 0, []
+            for bound, bucket in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += bucket
+                buckets.append([bound, cumulative])
+            result[name] = {
+                "count": count,
+                "errors": errors,
+                "sum_seconds": total,
+                "mean_seconds": total / count if count else None,
+                "p50_seconds": p50,
+                "p99_seconds": p99,
+                "buckets": buckets,
+            }
+        return result
+
+    def to_json(self):
+        snapshot = self.snapshot()
+        for values in snapshot.values():
+            values["buckets"][-1][0] = "+Inf"
+        return json.dumps({"enabled": self.enabled, "metrics": snapshot}, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP hospital_call_seconds Latency of instrumented hospital calls.",
+            "# TYPE hospital_call_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for name, values in snapshot.items():
+            for bound, cumulative in values["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'hospital_call_seconds_bucket{{call="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'hospital_call_seconds_sum{{call="{name}"}} {values["sum_seconds"]!r}')
+            lines.append(f'hospital_call_seconds_count{{call="{name}"}} {values["count"]}')
+
+        lines.append("# HELP hospital_call_errors_total Instrumented hospital calls that raised.")
+        lines.append("# TYPE hospital_call_errors_total counter")
+        for name, values in snapshot.items():
+            lines.append(f'hospital_call_errors_total{{call="{name}"}} {values["errors"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, fmt=None):
+        """
+        Write a snapshot to a file: "json", or "prometheus" text.
+        The format defaults to JSON for *.json paths, Prometheus otherwise.
+        """
+        if fmt is None:
+            fmt = "json" if path.endswith(".json") else "prometheus"
+        if fmt not in ("json", "prometheus"):
+            raise ValueError(f"Unknown metrics format: {fmt!r}")
+
+        text = self.to_json() if fmt == "json" else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+
+metrics = Metrics()
+
+
+class instrumented:
+    """
+    Method decorator: count and time calls under `name` while
+    metrics are enabled. The class gets the undecorated function.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.function = None
+
+    def __call__(self, function):
+        self.function = function
+        return self
+
+    def __set_name__(self, owner, attribute):
+        setattr(owner, attribute, self.function)
+        metrics.register(owner, attribute, self.function, self.name)
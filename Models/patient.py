@@ -4,25 +4,73 @@ from .person import Person
 This class represents a patient in the hospital system.
 It inherits from the Person class and extends it by adding
 a medical record specific to the patient.
+
+Medical records are the largest field. When Patient.record_store is set
+(a RecordStore, see records.py), a record longer than its preview is
+written there and the patient keeps only its row in the store and the
+precomputed preview; the text is read back when medical_record is used.
 """
 
+PREVIEW_LENGTH = 50    # characters of a record shown in listings
+
+
+def store_record(record: str):
+    """
+    (held, preview) for a medical record: `held` is the text itself, or
+    its row in Patient.record_store when the text is longer than the preview.
+    """
+    preview = record[:PREVIEW_LENGTH]
+    store = Patient.record_store
+    if store is None or len(record) <= PREVIEW_LENGTH:
+        return record, preview
+    return store.append(record), preview
+
+
+def load_record(held):
+    """
+    The text of a record kept as store_record() returned it.
+    """
+    return held if held.__class__ is str else Patient.record_store[held]
+
+
 class Patient(Person):
 
-    def __init__(self, name: str, age: int, medical_record: str):
+    __slots__ = ("_record", "preview")
+
+    # Where long medical records are kept; None keeps them on the objects.
+    # Set it once at startup, before any patient is created.
+    record_store = None
+
+    def __init__(self, name: str, age: int, medical_record: str, person_id: int = None):
         """
         Initializes a Patient object.
 
         :param name: The name of the patient
         :param age: The age of the patient
         :param medical_record: The medical history and current condition of the patient
+        :param person_id: A reserved or restored ID (allocated when omitted)
         """
         # Call the constructor of the parent class (Person)
         # to initialize common attributes like name and age
-        super().__init__(name, age)
+        super().__init__(name, age, person_id)
 
         # Initialize the patient-specific attribute
         self.medical_record = medical_record
 
+    @property
+    def medical_record(self):
+        return load_record(self._record)
+
+    @medical_record.setter
+    def medical_record(self, record):
+        self._record, self.preview = store_record(record)
+
+    def stored_record(self):
+        """
+        The record as kept in memory: (text or store row, preview).
+        """
+        return self._record, self.preview
+
     def view_record(self):
         """
         Returns the medical record of the patient.
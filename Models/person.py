@@ -5,6 +5,9 @@ This module defines the Person class, which represents a basic individual
 in the system. Each person has a unique ID, a name, and an age.
 """
 
+from .ids import IdAllocator
+
+
 class Person:
     """
     Represents a person with basic personal information.
@@ -15,18 +18,22 @@ class Person:
         age (int): Person's age.
     """
 
-    _id_counter = 1  # Class-level counter to generate unique IDs
+    # No per-instance __dict__; keeps large hospitals small in memory
+    __slots__ = ("id", "name", "age")
+
+    ids = IdAllocator()  # Hands out unique IDs; see ids.py for separate ID spaces
 
-    def __init__(self, name: str, age: int):
+    def __init__(self, name: str, age: int, person_id: int = None):
         """
         Initialize a new Person object.
 
         Args:
             name (str): The person's name.
             age (int): The person's age.
+            person_id (int): An ID already reserved from `ids` or restored
+                from storage. A new ID is allocated when omitted.
         """
-        self.id = Person._id_counter
-        Person._id_counter += 1
+        self.id = self.ids.next() if person_id is None else person_id
 
         self.name = name
         self.age = age
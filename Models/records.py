@@ -0,0 +1,217 @@
+"""
+Records Module
+--------------
+This module defines read access to medical records kept as one block of
+UTF-8 text, so a loaded hospital does not hold every record as a str:
+
+- RecordBlob reads record i from a buffer holding the text of many
+  records back to back, given their offsets. The buffer may be an mmap;
+  then a record is only read from disk when it is accessed.
+- LazyRecords is a PatientColumns records column that reads from a
+  RecordBlob. Records written after loading are kept in memory.
+- LazyPatient is a Patient whose medical_record is read from a
+  RecordBlob.
+- RecordStore is an append-only file of records, read back through a
+  memory map. Set as Patient.record_store, it keeps long records out of
+  memory for every patient created from then on (see patient.py).
+
+Snapshots (Core/snapshot.py) load records this way with lazy_records=True.
+"""
+
+import mmap
+import tempfile
+import threading
+from array import array
+from itertools import accumulate, islice, repeat
+from operator import sub
+
+from .patient import PREVIEW_LENGTH, Patient, store_record
+from .person import Person
+
+
+class RecordBlob:
+    """
+    Records 0..count-1 stored as UTF-8 in buffer[start + offsets[i]:
+    start + offsets[i + 1]].
+    """
+
+    def __init__(self, buffer, offsets, start=0):
+        """
+        :param buffer: bytes, mmap or any other sliceable buffer
+        :param offsets: array of count + 1 offsets into the text
+        :param start: Position of the text in the buffer
+        """
+        self._buffer = buffer
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        start = self._start
+        return str(self._buffer[start + self._offsets[i]:start + self._offsets[i + 1]], "utf-8")
+
+    def read(self, first, count):
+        """
+        Records first..first+count-1 as a list, decoded in one go.
+        """
+        offsets = self._offsets
+        base = offsets[first]
+        data = self._buffer[self._start + base:self._start + offsets[first + count]]
+        bounds = array("q", map(sub, islice(offsets, first, first + count + 1), repeat(base)))
+        spans = map(slice, bounds, islice(bounds, 1, None))
+
+        if data.isascii():
+            # Byte offsets are character offsets: slice the decoded text
+            return list(map(str(data, "ascii").__getitem__, spans))
+        return [str(data[span], "utf-8") for span in spans]
+
+
+class LazyRecords:
+    """
+    Records rows first..first+count-1 of a RecordBlob as a list-like
+    column; rows set or appended later are kept in memory.
+    """
+
+    def __init__(self, blob, first, count):
+        self._blob = blob
+        self._first = first
+        self._count = count
+        self._changed = {}    # row -> record set after loading
+        self._added = []      # records appended after loading
+
+    def __len__(self):
+        return self._count + len(self._added)
+
+    def __getitem__(self, row):
+        if row >= self._count:
+            return self._added[row - self._count]
+
+        record = self._changed.get(row)
+        return self._blob[self._first + row] if record is None else record
+
+    def __setitem__(self, row, record):
+        if row >= self._count:
+            self._added[row - self._count] = record
+        else:
+            self._changed[row] = record
+
+    def append(self, record):
+        self._added.append(record)
+
+
+class LazyPatient(Patient):
+    """
+    Patient whose medical record stays in a RecordBlob until read.
+    """
+
+    __slots__ = ("_blob", "_row")
+
+    def __init__(self, name: str, age: int, blob, row: int, person_id: int = None):
+        # Patient.__init__ would store the record; only the row is kept
+        Person.__init__(self, name, age, person_id)
+        self._blob = blob
+        self._row = row
+
+    @property
+    def medical_record(self):
+        return self._blob[self._row]
+
+    @property
+    def preview(self):
+        return self.medical_record[:PREVIEW_LENGTH]
+
+    def stored_record(self):
+        return store_record(self.medical_record)
+
+
+class RecordStore:
+    """
+    Medical records in a file, read through a memory map.
+
+    append(record) returns the record's row and store[row] reads it back.
+    Only the offsets stay in memory (8 bytes per record). New records are
+    held until about `flush_bytes` have collected, then written together
+    and the file mapped again, so bulk loads are not one write per record
+    and records just added read back without touching the file.
+
+    The file is working space for one run, not saved data: it starts
+    empty, and by default is an anonymous temporary file that disappears
+    when closed. HospitalStore still holds the durable copy.
+    """
+
+    def __init__(self, path: str = None, flush_bytes: int = 1 << 22):
+        """
+        :param path: File to keep the records in (default: a temporary file)
+        :param flush_bytes: Characters of new records held before writing
+        """
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self._file = open(path, "w+b") if path else tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+
+        self._offsets = array("Q", [0])   # one more than the rows written
+        self._map = None
+        self._written = 0                 # rows in the file and the map
+        self._pending = []                # rows written + i, not in the file yet
+        self._pending_size = 0
+
+    def __len__(self):
+        return self._written + len(self._pending)
+
+    def append(self, record: str) -> int:
+        with self._lock:
+            self._pending.append(record)
+            self._pending_size += len(record)
+            row = self._written + len(self._pending) - 1
+            if self._pending_size >= self.flush_bytes:
+                self._flush()
+        return row
+
+    def __getitem__(self, row):
+        if row < self._written:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            if start == end:
+                return ""
+            return str(self._map[start:end], "utf-8")
+
+        with self._lock:
+            if row >= self._written:
+                return self._pending[row - self._written]
+        return self[row]    # written out in the meantime
+
+    def flush(self):
+        """
+        Write the held records to the file.
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+
+        if not self._pending:
+            return
+
+        encoded = [record.encode("utf-8") for record in self._pending]
+        self._file.seek(0, 2)
+        self._file.writelines(encoded)
+        self._file.flush()
+        self._offsets.extend(islice(accumulate(map(len, encoded), initial=self._offsets[-1]), 1, None))
+
+        # Readers may still be slicing the old map; it covers the old rows
+        if self._offsets[-1]:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._written += len(self._pending)
+        self._pending = []
+        self._pending_size = 0
+
+    def close(self):
+        """
+        Close the file. Records can no longer be read.
+        """
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
@@ -18,11 +18,14 @@ class Staff(Person):
     Inherits from Person and adds staff-specific attributes.
     """
 
-    def __init__(self, name: str, age: int, role: str, department: str, salary: float):
+    __slots__ = ("role", "department", "salary")
+
+    def __init__(self, name: str, age: int, role: str, department: str, salary: float,
+                 person_id: int = None):
         """
         Initialize a staff object.
         """
-        super().__init__(name, age)
+        super().__init__(name, age, person_id)
 
         self.role = role
         self.department = department
@@ -0,0 +1,121 @@
+"""
+Analytics Benchmark
+-------------------
+Times Core.vectorized.report() against the same report computed with
+plain Python loops, checks that both agree, and prints the speed-up.
+
+    python -m benchmarks.bench_analytics --patients 100000 1000000
+    python -m benchmarks.bench_analytics --compact
+"""
+
+import argparse
+import math
+import time
+from bisect import bisect_right
+
+from Core.vectorized import PERCENTILES, report
+from benchmarks.data import make_hospital
+
+
+# ===============================
+# Pure-Python Report
+# ===============================
+
+def python_stats(groups, percentiles=PERCENTILES):
+    """
+    grouped_stats() over {label: [values]}, one group at a time.
+    """
+    results = {}
+    for label, values in groups.items():
+        values = sorted(values)
+        count = len(values)
+        row = {"count": count, "sum": math.fsum(values), "min": values[0], "max": values[-1]}
+        row["mean"] = row["sum"] / count
+        for p in percentiles:
+            position = (count - 1) * p / 100.0
+            below = int(position)
+            above = min(below + 1, count - 1)
+            row[f"p{p}"] = values[below] + (values[above] - values[below]) * (position - below)
+        results[label] = row
+    return results
+
+
+def python_report(hospital, age_width=10, percentiles=PERCENTILES):
+
+    by_department, by_role, by_pair, ages, staff_ages = {}, {}, {}, {}, {}
+    edges = list(range(0, 120 + age_width, age_width))
+    histogram = {}
+
+    with hospital.lock.read():
+        for department in hospital.departments.values():
+            name = department.name
+            for s in department.staff_members.values():
+                by_department.setdefault(name, []).append(s.salary)
+                by_role.setdefault(s.role, []).append(s.salary)
+                by_pair.setdefault((name, s.role), []).append(s.salary)
+                staff_ages.setdefault(s.role, []).append(s.age)
+            for p in department.patients.values():
+                ages.setdefault(name, []).append(p.age)
+                counts = histogram.setdefault(name, [0] * (len(edges) - 1))
+                counts[min(max(bisect_right(edges, p.age) - 1, 0), len(counts) - 1)] += 1
+
+    return {
+        "salary_by_department": python_stats(by_department, percentiles),
+        "salary_by_role": python_stats(by_role, percentiles),
+        "salary_by_department_role": python_stats(by_pair, percentiles),
+        "patient_age_by_department": python_stats(ages, percentiles),
+        "staff_age_by_role": python_stats(staff_ages, percentiles),
+        "age_edges": edges,
+        "patient_age_histogram": histogram,
+    }
+
+
+def check(expected, got):
+    """
+    Raise AssertionError where the two reports disagree.
+    """
+    for section, groups in expected.items():
+        if section in ("age_edges", "patient_age_histogram"):
+            assert groups == got[section], section
+            continue
+
+        assert groups.keys() == got[section].keys(), section
+        for label, row in groups.items():
+            for key, value in row.items():
+                assert math.isclose(value, got[section][label][key], rel_tol=1e-9), (section, label, key)
+
+
+# ===============================
+# Runner
+# ===============================
+
+def timed(fn, *args, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--compact", action="store_true", help="use column-store departments")
+    args = parser.parse_args(argv)
+
+    print(f"{'patients':>10}{'staff':>10}{'python ms':>12}{'numpy ms':>11}{'speed-up':>10}")
+    for count in args.patients:
+        hospital = make_hospital(count, compact=args.compact)
+        expected, python_time = timed(python_report, hospital)
+        got, numpy_time = timed(report, hospital)
+        check(expected, got)
+
+        staff = hospital.get_summary()["total_staff"]
+        print(f"{count:>10,}{staff:>10,}{python_time * 1000:>12.1f}{numpy_time * 1000:>11.1f}"
+              f"{python_time / numpy_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
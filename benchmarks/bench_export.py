@@ -0,0 +1,50 @@
+"""
+Export Benchmark
+----------------
+Measures Core.exporter throughput and peak memory for every format.
+
+    python -m benchmarks.bench_export --patients 200000
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from Core.exporter import export
+from benchmarks.data import make_hospital
+
+
+FORMATS = [
+    ("csv", False), ("csv", True),
+    ("jsonl", False), ("jsonl", True),
+    ("hcol", False), ("hcol", True),
+]
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    hospital = make_hospital(args.patients)
+    print(f"{'format':<12}{'rows':>10}{'rows/s':>12}{'MB':>9}{'peak KB':>10}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt, compress in FORMATS:
+            gz = ".gz" if compress and fmt != "hcol" else ""
+            path = os.path.join(folder, f"patients.{fmt}{gz}")
+
+            tracemalloc.start()
+            count, elapsed = export(hospital, path, "patients", fmt=fmt, compress=compress)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            label = fmt + (" (z)" if compress else "")
+            size = os.path.getsize(path) / 1e6
+            print(f"{label:<12}{count:>10,}{count / elapsed:>12,.0f}{size:>9.1f}{peak / 1024:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
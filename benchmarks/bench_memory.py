@@ -0,0 +1,112 @@
+"""
+Memory Benchmark
+----------------
+Measures bytes per record for the ways a department can hold people:
+
+- dict:    plain objects with a __dict__, keyed by "P{id}" strings
+           (how Department stored patients before slots and int keys)
+- slots:   slotted Patient / Staff objects keyed by int id (the default)
+- compact: Department(name, compact=True) column store
+- stored, compact+stored: the same with Patient.record_store set, so
+  records longer than their preview live in a memory-mapped file
+
+Only the departments are measured, not the hospital's search indexes.
+--record-chars pads the synthetic medical records (about 60 characters)
+to a more realistic length by repeating them.
+
+    python -m benchmarks.bench_memory --patients 200000
+    python -m benchmarks.bench_memory --record-chars 1000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from Models.department import Department
+from Models.patient import Patient
+from Models.records import RecordStore
+from Models.staff import Staff
+from benchmarks.data import iter_patients, iter_staff
+
+
+class DictPatient(Patient):
+    # No __slots__: instances get a __dict__ like the original classes
+    pass
+
+
+class DictStaff(Staff):
+    pass
+
+
+def _fill_dict(dept, patients, staff):
+    for p in patients:
+        dept.patients[f"P{p.id}"] = DictPatient(p.name, p.age, p.medical_record)
+    for s in staff:
+        dept.staff_members[f"S{s.id}"] = DictStaff(s.name, s.age, s.role, dept.name, s.salary)
+
+
+def _fill(dept, patients, staff):
+    dept.add_patients(patients)
+    dept.add_staff_members(staff)
+
+
+MODES = [
+    ("dict", False, False, _fill_dict),
+    ("slots", False, False, _fill),
+    ("compact", True, False, _fill),
+    ("stored", False, True, _fill),
+    ("compact+stored", True, True, _fill),
+]
+
+
+def padded_patients(count, record_chars):
+    for p in iter_patients(count):
+        record = p.medical_record
+        if len(record) < record_chars:
+            record = (record + " ") * (record_chars // (len(record) + 1) + 1)
+        yield Patient(p.name, p.age, record[:max(record_chars, len(p.medical_record))], p.id)
+
+
+def measure(patients, staff, compact, stored, fill, record_chars=0):
+    """
+    Return (patient bytes per record, staff bytes per record).
+    """
+    results = []
+    for count, kind in ((patients, "patients"), (staff, "staff")):
+        gc.collect()
+        tracemalloc.start()
+        if stored:
+            Patient.record_store = RecordStore()
+        dept = Department("Benchmark", compact)
+        if kind == "patients":
+            fill(dept, padded_patients(count, record_chars), ())
+        else:
+            fill(dept, (), iter_staff(count))
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results.append(used / count if count else 0.0)
+        del dept
+        if stored:
+            Patient.record_store.close()
+            Patient.record_store = None
+    return results
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--staff", type=int, default=None, help="default: a tenth of the patients")
+    parser.add_argument("--record-chars", type=int, default=0, help="pad medical records to this length")
+    args = parser.parse_args(argv)
+    staff = args.staff if args.staff is not None else args.patients // 10
+
+    print(f"{'mode':<16}{'patient B/rec':>15}{'staff B/rec':>13}")
+    for label, compact, stored, fill in MODES:
+        patient_bytes, staff_bytes = measure(args.patients, staff, compact, stored, fill, args.record_chars)
+        print(f"{label:<16}{patient_bytes:>15,.0f}{staff_bytes:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
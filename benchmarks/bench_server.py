@@ -0,0 +1,137 @@
+"""
+Server Benchmark
+----------------
+Load generator for Core.server. Starts a server process over a
+synthetic hospital, then opens keep-alive connections that send a mix of
+requests (optionally pipelined) and reports latency percentiles and
+requests per second.
+
+    python -m benchmarks.bench_server --patients 100000 --connections 16 --seconds 10
+    python -m benchmarks.bench_server --pipeline 8
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+
+from benchmarks.data import DEPARTMENTS
+
+
+def run_server(patients, port, ready):
+
+    from Core.server import HospitalServer
+    from benchmarks.data import make_hospital
+
+    hospital = make_hospital(patients, thread_safe=True)
+
+    async def serve():
+        server = await HospitalServer(hospital, port=port).start()
+        ready.put(server.port)
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def make_request(rng, max_id):
+    """
+    One request from the mix: mostly reads, some writes.
+    """
+    choice = rng.random()
+    if choice < 0.35:
+        path = f"/patients/{rng.randint(1, max_id)}"
+        return f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    if choice < 0.60:
+        after_id = rng.randint(0, max_id)
+        return f"GET /patients?after_id={after_id}&limit=50 HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    if choice < 0.75:
+        name = rng.choice(["john", "mary", "jhon smith", "garcia", "ahmed"])
+        return f"GET /patients/search?q={name.replace(' ', '+')} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    if choice < 0.85:
+        return b"GET /summary HTTP/1.1\r\nHost: bench\r\n\r\n"
+
+    body = (
+        '{"department": "%s", "name": "Bench Patient", "age": %d, "medical_record": "follow-up"}'
+        % (rng.choice(DEPARTMENTS), rng.randint(0, 100))
+    ).encode()
+    head = (f"POST /patients HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode()
+    return head + body
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, number, deadline, pipeline, max_id, latencies, errors):
+
+    rng = random.Random(number)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    while time.perf_counter() < deadline:
+        requests = [make_request(rng, max_id) for _ in range(pipeline)]
+        start = time.perf_counter()
+        writer.write(b"".join(requests))
+        for _ in requests:
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 500 or status == 400:
+                errors.append(status)
+
+    writer.close()
+
+
+async def load(port, connections, seconds, pipeline, max_id):
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, i, deadline, pipeline, max_id, latencies, errors)
+        for i in range(connections)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--pipeline", type=int, default=1, help="requests in flight per connection")
+    args = parser.parse_args(argv)
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_server, args=(args.patients, 0, ready), daemon=True)
+    server.start()
+    port = ready.get(timeout=600)
+
+    try:
+        latencies, errors, elapsed = asyncio.run(
+            load(port, args.connections, args.seconds, args.pipeline, args.patients)
+        )
+    finally:
+        server.terminate()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"connections : {args.connections} (pipeline {args.pipeline})")
+    print(f"requests    : {count:,} in {elapsed:.1f}s ({count / elapsed:,.0f} req/s)")
+    print(f"latency p50 : {latencies[count // 2] * 1000:.2f} ms")
+    print(f"latency p99 : {latencies[int(count * 0.99)] * 1000:.2f} ms")
+    print(f"errors      : {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Snapshot Benchmark
+------------------
+Measures Core.snapshot: the time to save a synthetic hospital and to
+load it back in each read mode (read or memory-mapped file, eager or
+lazy medical records), best of --repeat loads. Then, once, the first
+name search after a load, which builds the deferred indexes.
+
+With --store the same hospital is also saved through HospitalStore and
+loaded from its JSON snapshot, for comparison.
+
+    python -m benchmarks.bench_snapshot --patients 1000000
+    python -m benchmarks.bench_snapshot --patients 100000 --dicts --store
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from Core.hospital import Hospital
+from Core.snapshot import load_snapshot, save_snapshot
+from Core.storage import HospitalStore
+from benchmarks.data import make_hospital
+
+
+MODES = [
+    ("read", False, False), ("read, lazy", False, True),
+    ("mmap", True, False), ("mmap, lazy", True, True),
+]
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def store_load(hospital, folder):
+    """
+    Seconds to load `hospital` back from a compacted HospitalStore.
+    """
+    directory = os.path.join(folder, "hospital_data")
+    store = HospitalStore(directory, sync_every=100000)
+    store.attach(hospital)
+    store.compact()
+    store.close()
+
+    return timed(HospitalStore(directory).load, Hospital("Benchmark Hospital"))[1]
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="loads per mode; the best is kept")
+    parser.add_argument("--dicts", action="store_true", help="dict departments instead of compact ones")
+    parser.add_argument("--store", action="store_true", help="also time a HospitalStore (JSON) load")
+    args = parser.parse_args(argv)
+
+    hospital = make_hospital(args.patients, compact=not args.dicts)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "hospital.hsnap")
+        size, elapsed = timed(save_snapshot, hospital, path)
+        print(f"save{'':<14}{elapsed * 1000:>9.1f} ms   {size / 1e6:.1f} MB")
+
+        for label, memory_map, lazy in MODES:
+            best = min(
+                timed(load_snapshot, path, memory_map=memory_map, lazy_records=lazy)[1]
+                for _ in range(args.repeat)
+            )
+            print(f"load {label:<13}{best * 1000:>9.1f} ms")
+
+        loaded = load_snapshot(path, memory_map=True, lazy_records=True)
+        elapsed = timed(loaded.search_people, "Mary Smith", "patient")[1]
+        print(f"first search{'':<6}{elapsed * 1000:>9.1f} ms   (builds the indexes)")
+        del loaded
+
+        if args.store:
+            print(f"HospitalStore load{store_load(hospital, folder) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Startup Benchmark
+-----------------
+Measures how long the two entry points take to become usable:
+
+- imports: `python -X importtime` totals for main.py and GUI/APP.py,
+  with the slowest modules by self time,
+- console: process start to the first "Choose an option" prompt,
+- GUI: process start to the first paint of the main window under the
+  offscreen Qt platform, split into imports, construction and paint.
+
+Each run starts a fresh interpreter; the best of --repeat runs is kept.
+With --records the saved data the entry points load is a synthetic
+hospital of that size, so loading is part of startup.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --records 100000 --repeat 3
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from Core.hospital import Hospital
+from Core.storage import HospitalStore
+from benchmarks.data import make_hospital
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_DIR = os.path.join(ROOT, "GUI")
+
+
+def environment():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, GUI_DIR, env.get("PYTHONPATH")]))
+    return env
+
+
+def make_data(directory, records):
+    """
+    Save a synthetic hospital of `records` patients into `directory`.
+    """
+    hospital = Hospital("Smart Hospital")
+    store = HospitalStore(directory, sync_every=100000)
+    store.open(hospital)
+    source = make_hospital(records)
+    for dept in list(source.departments.values()):
+        source.remove_department(dept.name)
+        hospital.add_department(dept)
+    store.close()
+
+
+# ===============================
+# Imports
+# ===============================
+
+def import_times(module):
+    """
+    (total seconds, [(self seconds, module name)]) of `import module`.
+    """
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=environment(), capture_output=True, text=True
+    )
+    if done.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{done.stderr}")
+
+    total, modules = 0.0, []
+    for line in done.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(own) / 1e6, name.strip()))
+        if name.strip() == module:
+            total = int(cumulative) / 1e6
+    modules.sort(reverse=True)
+    return total, modules
+
+
+# ===============================
+# Console
+# ===============================
+
+def console_startup(data_dir):
+    """
+    Seconds from process start to the main menu prompt of main.py,
+    run in `data_dir` (main.py keeps its data in ./hospital_data).
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, "main.py")],
+        cwd=data_dir, env=environment(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    output = b""
+    while b"Choose an option" not in output:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError("main.py exited:\n" + process.stderr.read().decode())
+        output += chunk
+    elapsed = time.perf_counter() - start
+
+    process.communicate(b"6\n")
+    return elapsed
+
+
+# ===============================
+# GUI
+# ===============================
+
+def gui_child(data_dir):
+    """
+    Runs in the child process: print the startup phases as JSON.
+    """
+    start = time.perf_counter()
+    from PySide6.QtCore import QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+    import APP
+    imported = time.perf_counter()
+
+    app = QApplication([])
+    window = APP.HospitalGUI(data_dir=data_dir)
+    constructed = time.perf_counter()
+
+    painted = []
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint and not painted:
+                painted.append(time.perf_counter())
+                app.quit()
+            return False
+
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    app.exec()
+
+    print(json.dumps({
+        "imports": imported - start,
+        "construct": constructed - imported,
+        "paint": painted[0] - constructed,
+    }), flush=True)
+    window.close()
+
+
+def gui_startup(data_dir):
+    """
+    Seconds from process start to the first paint, with the phases
+    measured inside the child.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", data_dir],
+        cwd=ROOT, env=environment(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    _, errors = process.communicate()
+    if not line:
+        raise RuntimeError(f"GUI startup failed:\n{errors}")
+
+    phases = json.loads(line)
+    phases["total"] = elapsed
+    return phases
+
+
+def best(runs):
+    """
+    Per-key minimum of a list of {phase: seconds} dicts.
+    """
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=0, help="patients in the saved data")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is kept")
+    parser.add_argument("--top", type=int, default=8, help="slowest modules to list")
+    parser.add_argument("--child", metavar="DATA_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        gui_child(args.child)
+        return 0
+
+    folder = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        data_dir = os.path.join(folder, "hospital_data")
+        if args.records:
+            make_data(data_dir, args.records)
+        # Look for PySide6 without importing it into this process
+        has_gui = importlib.util.find_spec("PySide6") is not None
+
+        for module in ["main"] + (["APP"] if has_gui else []):
+            runs = [import_times(module) for _ in range(args.repeat)]
+            total, modules = min(runs)
+            print(f"import {module:<6}{total * 1000:>9.1f} ms   slowest (self):")
+            for own, name in modules[:args.top]:
+                print(f"{'':>20}{own * 1000:>8.1f} ms  {name}")
+
+        console = min(console_startup(folder) for _ in range(args.repeat))
+        print(f"\nconsole to first prompt   {console * 1000:>8.1f} ms")
+
+        if not has_gui:
+            print("GUI                       skipped (PySide6 not installed)")
+            return 0
+
+        gui = best([gui_startup(data_dir) for _ in range(args.repeat)])
+        print(f"GUI to first paint        {gui['total'] * 1000:>8.1f} ms")
+        for phase in ("imports", "construct", "paint"):
+            print(f"{'':>4}{phase:<22}{gui[phase] * 1000:>8.1f} ms")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
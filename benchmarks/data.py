@@ -0,0 +1,97 @@
+"""
+Synthetic Data
+--------------
+This module builds reproducible hospitals of any size for the benchmarks.
+
+The same seed always gives the same departments, names, ages, roles,
+salaries and medical records.
+"""
+
+import random
+
+from Core.hospital import Hospital
+from Models.department import Department
+from Models.patient import Patient
+from Models.staff import Staff
+
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Ahmed", "Fatima", "Omar", "Layla",
+    "Yusuf", "Mariam", "Hassan", "Nour", "Ali", "Sara", "Wei", "Mei",
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Al-Sayed", "Haddad", "Khalil",
+    "Nasser", "Saleh", "Mansour", "Zaki", "Farouk", "Chen", "Wang", "Kim", "Nguyen",
+]
+
+DEPARTMENTS = [
+    "Cardiology", "Neurology", "Oncology", "Pediatrics", "Orthopedics", "Emergency",
+    "Radiology", "Dermatology", "Psychiatry", "Urology", "Nephrology", "Gastroenterology",
+    "Pulmonology", "Endocrinology", "Rheumatology", "Ophthalmology", "Surgery",
+    "Obstetrics", "Hematology", "Geriatrics",
+]
+
+ROLES = ["Doctor", "Nurse", "Admin", "Technician", "Surgeon", "Pharmacist"]
+
+CONDITIONS = [
+    "diabetes", "hypertension", "asthma", "fracture", "migraine", "influenza",
+    "pneumonia", "arrhythmia", "anemia", "arthritis", "allergy", "infection",
+    "insulin", "chronic", "acute", "stable", "follow-up", "surgery", "recovery",
+]
+
+
+def make_departments(count, seed=0, compact=False):
+    """
+    Return `count` empty Department objects with distinct names.
+    """
+    names = DEPARTMENTS + [f"Ward {i}" for i in range(max(0, count - len(DEPARTMENTS)))]
+    return [Department(name, compact) for name in names[:count]]
+
+
+def iter_patients(count, seed=0):
+    """
+    Yield `count` synthetic Patient objects.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        record = " ".join(rng.choices(CONDITIONS, k=rng.randint(3, 12)))
+        yield Patient(name, rng.randint(0, 100), record)
+
+
+def iter_staff(count, seed=0):
+    """
+    Yield `count` synthetic Staff objects (department is set on add).
+    """
+    rng = random.Random(seed + 1)
+    for _ in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        salary = round(rng.uniform(30000, 250000), 2)
+        yield Staff(name, rng.randint(22, 70), rng.choice(ROLES), "", salary)
+
+
+def make_hospital(patients, staff=None, departments=20, seed=0, compact=False, thread_safe=False):
+    """
+    Build a Hospital with the given number of patients and staff
+    (staff defaults to a tenth of the patients), spread round-robin
+    over the departments. `compact` uses column-store departments.
+    """
+    if staff is None:
+        staff = patients // 10
+
+    hospital = Hospital("Benchmark Hospital", thread_safe=thread_safe)
+    depts = make_departments(departments, seed, compact)
+    for dept in depts:
+        hospital.add_department(dept)
+
+    for i, patient in enumerate(iter_patients(patients, seed)):
+        depts[i % len(depts)].add_patient(patient)
+    for i, member in enumerate(iter_staff(staff, seed)):
+        depts[i % len(depts)].add_staff(member)
+
+    return hospital
@@ -0,0 +1,206 @@
+"""
+Concurrency Stress Test
+-----------------------
+Shares one thread-safe Hospital between writer and reader threads and
+checks that its invariants hold throughout:
+
+- writers add patients and staff to random departments, and now and
+  then add and remove a scratch department,
+- readers page through listings, look people up, search, export rows
+  and read the running summary; each reader also checks the summary
+  against a full recount once, at a staggered point of the run (a
+  recount holds the read lock for a whole scan, so doing it on every
+  read would starve the writers).
+
+At the end every record written must be found exactly once, the summary
+must match a recount, and the writers must have reached --min-write-rate,
+so a run where they were starved fails.
+
+    python -m benchmarks.stress_concurrency --writers 4 --readers 8 --seconds 10
+"""
+
+import argparse
+import math
+import random
+import threading
+import time
+
+from Core.exporter import iter_rows
+from Core.hospital import Hospital
+from Models.department import Department
+from benchmarks.data import DEPARTMENTS, iter_patients, iter_staff
+
+
+def writer(hospital, number, stop, added, errors):
+
+    rng = random.Random(number)
+    patients = iter_patients(10 ** 9, seed=number)
+    staff = iter_staff(10 ** 9, seed=number)
+    scratch = f"Scratch {number}"
+    mine = []
+
+    try:
+        while not stop.is_set():
+            dept = hospital.get_department(rng.choice(DEPARTMENTS))
+            if rng.random() < 0.9:
+                patient = next(patients)
+                dept.add_patient(patient)
+                mine.append(("patient", patient.id))
+            else:
+                member = next(staff)
+                dept.add_staff(member)
+                mine.append(("staff", member.id))
+
+            if rng.random() < 0.01:
+                hospital.add_department(Department(scratch))
+                hospital.get_department(scratch).add_patient(next(patients))
+                hospital.remove_department(scratch)
+    except Exception as e:
+        errors.append(f"writer {number}: {e!r}")
+
+    added.extend(mine)
+
+
+def reader(hospital, number, stop, verify_at, counts, errors):
+
+    rng = random.Random(-number)
+    done = 0
+
+    try:
+        while not stop.is_set():
+            if verify_at is not None and time.perf_counter() >= verify_at:
+                check_summary(hospital)
+                verify_at = None
+
+            choice = rng.randrange(6)
+
+            if choice == 0:
+                after_id = 0
+                for _ in range(5):
+                    rows = hospital.page_patients(after_id=after_id, limit=100)
+                    ids = [p.id for p, dept in rows]
+                    if ids != sorted(ids) or any(i <= after_id for i in ids):
+                        raise AssertionError("page out of order")
+                    if not rows:
+                        break
+                    after_id = ids[-1]
+
+            elif choice == 1:
+                for p, dept in hospital.page_staff(role="Nurse", limit=100):
+                    if p.role != "Nurse":
+                        raise AssertionError("role filter broken")
+
+            elif choice == 2:
+                found = hospital.find_patient(rng.randrange(1, 10 ** 5))
+                if found is not None and found[0].id not in found[1].patients:
+                    raise AssertionError("found patient in the wrong department")
+
+            elif choice == 3:
+                hospital.search_people("jhon smith", limit=20)
+                hospital.search_records("diabetes insulin", limit=20)
+
+            elif choice == 4:
+                for row in iter_rows(hospital, "staff", departments=[rng.choice(DEPARTMENTS)]):
+                    pass
+
+            else:
+                summary = hospital.get_summary()
+                if summary["total_patients"] < 0 or summary["total_staff"] < 0:
+                    raise AssertionError("negative totals")
+
+            done += 1
+    except Exception as e:
+        errors.append(f"reader {number}: {e!r}")
+
+    counts.append(done)
+
+
+def check_summary(hospital):
+    """
+    Compare the running summary with a full recount, both taken under
+    one read lock so no write falls between them.
+    """
+    with hospital.lock.read():
+        summary = hospital.get_summary()
+        expected = hospital.recompute_summary()
+
+    for key, value in expected.items():
+        if key == "total_payroll":
+            matches = math.isclose(summary[key], value, abs_tol=0.01)
+        else:
+            matches = summary[key] == value
+        if not matches:
+            raise AssertionError(f"Summary '{key}' is {summary[key]!r}, expected {value!r}")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--min-write-rate", type=float, default=200.0,
+                        help="writes per second below which the run fails (writer starvation)")
+    parser.add_argument("--unsafe", action="store_true", help="run without locking, to see what breaks")
+    args = parser.parse_args(argv)
+
+    hospital = Hospital("Stress Hospital", thread_safe=not args.unsafe)
+    for name in DEPARTMENTS:
+        hospital.add_department(Department(name))
+
+    stop = threading.Event()
+    added, counts, errors = [], [], []
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=writer, args=(hospital, i, stop, added, errors))
+        for i in range(args.writers)
+    ] + [
+        threading.Thread(target=reader, args=(
+            hospital, i, stop, start + args.seconds * (i + 1) / (args.readers + 1), counts, errors
+        ))
+        for i in range(args.readers)
+    ]
+
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    # Every record written must be there exactly once
+    ids = [("patient", p.id) for p, dept in _all(hospital.page_patients)]
+    ids += [("staff", s.id) for s, dept in _all(hospital.page_staff)]
+    if sorted(ids) != sorted(added):
+        errors.append(f"{len(added)} records written, {len(ids)} found")
+    if len(set(ids)) != len(ids):
+        errors.append("duplicate IDs")
+
+    try:
+        check_summary(hospital)
+    except AssertionError as e:
+        errors.append(f"final summary: {e}")
+    if len(added) < args.min_write_rate * args.seconds:
+        errors.append(f"writers starved: {len(added)} writes, expected at least "
+                      f"{args.min_write_rate * args.seconds:,.0f}")
+
+    print(f"writes : {len(added):,} ({len(added) / args.seconds:,.0f}/s)")
+    print(f"reads  : {sum(counts):,} ({sum(counts) / args.seconds:,.0f}/s)")
+    for error in errors:
+        print("ERROR", error)
+    print("FAILED" if errors else "OK")
+    return 1 if errors else 0
+
+
+def _all(page):
+    after_id = 0
+    while True:
+        rows = page(after_id=after_id, limit=10000)
+        if not rows:
+            return
+        yield from rows
+        after_id = rows[-1][0].id
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,475 @@
+"""
+Benchmark Suite
+---------------
+Times the core model and hospital operations on synthetic hospitals of
+1k to 1M records, and compares the results with a saved baseline.
+
+Each (case, size) runs in a fresh child process, so peak RSS belongs to
+that case alone. For every run it reports:
+- time: best of --repeat runs with the garbage collector paused (as
+  timeit does), and per operation,
+- allocations: peak traced memory and net allocated blocks of one run
+  under tracemalloc (kept apart from the timed runs),
+- peak RSS of the child process.
+
+    python -m benchmarks.suite                                # 1k, 10k, 100k
+    python -m benchmarks.suite --sizes 1000 1000000 --cases add_patient get_summary
+    python -m benchmarks.suite --compare                      # exits 1 on regressions
+    python -m benchmarks.suite --compare other.json
+    python -m benchmarks.suite --save benchmarks/baseline.json
+
+--compare checks against benchmarks/baseline.json unless given another
+file, and stops with an error when that file does not exist. The
+committed baseline was recorded at the default sizes on the machine
+named in its "meta" block; timings from another machine are not
+comparable with it, so record a local one with --save first and compare
+against that.
+
+The GUI cases (update_stats, the department table, the activity feed)
+run under the offscreen Qt platform and are skipped when PySide6 is not
+installed.
+"""
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Core.hospital import Hospital
+from Core.snapshot import load_snapshot, save_snapshot
+from benchmarks.data import iter_patients, iter_staff, make_departments, make_hospital
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+# ===============================
+# Cases
+# ===============================
+# Each case builds its data for `size` records (untimed) and returns
+# (run, operations): run() does the timed work once.
+
+def case_add_patient(size, compact):
+    hospital = Hospital("Benchmark Hospital")
+    depts = make_departments(20, compact=compact)
+    for dept in depts:
+        hospital.add_department(dept)
+    patients = list(iter_patients(size))
+
+    def run():
+        for i, patient in enumerate(patients):
+            depts[i % 20].add_patient(patient)
+
+    return run, size
+
+
+def case_add_staff(size, compact):
+    hospital = Hospital("Benchmark Hospital")
+    depts = make_departments(20, compact=compact)
+    for dept in depts:
+        hospital.add_department(dept)
+    staff = list(iter_staff(size))
+
+    def run():
+        for i, member in enumerate(staff):
+            depts[i % 20].add_staff(member)
+
+    return run, size
+
+
+def case_get_summary(size, compact):
+    hospital = make_hospital(size, compact=compact)
+
+    def run():
+        for _ in range(1000):
+            hospital.get_summary()
+
+    return run, 1000
+
+
+def case_get_department(size, compact):
+    hospital = make_hospital(size, compact=compact)
+    names = list(hospital.departments) + ["Missing"]
+
+    def run():
+        for i in range(10000):
+            hospital.get_department(names[i % len(names)])
+
+    return run, 10000
+
+
+def case_remove_department(size, compact):
+    hospital = make_hospital(size, compact=compact)
+    names = list(hospital.departments)
+
+    def run():
+        for name in names:
+            hospital.remove_department(name)
+
+    return run, len(names)
+
+
+def case_list_all(size, compact):
+    # A full walk of every department's patient and staff dicts (or
+    # columns), formatting one short line per record
+    hospital = make_hospital(size, compact=compact)
+
+    def run():
+        lines = 0
+        for dept in hospital.departments.values():
+            for p in dept.patients.values():
+                lines += len(f"- {p.id} | {p.name}")
+            for s in dept.staff_members.values():
+                lines += len(f"- {s.id} | {s.name} ({s.role})")
+        return lines
+
+    return run, size + size // 10
+
+
+def case_page_patients(size, compact):
+    # Every patient, 50 per page, in ID order
+    hospital = make_hospital(size, compact=compact)
+
+    def run():
+        after_id = 0
+        while True:
+            rows = hospital.page_patients(after_id=after_id, limit=50)
+            if not rows:
+                return
+            after_id = rows[-1][0].id
+
+    return run, size
+
+
+def case_iter_patients(size, compact):
+    # Every patient of every department through the cursor API
+    hospital = make_hospital(size, compact=compact)
+
+    def run():
+        for dept in hospital.departments.values():
+            cursor = None
+            while True:
+                page = dept.iter_patients(cursor, 50)
+                if page.cursor is None:
+                    break
+                cursor = page.cursor
+
+    return run, size
+
+
+def case_snapshot_save(size, compact):
+    hospital = make_hospital(size, compact=compact)
+    path = os.path.join(_scratch(), "hospital.hsnap")
+
+    def run():
+        save_snapshot(hospital, path)
+
+    return run, size + size // 10
+
+
+def case_snapshot_load(size, compact):
+    # Memory-mapped, with medical records read on access
+    path = os.path.join(_scratch(), "hospital.hsnap")
+    save_snapshot(make_hospital(size, compact=compact), path)
+
+    def run():
+        load_snapshot(path, memory_map=True, lazy_records=True)
+
+    return run, size + size // 10
+
+
+def _scratch():
+    folder = tempfile.mkdtemp(prefix="bench_suite_")
+    atexit.register(shutil.rmtree, folder, True)
+    return folder
+
+
+def case_gui_update_stats(size, compact):
+    app, gui = _gui()
+    if gui is None:
+        return None
+    gui.build_page(1)    # the departments table is part of the refresh
+
+    source = make_hospital(size, compact=compact)
+    for dept in list(source.departments.values()):
+        source.remove_department(dept.name)
+        gui.hospital.add_department(dept)
+    _settle(app, gui)
+
+    applied = []
+    apply_stats = gui.apply_stats
+    gui.apply_stats = lambda *args: (applied.append(1), apply_stats(*args))
+
+    def run():
+        for _ in range(20):
+            done = len(applied) + 1
+            gui.update_stats()
+            while len(applied) < done:
+                gui.workers.wait()
+                app.processEvents()
+
+    return run, 20
+
+
+def case_gui_dept_table(size, compact):
+    # Full refreshes of a department list with one department per 10 records
+    app, gui = _gui()
+    if gui is None:
+        return None
+    gui.build_page(1)
+    rows = [(f"Department {i}", i, i // 10) for i in range(max(size // 10, 1))]
+
+    def run():
+        for _ in range(5):
+            gui.update_dept_table(rows)
+            app.processEvents()
+
+    return run, 5
+
+
+def case_gui_activity(size, compact):
+    # One dashboard activity entry per record
+    app, gui = _gui()
+    if gui is None:
+        return None
+
+    def run():
+        for i in range(size):
+            gui.add_activity("🤒", f"Patient 'Patient {i}' added to Cardiology", "accent4")
+        app.processEvents()
+
+    return run, size
+
+
+def _gui():
+    """
+    (app, HospitalGUI) on the offscreen Qt platform, or (None, None)
+    when PySide6 is not installed.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None, None
+
+    sys.path.insert(0, os.path.join(ROOT, "GUI"))
+    import APP
+
+    app = QApplication.instance() or QApplication([])
+    folder = tempfile.mkdtemp(prefix="bench_gui_")
+    atexit.register(shutil.rmtree, folder, True)
+    gui = APP.HospitalGUI(data_dir=folder)
+    gui.store.close()    # the benchmark data is not persisted
+    return app, gui
+
+
+def _settle(app, gui):
+    for _ in range(5):
+        gui.workers.wait()
+        gui.event_bridge.drain_all()
+        app.processEvents()
+
+
+CASES = {
+    "add_patient": case_add_patient,
+    "add_staff": case_add_staff,
+    "get_summary": case_get_summary,
+    "get_department": case_get_department,
+    "remove_department": case_remove_department,
+    "list_all": case_list_all,
+    "page_patients": case_page_patients,
+    "iter_patients": case_iter_patients,
+    "snapshot_save": case_snapshot_save,
+    "snapshot_load": case_snapshot_load,
+    "gui_update_stats": case_gui_update_stats,
+    "gui_dept_table": case_gui_dept_table,
+    "gui_activity": case_gui_activity,
+}
+
+
+# ===============================
+# Measuring (child process)
+# ===============================
+
+def measure(name, size, repeat, compact):
+    """
+    Run one case and return its result dict, or None if it was skipped.
+    """
+    best = None
+    for _ in range(repeat):
+        built = CASES[name](size, compact)
+        if built is None:
+            return None
+        run, operations = built
+
+        # Like timeit: no collector pauses from the setup's garbage
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+
+    # One more run for allocations; tracemalloc slows it down
+    run, operations = CASES[name](size, compact)
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks
+
+    return {
+        "seconds": best,
+        "per_op_us": best / operations * 1e6,
+        "alloc_peak_kb": peak / 1024,
+        "alloc_blocks": blocks,
+        "rss_peak_mb": _peak_rss_mb(),
+    }
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_child(name, size, repeat, compact):
+    command = [sys.executable, "-m", "benchmarks.suite", "--child", name, str(size), "--repeat", str(repeat)]
+    if compact:
+        command.append("--compact")
+
+    done = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if done.returncode != 0:
+        raise RuntimeError(f"{name}/{size} failed:\n{done.stderr}")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+# ===============================
+# Baselines
+# ===============================
+
+def metadata(compact):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpus": os.cpu_count(),
+        "compact": compact,
+    }
+
+
+def regressions(result, base, threshold, min_seconds):
+    """
+    Names of the metrics that got worse than the baseline by more than
+    `threshold` (0.2 = 20%). Times below min_seconds are too noisy to
+    compare.
+    """
+    worse = []
+    if max(result["seconds"], base["seconds"]) >= min_seconds:
+        if result["seconds"] > base["seconds"] * (1 + threshold):
+            worse.append("time")
+    if result["alloc_peak_kb"] > base["alloc_peak_kb"] * (1 + threshold) + 64:
+        worse.append("alloc")
+    if result["rss_peak_mb"] > base["rss_peak_mb"] * (1 + threshold) + 8:
+        worse.append("rss")
+    return worse
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("--compact", action="store_true", help="use column-store departments")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", "--baseline", dest="baseline", metavar="PATH", nargs="?", const=BASELINE,
+                        help="compare with a saved baseline (default: benchmarks/baseline.json); "
+                             "exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore time changes below this")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = measure(args.child[0], int(args.child[1]), args.repeat, args.compact)
+        print(json.dumps(result))
+        return 0
+
+    base = {}
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            parser.error(f"no baseline at {args.baseline}; record one with --save {args.baseline}")
+        with open(args.baseline, encoding="utf-8") as f:
+            saved = json.load(f)
+        base = saved["results"]
+        meta = saved.get("meta", {})
+        print(f"Comparing with {args.baseline} ({meta.get('commit')}, {meta.get('date')}, "
+              f"{meta.get('platform')}, Python {meta.get('python')})")
+        if meta.get("compact", False) != args.compact:
+            parser.error(f"{args.baseline} was recorded with compact={meta.get('compact')}; "
+                         f"record one for this mode with --save")
+
+    results = {}
+    failed = 0
+    print(f"{'case':<28}{'seconds':>10}{'us/op':>10}{'alloc KB':>11}{'blocks':>10}{'RSS MB':>9}  vs baseline")
+
+    for name in args.cases:
+        for size in args.sizes:
+            key = f"{name}/{size}"
+            result = run_child(name, size, args.repeat, args.compact)
+            if result is None:
+                print(f"{key:<28}skipped")
+                continue
+            results[key] = result
+
+            note = "not in baseline" if args.baseline else ""
+            if key in base:
+                change = result["seconds"] / base[key]["seconds"] - 1 if base[key]["seconds"] else 0.0
+                worse = regressions(result, base[key], args.threshold, args.min_seconds)
+                note = f"{change:+.0%}"
+                if worse:
+                    note += "  REGRESSION: " + ", ".join(worse)
+                    failed += 1
+
+            print(f"{key:<28}{result['seconds']:>10.4f}{result['per_op_us']:>10.2f}"
+                  f"{result['alloc_peak_kb']:>11,.0f}{result['alloc_blocks']:>10,}"
+                  f"{result['rss_peak_mb']:>9.0f}  {note}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(args.compact), "results": results}, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save}")
+
+    if failed:
+        print(f"{failed} regression(s) against {args.baseline}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
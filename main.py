@@ -1,6 +1,9 @@
 from Core.hospital import Hospital
+from Core.storage import HospitalStore
 from Models.department import Department
+from Models.menu import diagnostics_menu, show_pages
 from Models.patient import Patient
+from Models.records import RecordStore
 from Models.staff import Staff
 
 
@@ -11,13 +14,29 @@ def show_menu():
     print("2. Add Patient")
     print("3. Add Staff")
     print("4. View Departments")
-    print("5. Exit")
+    print("5. Diagnostics")
+    print("6. Exit")
 
 
 def main():
 
+    # Long medical records are kept in a memory-mapped file, not in memory
+    Patient.record_store = RecordStore()
+
     hospital = Hospital("Smart Hospital")
 
+    # Load saved data; every change is then written to disk right away
+    store = HospitalStore("hospital_data", sync_every=1)
+    store.open(hospital)
+
+    try:
+        run(hospital)
+    finally:
+        store.close()
+
+
+def run(hospital):
+
     while True:
 
         show_menu()
@@ -82,26 +101,39 @@ def main():
         # ===============================
         elif choice == "4":
 
-            if not hospital.departments:
+            if not show_pages(hospital.iter_departments, lambda d: print(f"- {d.name}")):
                 print("No departments yet.")
                 continue
 
-            for dept in hospital.departments.values():
+            dept_name = input("Department to open (Enter to skip): ")
+            if not dept_name:
+                continue
+
+            dept = hospital.get_department(dept_name)
+
+            if not dept:
+                print("Department not found.")
+                continue
+
+            print(f"\nDepartment: {dept.name}")
 
-                print(f"\nDepartment: {dept.name}")
+            print("Patients:")
+            show_pages(dept.iter_patients, lambda p: print(f"- {p.id} | {p.name}"))
 
-                print("Patients:")
-                for p in dept.patients.values():
-                    print(f"- {p.id} | {p.name}")
+            print("Staff:")
+            show_pages(dept.iter_staff, lambda s: print(f"- {s.id} | {s.name} ({s.role})"))
 
-                print("Staff:")
-                for s in dept.staff_members.values():
-                    print(f"- {s.id} | {s.name} ({s.role})")
+        # ===============================
+        # Diagnostics
+        # ===============================
+        elif choice == "5":
+
+            diagnostics_menu(hospital)
 
         # ===============================
         # Exit
         # ===============================
-        elif choice == "5":
+        elif choice == "6":
 
             print("System closed.")
             break
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from Core.hospital import Hospital
+from Core.importer import import_file, parse_staff
+from Models.department import Department
+
+
+def staff_row(salary):
+    return {"department": "Cardiology", "name": "Ann Lee", "age": "40", "role": "Nurse", "salary": salary}
+
+
+class ParseStaffTest(unittest.TestCase):
+
+    def test_accepts_a_number(self):
+        dept_name, staff = parse_staff(staff_row("52000.5"))
+        self.assertEqual(dept_name, "Cardiology")
+        self.assertEqual(staff.salary, 52000.5)
+
+    def test_rejects_non_finite_salaries(self):
+        for salary in ("nan", "NaN", "inf", "-inf", "Infinity", float("nan")):
+            with self.subTest(salary=salary):
+                with self.assertRaisesRegex(ValueError, "finite"):
+                    parse_staff(staff_row(salary))
+
+    def test_rejects_negative_salaries(self):
+        with self.assertRaisesRegex(ValueError, "negative"):
+            parse_staff(staff_row("-1"))
+
+
+class ImportFileTest(unittest.TestCase):
+
+    def test_non_finite_salary_rows_are_rejected(self):
+        hospital = Hospital("Test Hospital")
+        hospital.add_department(Department("Cardiology"))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "staff.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("department,name,age,role,salary\n"
+                        "Cardiology,Ann Lee,40,Nurse,52000\n"
+                        "Cardiology,Bob Ray,41,Nurse,nan\n"
+                        "Cardiology,Cy Poe,42,Nurse,inf\n")
+            report = import_file(hospital, path, "staff")
+
+        self.assertEqual(report.added, 1)
+        self.assertEqual(report.rejected, 2)
+        self.assertEqual(hospital.get_summary()["total_payroll"], 52000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
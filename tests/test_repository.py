@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from Core.hospital import Hospital
+from Core.repository import MemoryRepository, SQLiteRepository
+from Models.department import Department
+from Models.patient import Patient
+from Models.staff import Staff
+
+
+NAMES = ["Straße Ann", "STRASSE Bo", "strasse Cy", "Émile Dax", "émile Eve", "Eva Fox", "Ölaf Gus", "öLAF Hal", "Zoë Ida"]
+PREFIXES = ["straß", "STRASS", "strasse", "é", "É", "émile", "e", "ö", "Ö", "zoë", "ZOË", "x"]
+
+
+class NamePrefixParityTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hospital = Hospital("Test Hospital")
+        for dept_name in ("Cardiology", "Neurology"):
+            self.hospital.add_department(Department(dept_name))
+        for i, name in enumerate(NAMES):
+            dept = self.hospital.get_department(("Cardiology", "Neurology")[i % 2])
+            dept.add_patient(Patient(name, 30 + i, "checkup"))
+            dept.add_staff(Staff(name, 30 + i, "Nurse", dept.name, 50000.0))
+
+        self.folder = tempfile.TemporaryDirectory()
+        self.sqlite = SQLiteRepository(os.path.join(self.folder.name, "hospital.db"))
+        self.sqlite.attach(self.hospital)
+        self.memory = MemoryRepository()
+        self.memory.attach(self.hospital)
+
+    def tearDown(self):
+        self.sqlite.close()
+        self.folder.cleanup()
+
+    def names(self, rows):
+        return [person.name for person, dept_name in rows]
+
+    def test_patients_match_in_both_repositories(self):
+        for prefix in PREFIXES:
+            with self.subTest(prefix=prefix):
+                expected = self.names(self.memory.page_patients(name_prefix=prefix, limit=100))
+                self.assertEqual(self.names(self.sqlite.page_patients(name_prefix=prefix, limit=100)), expected)
+
+    def test_staff_match_in_both_repositories(self):
+        for prefix in PREFIXES:
+            with self.subTest(prefix=prefix):
+                expected = self.names(self.memory.page_staff(name_prefix=prefix, limit=100))
+                self.assertEqual(self.names(self.sqlite.page_staff(name_prefix=prefix, limit=100)), expected)
+
+    def test_sharp_s_matches_its_casefolded_spelling(self):
+        rows = self.sqlite.page_patients(name_prefix="straß", limit=100)
+        self.assertEqual(self.names(rows), ["Straße Ann", "STRASSE Bo", "strasse Cy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+
+from Core.hospital import Hospital
+from Core.server import HospitalAPI, HospitalServer
+from Core.storage import HospitalStore
+from Models.department import Department
+
+
+class StaffSalaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hospital = Hospital("Test Hospital", thread_safe=True)
+        self.hospital.add_department(Department("Cardiology"))
+        self.api = HospitalAPI(self.hospital)
+
+    def post_staff(self, salary):
+        return self.api.handle("POST", "/staff", {
+            "department": "Cardiology", "name": "Ann Lee", "age": 40, "role": "Nurse", "salary": salary
+        })
+
+    def test_adds_staff_with_a_finite_salary(self):
+        status, body = self.post_staff(52000)
+        self.assertEqual(status, 201)
+        self.assertEqual(body["salary"], 52000.0)
+
+    def test_rejects_non_finite_salaries(self):
+        for salary in ("nan", "inf", "-inf", float("nan"), float("inf")):
+            with self.subTest(salary=salary):
+                status, body = self.post_staff(salary)
+                self.assertEqual(status, 400)
+                self.assertIn("finite", body["error"])
+        self.assertEqual(self.hospital.get_summary()["total_staff"], 0)
+
+    def test_rejects_nan_literal_in_the_json_body(self):
+        server = HospitalServer(self.hospital)
+        try:
+            body = b'{"department": "Cardiology", "name": "Ann Lee", "age": 40, "role": "Nurse", "salary": NaN}'
+            status, result = server._dispatch("POST", "/staff", {"content-type": "application/json"}, body)
+        finally:
+            server.close()
+        self.assertEqual(status, 400)
+        self.assertEqual(self.hospital.get_summary()["total_payroll"], 0.0)
+
+
+class DurabilityTest(unittest.TestCase):
+
+    def test_changes_are_on_disk_before_the_reply(self):
+        with tempfile.TemporaryDirectory() as folder:
+            hospital = Hospital("Test Hospital", thread_safe=True)
+            store = HospitalStore(folder, sync_every=1000)
+            store.open(hospital)
+            server = HospitalServer(hospital, store=store)
+            try:
+                status, result = server._dispatch(
+                    "POST", "/departments", {"content-type": "application/json"}, b'{"name": "Cardiology"}'
+                )
+                self.assertEqual(status, 201)
+
+                # Read back from disk while the store is still open
+                restored = Hospital("Restored")
+                HospitalStore(folder).load(restored)
+                self.assertIsNotNone(restored.get_department("Cardiology"))
+            finally:
+                server.close()
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()